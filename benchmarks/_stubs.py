@@ -0,0 +1,48 @@
+"""In-memory stand-ins so bot modules can be loaded without the live runtime"""
+from os import path as ospath
+from sys import (
+    modules,
+    path as syspath
+)
+from types import ModuleType
+
+ROOT = ospath.dirname(ospath.dirname(ospath.abspath(__file__)))
+if ROOT not in syspath:
+    syspath.insert(
+        0,
+        ROOT
+    )
+
+
+def package(name, **attrs):
+    """register a package whose submodules still load from the repo tree"""
+    module = ModuleType(name)
+    module.__path__ = [ospath.join(
+        ROOT,
+        *name.split(".")
+    )]
+    module.__dict__.update(attrs)
+    modules[name] = module
+    return module
+
+
+def stub(name, **attrs):
+    module = ModuleType(name)
+    module.__dict__.update(attrs)
+    modules[name] = module
+    return module
+
+
+async def sync_to_async(func, *args, wait=True, **kwargs):
+    return func(
+        *args,
+        **kwargs
+    )
+
+
+class ButtonMaker:
+    def data_button(self, *args, **kwargs):
+        pass
+
+    def build_menu(self, *args, **kwargs):
+        return None
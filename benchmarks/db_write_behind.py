@@ -0,0 +1,172 @@
+"""Queue user and RSS updates through DbManager against an in-memory Mongo stand-in.
+
+Compares one update_one round trip per change (the old path) with the
+write-behind queue flushed once per tick. Needs pymongo installed; no
+server is contacted.
+Run from the repo root: python benchmarks/db_write_behind.py
+"""
+from asyncio import (
+    new_event_loop,
+    sleep
+)
+from logging import getLogger
+from random import (
+    randint,
+    seed
+)
+from time import perf_counter
+
+from _stubs import (
+    package,
+    stub
+)
+
+USERS = 50
+TICKS = 20
+CHANGES = 100
+LATENCY = 0.002
+
+bot_loop = new_event_loop()
+package(
+    "bot",
+    BOT_ID="1",
+    LOGGER=getLogger("bench"),
+    aria2_options={},
+    bot_loop=bot_loop,
+    bot_name="bench",
+    config_dict={"DATABASE_URL": ""},
+    qbit_options={},
+    rss_dict={},
+    user_data={},
+)
+stub(
+    "motor.motor_asyncio",
+    AsyncIOMotorClient=None
+)
+
+from bot import user_data
+from bot.helper.ext_utils.db_handler import DbManager
+
+
+class MemoryCollection:
+    def __init__(self, stats):
+        self.stats = stats
+
+    async def _round_trip(self, payload):
+        await sleep(LATENCY)
+        self.stats["round_trips"] += 1
+        self.stats["bytes"] += len(repr(payload))
+
+    async def update_one(self, query, update, upsert=False):
+        await self._round_trip((
+            query,
+            update
+        ))
+
+    async def bulk_write(self, requests, ordered=True):
+        await self._round_trip(requests)
+
+
+class MemoryDb:
+    def __init__(self):
+        self.stats = {
+            "round_trips": 0,
+            "bytes": 0
+        }
+        self._collections = {}
+
+    def __getitem__(self, name):
+        return self._collections.setdefault(
+            name,
+            MemoryCollection(self.stats)
+        )
+
+
+def _user(user_id):
+    return {
+        "as_doc": False,
+        "media_group": True,
+        "lprefix": f"@channel{user_id}",
+        "split_size": 2097152000,
+        "yt_opt": "format:bv*+ba/b|mergeoutputformat:mkv",
+        "excluded_extensions": [
+            "aria2",
+            "!qB",
+            "torrent"
+        ],
+        "time": 0,
+    }
+
+
+def _changes():
+    seed(3)
+    for user_id in range(USERS):
+        user_data[user_id] = _user(user_id)
+    return [
+        [
+            (
+                user_id := randint(0, USERS - 1),
+                randint(0, 1 << 30)
+            )
+            for _ in range(CHANGES)
+        ]
+        for _ in range(TICKS)
+    ]
+
+
+async def _direct(db, ticks):
+    collection = db["users.1"]
+    for changes in ticks:
+        for (
+            user_id,
+            value
+        ) in changes:
+            user_data[user_id]["time"] = value
+            await collection.update_one(
+                {"_id": user_id},
+                {"$set": user_data[user_id]},
+                upsert=True
+            )
+
+
+async def _write_behind(db, ticks):
+    database = DbManager()
+    database._db = db
+    for changes in ticks:
+        for (
+            user_id,
+            value
+        ) in changes:
+            user_data[user_id]["time"] = value
+            await database.update_user_data(user_id)
+        await database.flush()
+    if database._flusher is not None:
+        database._flusher.cancel()
+
+
+async def main():
+    ticks = _changes()
+    print(f"{USERS} users, {TICKS} ticks x {CHANGES} changes, {LATENCY * 1000:.0f} ms per round trip")
+    for (
+        label,
+        func
+    ) in (
+        ("direct", _direct),
+        ("write-behind", _write_behind),
+    ):
+        db = MemoryDb()
+        start = perf_counter()
+        await func(
+            db,
+            ticks
+        )
+        elapsed = perf_counter() - start
+        print(
+            f"{label:<13} {elapsed * 1000:8.1f} ms"
+            f" | {db.stats['round_trips']:5} round trips"
+            f" | {db.stats['bytes'] / 1024:8.1f} KiB sent"
+        )
+
+
+if __name__ == "__main__":
+    bot_loop.run_until_complete(main())
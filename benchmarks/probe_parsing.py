@@ -0,0 +1,151 @@
+"""Parse ffprobe output and Drive error bodies: eval() against parsers.
+
+Run from the repo root: python benchmarks/probe_parsing.py
+"""
+from json import dumps
+from os import path as ospath
+from time import perf_counter
+
+from _stubs import package
+
+package("bot")
+
+from bot.helper.ext_utils.parsers import (
+    get_error_reason,
+    parse_probe
+)
+
+ROUNDS = 20000
+
+
+FIXTURES = ospath.join(
+    ospath.dirname(ospath.abspath(__file__)),
+    "fixtures"
+)
+# captured with ffprobe -print_format json -show_format -show_streams
+PROBES = (
+    "many_streams",
+    "cover_art",
+    "odd_tags"
+)
+
+
+def _probe_output(name):
+    with open(
+        ospath.join(
+            FIXTURES,
+            f"{name}.json"
+        ),
+        encoding="utf-8"
+    ) as f:
+        return f.read()
+
+
+DRIVE_ERROR = dumps(
+    {
+        "error": {
+            "code": 403,
+            "message": "User rate limit exceeded.",
+            "errors": [
+                {
+                    "message": "User rate limit exceeded.",
+                    "domain": "usageLimits",
+                    "reason": "userRateLimitExceeded"
+                }
+            ]
+        }
+    },
+    indent=1
+).encode()
+
+
+def _eval_probe(raw):
+    data = eval(raw)
+    fmt = data["format"]
+    return (
+        float(fmt.get("duration", 0)),
+        [
+            (
+                stream.get("codec_type"),
+                stream.get("tags", {})
+            )
+            for stream in data["streams"]
+        ]
+    )
+
+
+def _json_probe(raw):
+    data = parse_probe(raw)
+    return (
+        data.format.duration, # type: ignore
+        [
+            (
+                stream.codec_type,
+                stream.tags
+            )
+            for stream in data.streams # type: ignore
+        ]
+    )
+
+
+def _eval_reason(content):
+    return eval(content)["error"]["errors"][0]["reason"]
+
+
+def _time(func, arg):
+    start = perf_counter()
+    for _ in range(ROUNDS):
+        result = func(arg)
+    return (
+        (perf_counter() - start) / ROUNDS,
+        result
+    )
+
+
+def main():
+    cases = [
+        (
+            f"ffprobe, {name}",
+            _probe_output(name),
+            _eval_probe,
+            _json_probe
+        )
+        for name in PROBES
+    ]
+    cases.append((
+        "drive error",
+        DRIVE_ERROR,
+        _eval_reason,
+        get_error_reason
+    ))
+    print(f"{ROUNDS} rounds per case")
+    for (
+        label,
+        raw,
+        old,
+        new
+    ) in cases:
+        (
+            old_time,
+            old_result
+        ) = _time(
+            old,
+            raw
+        )
+        (
+            new_time,
+            new_result
+        ) = _time(
+            new,
+            raw
+        )
+        print(
+            f"{label:<24} eval {old_time * 1e6:8.1f} us"
+            f" | json {new_time * 1e6:8.1f} us"
+            f" | {old_time / new_time:5.1f}x"
+            f" | {'same' if old_result == new_result else 'DIFFERENT'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
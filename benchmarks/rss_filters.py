@@ -0,0 +1,163 @@
+"""Filter 10k feed titles against 100 filter words.
+
+Compares the old per-title substring checks, one flat regex alternation
+and the trie-built pattern used by rss_filters.
+Run from the repo root: python benchmarks/rss_filters.py
+"""
+from random import (
+    choice,
+    randint,
+    seed
+)
+from re import (
+    compile as re_compile,
+    escape as re_escape
+)
+from string import ascii_lowercase
+from time import perf_counter
+
+from _stubs import package
+
+package("bot")
+
+from bot.helper.ext_utils.rss_filters import (
+    filter_titles,
+    get_rss_filter
+)
+
+TITLES = 10000
+WORDS = 100
+GROUPS = 1
+ROUNDS = 5
+
+
+def _word():
+    return "".join(
+        choice(ascii_lowercase)
+        for _ in range(randint(3, 9))
+    )
+
+
+def _substring_filter(data, titles):
+    results = []
+    for title in titles:
+        lowered = title.lower()
+        results.append(
+            all(
+                any(x.lower() in lowered for x in flist)
+                for flist in data["inf"]
+            )
+            and not any(
+                x.lower() in lowered
+                for flist in data["exf"]
+                for x in flist
+            )
+        )
+    return results
+
+
+def _alternation_filter(data, titles):
+    def _group(words):
+        return re_compile("|".join(
+            re_escape(x.lower())
+            for x in words
+        ))
+    include = [
+        _group(flist)
+        for flist in data["inf"]
+    ]
+    exclude = _group([
+        x
+        for flist in data["exf"]
+        for x in flist
+    ])
+    return [
+        all(
+            pattern.search(x)
+            for pattern in include
+        )
+        and not exclude.search(x)
+        for x in (
+            title.lower()
+            for title in titles
+        )
+    ]
+
+
+def _trie_filter(data, titles):
+    return filter_titles(
+        get_rss_filter(
+            0,
+            "bench",
+            data
+        ),
+        titles
+    )
+
+
+def _time(func, data, titles):
+    start = perf_counter()
+    for _ in range(ROUNDS):
+        result = func(
+            data,
+            titles
+        )
+    return (
+        (perf_counter() - start) / ROUNDS,
+        result
+    )
+
+
+def main():
+    seed(7)
+    words = [
+        _word()
+        for _ in range(WORDS)
+    ]
+    titles = [
+        " ".join(
+            choice(words)
+            if randint(0, 5) == 0
+            else _word()
+            for _ in range(8)
+        ).title()
+        for _ in range(TITLES)
+    ]
+    size = WORDS // (GROUPS + 1)
+    data = {
+        "inf": [
+            words[i * size : (i + 1) * size]
+            for i in range(GROUPS)
+        ],
+        "exf": [words[GROUPS * size :]],
+        "sensitive": True,
+    }
+    print(f"{TITLES} titles, {WORDS} filter words")
+    expected = None
+    for (
+        label,
+        func
+    ) in (
+        ("substring", _substring_filter),
+        ("alternation", _alternation_filter),
+        ("trie", _trie_filter),
+    ):
+        (
+            elapsed,
+            result
+        ) = _time(
+            func,
+            data,
+            titles
+        )
+        if expected is None:
+            expected = result
+        print(
+            f"{label:<12} {elapsed * 1000:8.2f} ms"
+            f" | {sum(result)} matched"
+            f" | {'same' if result == expected else 'DIFFERENT'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""Render 20 status messages over 500 tasks for a few refresh ticks.
+
+Run from the repo root: python benchmarks/status_render.py
+"""
+from asyncio import (
+    Lock,
+    new_event_loop
+)
+from logging import getLogger
+from time import (
+    perf_counter,
+    time
+)
+
+from _stubs import (
+    ButtonMaker,
+    package,
+    stub,
+    sync_to_async
+)
+
+TASKS = 500
+MESSAGES = 20
+TICKS = 10
+
+bot_loop = new_event_loop()
+bot = package(
+    "bot",
+    DOWNLOAD_DIR="/",
+    task_dict_lock=Lock(),
+    bot_start_time=time(),
+    config_dict={
+        "STATUS_LIMIT": 4,
+        "DELETE_LINKS": False,
+        "HIDE_TASK": 0
+    },
+    status_dict={},
+    LOGGER=getLogger("bench"),
+    bot_loop=bot_loop,
+    subprocess_lock=Lock(),
+    CMD_SUFFIX=""
+)
+stub(
+    "bot.helper.ext_utils.bot_utils",
+    sync_to_async=sync_to_async
+)
+stub(
+    "bot.helper.telegram_helper.button_build",
+    ButtonMaker=ButtonMaker
+)
+
+from bot.helper.ext_utils.task_registry import TaskRegistry
+
+bot.task_dict = TaskRegistry()
+
+from bot.helper.ext_utils import status_utils
+
+calls = {
+    "renders": 0
+}
+_render_task_block = status_utils._render_task_block
+
+
+def _counted_render(fields):
+    calls["renders"] += 1
+    return _render_task_block(fields)
+
+
+status_utils._render_task_block = _counted_render
+
+
+class _User:
+    def __init__(self, uid):
+        self.uid = uid
+
+    def mention(self, style="html"):
+        return f'<a href="tg://user?id={self.uid}">user{self.uid}</a>'
+
+
+class _Message:
+    def __init__(self, uid):
+        self.from_user = _User(uid)
+
+
+class _Listener:
+    def __init__(self, mid):
+        self.mid = mid
+        self.user_id = mid % 25
+        self.time = time() - 60
+        self.mode = "Leech #Aria2"
+        self.message = _Message(self.user_id)
+
+
+class _Task:
+    engine = "Aria2 v1.37.0"
+
+    def __init__(self, mid, active):
+        self.listener = _Listener(mid)
+        self.active = active
+        self.done = mid * 1024
+
+    def gid(self):
+        return f"{self.listener.mid:016x}"
+
+    def name(self):
+        return f"Some.Release.{self.listener.mid}.1080p.mkv"
+
+    def status(self):
+        return status_utils.MirrorStatus.STATUS_DOWNLOADING
+
+    def progress(self):
+        return f"{self.done % 100}%"
+
+    def processed_bytes(self):
+        return status_utils.get_readable_file_size(self.done)
+
+    def size(self):
+        return "4.37GB"
+
+    def speed(self):
+        return f"{self.done % 7}MB/s"
+
+    def eta(self):
+        return "12m4s"
+
+
+async def _tick(tasks):
+    for task in tasks:
+        task.listener.time -= 1
+        if task.active:
+            task.done += 1024 * 1024
+    snapshot = await status_utils.get_status_snapshot(force=True)
+    for sid in range(MESSAGES):
+        await status_utils.get_readable_message(
+            sid,
+            False,
+            page_no=sid * 6 + 1,
+            snapshot=snapshot
+        )
+
+
+async def _run(label, every):
+    bot.task_dict.clear()
+    status_utils.task_blocks.clear()
+    tasks = [
+        _Task(
+            mid,
+            mid % every == every - 1
+        )
+        for mid in range(TASKS)
+    ]
+    for task in tasks:
+        bot.task_dict[task.listener.mid] = task
+    timings = []
+    for _ in range(TICKS):
+        calls["renders"] = 0
+        start = perf_counter()
+        await _tick(tasks)
+        timings.append((
+            perf_counter() - start,
+            calls["renders"]
+        ))
+    (
+        cold,
+        cold_renders
+    ) = timings[0]
+    warm = sum(t for t, _ in timings[1:]) / (TICKS - 1)
+    warm_renders = sum(r for _, r in timings[1:]) / (TICKS - 1)
+    print(
+        f"{label:<14} cold {cold * 1000:7.2f} ms ({cold_renders} renders)"
+        f" | warm {warm * 1000:7.2f} ms ({warm_renders:.0f} renders)"
+    )
+
+
+async def main():
+    print(f"{TASKS} tasks, {MESSAGES} status messages, {TICKS} ticks")
+    await _run(
+        "all idle",
+        TASKS + 1
+    )
+    await _run(
+        "1 in 4 moving",
+        4
+    )
+    await _run(
+        "all moving",
+        1
+    )
+
+
+if __name__ == "__main__":
+    bot_loop.run_until_complete(main())
@@ -46,6 +46,8 @@ from time import time
 from tzlocal import get_localzone
 from uvloop import install
 
+from .helper.ext_utils.task_registry import TaskRegistry
+
 # from faulthandler import enable as faulthandler_enable
 # faulthandler_enable()
 
@@ -83,7 +85,8 @@ load_dotenv(
 )
 
 intervals = {
-    "status": {},
+    "status": set(),
+    "status_ticker": "",
     "qb": "",
     "stopAll": False
 }
@@ -120,12 +123,11 @@ except:
 task_dict_lock = Lock()
 queue_dict_lock = Lock()
 qb_listener_lock = Lock()
-cpu_eater_lock = Lock()
 subprocess_lock = Lock()
 same_directory_lock = Lock()
 
 status_dict = {}
-task_dict = {}
+task_dict = TaskRegistry()
 rss_dict = {}
 cached_dict = {}
 
@@ -258,6 +260,16 @@ if len(TELEGRAM_HASH) == 0:
     log_error("TELEGRAM_HASH variable is missing! Exiting now")
     exit(1)
 
+LEECH_UPLOAD_WORKERS = environ.get(
+    "LEECH_UPLOAD_WORKERS",
+    ""
+)
+LEECH_UPLOAD_WORKERS = (
+    1
+    if len(LEECH_UPLOAD_WORKERS) == 0
+    else int(LEECH_UPLOAD_WORKERS)
+)
+
 USER_SESSION_STRING = environ.get(
     "USER_SESSION_STRING",
     ""
@@ -270,6 +282,7 @@ if len(USER_SESSION_STRING) != 0:
             TELEGRAM_HASH,
             session_string=USER_SESSION_STRING,
             no_updates=True,
+            max_concurrent_transmissions=LEECH_UPLOAD_WORKERS,
             app_version="@Z_Mirror Session",
             device_model="@Z_Mirror Bot",
             system_version="@Z_Mirror Server",
@@ -294,6 +307,46 @@ GDRIVE_ID = environ.get(
     ""
 )
 
+GDRIVE_WORKERS = environ.get(
+    "GDRIVE_WORKERS",
+    ""
+)
+GDRIVE_WORKERS = (
+    4
+    if len(GDRIVE_WORKERS) == 0
+    else int(GDRIVE_WORKERS)
+)
+
+GDRIVE_INDEX_INTERVAL = environ.get(
+    "GDRIVE_INDEX_INTERVAL",
+    ""
+)
+GDRIVE_INDEX_INTERVAL = (
+    60
+    if len(GDRIVE_INDEX_INTERVAL) == 0
+    else int(GDRIVE_INDEX_INTERVAL)
+)
+
+ZIP_LEVEL = environ.get(
+    "ZIP_LEVEL",
+    ""
+)
+ZIP_LEVEL = (
+    0
+    if len(ZIP_LEVEL) == 0
+    else int(ZIP_LEVEL)
+)
+
+ZIP_THREADS = environ.get(
+    "ZIP_THREADS",
+    ""
+)
+ZIP_THREADS = (
+    0
+    if len(ZIP_THREADS) == 0
+    else int(ZIP_THREADS)
+)
+
 COVER_IMAGES = environ.get(
     "COVER_IMAGES",
     ""
@@ -321,6 +374,12 @@ RCLONE_FLAGS = environ.get(
 if len(RCLONE_FLAGS) == 0:
     RCLONE_FLAGS = ""
 
+RCLONE_DEBUG_LOG = environ.get(
+    "RCLONE_DEBUG_LOG",
+    ""
+)
+RCLONE_DEBUG_LOG = RCLONE_DEBUG_LOG.lower() == "true"
+
 DEFAULT_UPLOAD = environ.get(
     "DEFAULT_UPLOAD",
     ""
@@ -600,6 +659,13 @@ QUEUE_UPLOAD = (
     else int(QUEUE_UPLOAD)
 )
 
+QUEUE_ENGINE_LIMITS = environ.get(
+    "QUEUE_ENGINE_LIMITS",
+    ""
+)
+if len(QUEUE_ENGINE_LIMITS) == 0:
+    QUEUE_ENGINE_LIMITS = ""
+
 JAVA += ("ict9yGHQY2FtZo2F6NYor")
 
 INCOMPLETE_TASK_NOTIFIER = environ.get(
@@ -1045,6 +1111,8 @@ config_dict = {
     "FSUB_IDS": FSUB_IDS,
     "GDRIVE_ID": GDRIVE_ID,
     "GDRIVE_LIMIT": GDRIVE_LIMIT,
+    "GDRIVE_WORKERS": GDRIVE_WORKERS,
+    "GDRIVE_INDEX_INTERVAL": GDRIVE_INDEX_INTERVAL,
     "HIDE_TASK": HIDE_TASK,
     "INCOMPLETE_TASK_NOTIFIER": INCOMPLETE_TASK_NOTIFIER,
     "INDEX_URL": INDEX_URL,
@@ -1052,6 +1120,7 @@ config_dict = {
     "LEECH_FILENAME_PREFIX": LEECH_FILENAME_PREFIX,
     "LEECH_FILENAME_SUFFIX": LEECH_FILENAME_SUFFIX,
     "LEECH_CAPTION_FONT": LEECH_CAPTION_FONT,
+    "LEECH_UPLOAD_WORKERS": LEECH_UPLOAD_WORKERS,
     "LEECH_SPLIT_SIZE": LEECH_SPLIT_SIZE,
     "LOG_CHAT_ID": LOG_CHAT_ID,
     "LEECH_LIMIT": LEECH_LIMIT,
@@ -1069,7 +1138,9 @@ config_dict = {
     "QUEUE_ALL": QUEUE_ALL,
     "QUEUE_DOWNLOAD": QUEUE_DOWNLOAD,
     "QUEUE_UPLOAD": QUEUE_UPLOAD,
+    "QUEUE_ENGINE_LIMITS": QUEUE_ENGINE_LIMITS,
     "RCLONE_FLAGS": RCLONE_FLAGS,
+    "RCLONE_DEBUG_LOG": RCLONE_DEBUG_LOG,
     "RCLONE_PATH": RCLONE_PATH,
     "RCLONE_SERVE_URL": RCLONE_SERVE_URL,
     "RCLONE_SERVE_PORT": RCLONE_SERVE_PORT,
@@ -1106,6 +1177,8 @@ config_dict = {
     "WEB_PINCODE": WEB_PINCODE,
     "YT_DLP_OPTIONS": YT_DLP_OPTIONS,
     "YTDLP_LIMIT": YTDLP_LIMIT,
+    "ZIP_LEVEL": ZIP_LEVEL,
+    "ZIP_THREADS": ZIP_THREADS,
 }
 config_dict = OrderedDict(sorted(config_dict.items()))
 
@@ -1257,6 +1330,7 @@ bot = TgClient(
     TELEGRAM_API,
     TELEGRAM_HASH,
     bot_token=BOT_TOKEN,
+    max_concurrent_transmissions=LEECH_UPLOAD_WORKERS,
     app_version="@Z_Mirror Session",
     device_model="@Z_Mirror Bot",
     system_version="@Z_Mirror Server",
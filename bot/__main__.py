@@ -81,10 +81,10 @@ async def restart(_, message):
         scheduler.shutdown(wait=False)
     if qb := intervals["qb"]:
         qb.cancel()
-    if st := intervals["status"]:
-        for intvl in list(st.values()):
-            intvl.cancel()
+    if st := intervals["status_ticker"]:
+        st.cancel()
     await sync_to_async(clean_all)
+    await database.flush()
     proc1 = await create_subprocess_exec(
         "pkill",
         "-9",
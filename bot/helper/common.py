@@ -4,22 +4,33 @@ from aiofiles.os import (
     remove
 )
 from asyncio import (
-    create_subprocess_exec,
+    FIRST_COMPLETED,
+    Event,
+    Semaphore,
     gather,
-    sleep
+    wait
 )
 from asyncio.subprocess import PIPE
+from copy import copy
+from itertools import count
 from os import (
+    close as os_close,
+    cpu_count,
     path as ospath,
+    pipe,
     walk
 )
 from secrets import token_urlsafe
+from shutil import disk_usage
+from aiofiles import open as aiopen
 from aioshutil import (
     copy2,
     move
 )
 from nekozee.enums import ChatAction
 from re import (
+    compile as re_compile,
+    search as re_search,
     sub,
     I
 )
@@ -30,18 +41,18 @@ from bot import (
     IS_PREMIUM_USER,
     MAX_SPLIT_SIZE,
     bot,
+    bot_loop,
     config_dict,
-    cpu_eater_lock,
     global_extension_filter,
     intervals,
     multi_tags,
-    subprocess_lock,
     task_dict_lock,
     task_dict,
     user_data,
     user
 )
 from .ext_utils.bot_utils import (
+    cmd_exec,
     get_size_bytes,
     new_task,
     sync_to_async
@@ -51,11 +62,16 @@ from .ext_utils.exceptions import NotSupportedExtractionArchive
 from .ext_utils.files_utils import (
     clean_target,
     get_base_name,
+    get_extract_plan,
     get_path_size,
     is_first_archive_split,
-    is_archive,
-    is_archive_split
+    is_archive
 )
+from .ext_utils.process_manager import (
+    ENCODE_WEIGHT,
+    run_process
+)
+from .ext_utils.status_utils import get_readable_file_size
 from .ext_utils.links_utils import (
     is_gdrive_id,
     is_rclone_path,
@@ -72,7 +88,6 @@ from .ext_utils.media_utils import (
 from .ext_utils.media_utils import (
     convert_video,
     convert_audio,
-    split_file,
     get_document_type
 )
 from .task_utils.gdrive_utils.list import GoogleDriveList
@@ -81,7 +96,6 @@ from .task_utils.status_utils.extract_status import ExtractStatus
 from .task_utils.status_utils.sample_video_status import SampleVideoStatus
 from .task_utils.status_utils.media_convert_status import MediaConvertStatus
 from .task_utils.status_utils.meta_status import MetaStatus
-from .task_utils.status_utils.split_status import SplitStatus
 from .task_utils.status_utils.zip_status import ZipStatus
 from .telegram_helper.bot_commands import BotCommands
 from .telegram_helper.message_utils import (
@@ -105,6 +119,20 @@ from .z_utils import (
 )
 
 
+EXTRACT_WORKERS = max(
+    (cpu_count() or 1) // 2,
+    1
+)
+ZSTD_CHUNK_SIZE = 1024 * 1024
+PROGRESS_REGEX = re_compile(rb"(\d+)%")
+
+multi_ids = count(
+    -1,
+    -1
+)
+extract_limit = Semaphore(EXTRACT_WORKERS)
+
+
 class TaskConfig:
     def __init__(self):
         self.mid = self.message.id # type: ignore
@@ -112,6 +140,7 @@ class TaskConfig:
         self.user_id = None
         self.user_dict = {}
         self.dir = f"{DOWNLOAD_DIR}{self.mid}"
+        self.multi_ready = None
         self.link = ""
         self.up_dest = ""
         self.rc_flags = ""
@@ -128,6 +157,7 @@ class TaskConfig:
         self.folder_name = ""
         self.get_chat = None
         self.split_size = 0
+        self.zip_level = ""
         self.max_split_size = 0
         self.multi = 0
         self.size = 0
@@ -160,6 +190,12 @@ class TaskConfig:
         self.as_med = False
         self.as_doc = False
         self.suproc = None
+        self.subprocs = []
+        self.task_link = None
+        self.compress_job = None
+        self.stream_compress = None
+        self.extract_jobs = []
+        self.extract_space = None
         self.thumb = None
         self.dm_message = None
         self.log_message = None
@@ -772,6 +808,9 @@ class TaskConfig:
 
     @new_task
     async def run_multi(self, input_list, obj):
+        if self.multi_ready is not None:
+            self.multi_ready.set()
+            return
         if (
             config_dict["DISABLE_MULTI"]
             and self.multi > 1
@@ -786,84 +825,156 @@ class TaskConfig:
                 smsg
             )
             return
-        await sleep(7)
-        if (
-            not self.multi_tag
-            and self.multi > 1
-        ):
-            self.multi_tag = token_urlsafe(3)
-            multi_tags.add(self.multi_tag)
-        elif self.multi <= 1:
+        if self.multi <= 1:
             if self.multi_tag in multi_tags:
                 multi_tags.discard(self.multi_tag)
             return
+        if not self.multi_tag:
+            self.multi_tag = token_urlsafe(3)
+            multi_tags.add(self.multi_tag)
+        msg = [
+            s.strip()
+            for s
+            in input_list
+        ]
+        index = msg.index("-m")
+        reply_to = [None] * (self.multi - 1)
+        if reply_to_id := self.message.reply_to_message_id: # type: ignore
+            message_ids = [
+                reply_to_id + num
+                for num
+                in range(
+                    1,
+                    self.multi
+                )
+            ]
+            reply_to = []
+            for start in range(
+                0,
+                len(message_ids),
+                200
+            ):
+                reply_to.extend(await self.client.get_messages( # type: ignore
+                    chat_id=self.message.chat.id, # type: ignore
+                    message_ids=message_ids[start:start + 200]
+                ))
+        tasks = []
+        for num in range(
+            1,
+            self.multi
+        ):
+            msg[index + 1] = f"{self.multi - num}"
+            tasks.append((
+                " ".join(msg),
+                reply_to[num - 1]
+            ))
+        bot_loop.create_task(self._start_multi(
+            tasks,
+            obj,
+            "Multi"
+        ))
+
+    async def start_bulk(self, cmd, obj):
+        total = len(self.bulk)
         if (
-            self.multi_tag
-            and self.multi_tag
-            not in multi_tags
+            total > 2
+            and not self.multi_tag
         ):
-            smsg = await send_message(
-                self.message, # type: ignore
-                f"{self.tag} Multi Task has been cancelled!"
-            )
-            await send_status_message(self.message) # type: ignore
-            await auto_delete_message(
-                self.message, # type: ignore
-                smsg
-            )
-            async with task_dict_lock:
-                for fd_name in self.same_dir: # type: ignore
-                    self.same_dir[fd_name]["total"] -= self.multi # type: ignore
-            return
-        if len(self.bulk) != 0:
-            msg = input_list[:1]
-            msg.append(f"{self.bulk[0]} -m {self.multi - 1} {self.options}")
-            msgts = " ".join(msg)
-            if self.multi > 2:
-                msgts += f"\nCancel Multi: <code>/{BotCommands.CancelTaskCommand[1]} {self.multi_tag}</code>"
-            nextmsg = await send_message(
-                self.message, # type: ignore
-                msgts
+            self.multi_tag = token_urlsafe(3)
+            multi_tags.add(self.multi_tag)
+        await self._start_multi(
+            [
+                (
+                    f"{cmd} {link} -m {total - num} {self.options}",
+                    None
+                )
+                for (
+                    num,
+                    link
+                ) in enumerate(self.bulk)
+            ],
+            obj,
+            "Bulk"
+        )
+
+    async def _start_multi(self, tasks, obj, mode):
+        msg = f"<b>{mode} Task:</b> <code>{len(tasks)}</code> link(s) added."
+        if self.multi_tag:
+            msg += f"\nCancel Multi: <code>/{BotCommands.CancelTaskCommand[1]} {self.multi_tag}</code>"
+        base = await send_message(
+            self.message, # type: ignore
+            msg
+        )
+        if isinstance(
+            base,
+            str
+        ):
+            base = self.message
+        for (
+            num,
+            (
+                text,
+                reply_to
             )
-        else:
-            msg = [
-                s.strip()
-                for s
-                in input_list
-            ]
-            index = msg.index("-m")
-            msg[index + 1] = f"{self.multi - 1}"
-            nextmsg = await self.client.get_messages( # type: ignore
-                chat_id=self.message.chat.id, # type: ignore
-                message_ids=self.message.reply_to_message_id + 1, # type: ignore
+        ) in enumerate(tasks):
+            if intervals["stopAll"]:
+                return
+            if (
+                self.multi_tag
+                and self.multi_tag
+                not in multi_tags
+            ):
+                smsg = await send_message(
+                    self.message, # type: ignore
+                    f"{self.tag} Multi Task has been cancelled!"
+                )
+                await send_status_message(self.message) # type: ignore
+                await auto_delete_message(
+                    self.message, # type: ignore
+                    smsg
+                )
+                async with task_dict_lock:
+                    for fd_name in self.same_dir: # type: ignore
+                        self.same_dir[fd_name]["total"] -= len(tasks) - num # type: ignore
+                return
+            nextmsg = copy(base)
+            nextmsg.text = text
+            nextmsg.reply_to_message = reply_to
+            nextmsg.reply_to_message_id = (
+                reply_to.id
+                if reply_to is not None
+                else None
             )
-            msgts = " ".join(msg)
-            if self.multi > 2:
-                msgts += f"\nCancel Multi: <code>/{BotCommands.CancelTaskCommand[1]} {self.multi_tag}</code>"
-            nextmsg = await send_message(
+            if self.message.from_user: # type: ignore
+                nextmsg.from_user = self.user
+            else:
+                nextmsg.sender_chat = self.user
+            listener = obj(
+                self.client, # type: ignore
                 nextmsg,
-                msgts
+                self.is_qbit,
+                self.is_leech,
+                self.same_dir, # type: ignore
+                None,
+                self.multi_tag,
+                self.options,
             )
-        nextmsg = await self.client.get_messages( # type: ignore
-            chat_id=self.message.chat.id, # type: ignore
-            message_ids=nextmsg.id # type: ignore
-        )
-        if self.message.from_user: # type: ignore
-            nextmsg.from_user = self.user
-        else:
-            nextmsg.sender_chat = self.user
-        if intervals["stopAll"]:
-            return
-        await obj(
-            self.client, # type: ignore
-            nextmsg,
-            self.is_qbit,
-            self.is_leech,
-            self.same_dir, # type: ignore
-            self.bulk,
-            self.multi_tag,
-            self.options,
-        ).new_event()
+            listener.mid = next(multi_ids)
+            listener.dir = f"{DOWNLOAD_DIR}{listener.mid}"
+            listener.task_link = f"{nextmsg.link}#{-listener.mid}"
+            listener.multi_ready = Event()
+            event_task = bot_loop.create_task(listener.new_event())
+            ready_task = bot_loop.create_task(listener.multi_ready.wait())
+            await wait(
+                [
+                    event_task,
+                    ready_task
+                ],
+                return_when=FIRST_COMPLETED
+            )
+            ready_task.cancel()
+        if self.multi_tag in multi_tags:
+            multi_tags.discard(self.multi_tag)
 
     async def init_bulk(self, input_list, bulk_start, bulk_end, obj):
         if (
@@ -887,41 +998,12 @@ class TaskConfig:
             )
             if len(self.bulk) == 0:
                 raise ValueError("Bulk Empty!")
-            b_msg = input_list[:1]
             self.options = input_list[1:]
             index = self.options.index("-b")
             del self.options[index]
             if bulk_start or bulk_end:
                 del self.options[index + 1]
             self.options = " ".join(self.options)
-            b_msg.append(f"{self.bulk[0]} -m {len(self.bulk)} {self.options}")
-            msg = " ".join(b_msg)
-            if len(self.bulk) > 2:
-                self.multi_tag = token_urlsafe(3)
-                multi_tags.add(self.multi_tag)
-                msg += f"\nCancel Multi: <code>/{BotCommands.CancelTaskCommand[1]} {self.multi_tag}</code>"
-            nextmsg = await send_message(
-                self.message, # type: ignore
-                msg
-            )
-            nextmsg = await self.client.get_messages( # type: ignore
-                chat_id=self.message.chat.id, # type: ignore
-                message_ids=nextmsg.id # type: ignore
-            )
-            if self.message.from_user: # type: ignore
-                nextmsg.from_user = self.user
-            else:
-                nextmsg.sender_chat = self.user
-            await obj(
-                self.client, # type: ignore
-                nextmsg,
-                self.is_qbit,
-                self.is_leech,
-                self.same_dir, # type: ignore
-                self.bulk,
-                self.multi_tag,
-                self.options,
-            ).new_event()
         except:
             smsg = await send_message(
                 self.message, # type: ignore
@@ -931,88 +1013,363 @@ class TaskConfig:
                 self.message, # type: ignore
                 smsg
             )
+            return
+        await self.start_bulk(
+            input_list[0],
+            obj
+        )
 
-    async def decompress_zst(self, dl_path, is_dir=False):
-        if is_dir:
-            for (
-                dirpath,
+    async def _read_7z_progress(self, proc, job):
+        while data := await proc.stdout.read(1024):
+            if percents := PROGRESS_REGEX.findall(data):
+                job["done"] = job["size"] * int(percents[-1]) / 100
+
+    async def run_7z(self, cmd, job, cpu=1, io=1, mem=0):
+        if (proc := await run_process(
+            self,
+            cmd,
+            cpu=cpu,
+            io=io,
+            mem=mem,
+            stdout=PIPE,
+            stderr=PIPE
+        )) is None:
+            return (
+                -9,
+                ""
+            )
+        self.subprocs.append(proc)
+        try:
+            (
                 _,
-                files
-            ) in await sync_to_async(
-                walk,
-                dl_path,
-                topdown=False
+                stderr
+            ) = await gather(
+                self._read_7z_progress(
+                    proc,
+                    job
+                ),
+                proc.stderr.read() # type: ignore
+            )
+            code = await proc.wait()
+        finally:
+            self.subprocs.remove(proc)
+        try:
+            stderr = stderr.decode().strip()
+        except:
+            stderr = "Unable to decode the error!"
+        return (
+            code,
+            stderr
+        )
+
+    async def _run_7z(self, job, t_path, pswd):
+        cmd = [
+            "7z",
+            "x",
+            f"-p{pswd}",
+            job["path"],
+            f"-o{t_path}",
+            "-aot",
+            "-xr!@PaxHeader",
+            "-bsp1",
+            "-bso0",
+        ]
+        if not pswd:
+            del cmd[2]
+        return await self.run_7z(
+            cmd,
+            job
+        )
+
+    async def _feed_zstd(self, proc, job):
+        try:
+            async with aiopen(
+                job["path"],
+                "rb"
+            ) as f:
+                while chunk := await f.read(ZSTD_CHUNK_SIZE):
+                    if self.is_cancelled:
+                        break
+                    proc.stdin.write(chunk)
+                    await proc.stdin.drain()
+                    job["done"] += len(chunk)
+            proc.stdin.close()
+        except (
+            BrokenPipeError,
+            ConnectionResetError
+        ):
+            pass
+
+    async def _run_zstd(self, job, out_path, is_tar):
+        if is_tar:
+            await makedirs(
+                out_path,
+                exist_ok=True
+            )
+            (
+                read_fd,
+                write_fd
+            ) = pipe()
+            output = write_fd
+        else:
+            read_fd = None
+            output = open(
+                out_path,
+                "wb"
+            )
+        try:
+            procs = [await run_process(
+                self,
+                [
+                    "zstd",
+                    "-d",
+                    "-c",
+                    "-q"
+                ],
+                cpu=1,
+                stdin=PIPE,
+                stdout=output,
+                stderr=PIPE
+            )]
+            if (
+                is_tar
+                and procs[0] is not None
             ):
-                for file_ in files:
-                    if file_.endswith(".zst"):
-                        f_path = ospath.join(
-                            dirpath,
-                            file_
-                        )
-                        out_path = get_base_name(f_path)
-                        cmd = [
-                            "unzstd",
-                            f_path,
-                            "-o",
-                            out_path
-                        ]
-                        if self.is_cancelled:
-                            return ""
-                        async with subprocess_lock:
-                            self.suproc = await create_subprocess_exec(
-                                *cmd,
-                                stderr=PIPE
-                            )
-                        (
-                            _,
-                            stderr
-                        ) = await self.suproc.communicate()
-                        if self.is_cancelled:
-                            return ""
-                        code = self.suproc.returncode
-                        if code != 0:
-                            try:
-                                stderr = stderr.decode().strip()
-                            except:
-                                stderr = "Unable to decode the error!"
-                            LOGGER.error(
-                                f"{stderr}. Unable to extract zst file!. Path: {f_path}"
-                            )
-                        elif not self.seed:
-                            await remove(f_path)
-            return
-        elif dl_path.endswith(".zst"):
-            out_path = get_base_name(dl_path)
-            cmd = [
-                "unzstd",
-                dl_path,
-                "-o",
-                out_path
-            ]
-            if self.is_cancelled:
-                return ""
-            async with subprocess_lock:
-                self.suproc = await create_subprocess_exec(
-                    *cmd,
+                procs.append(await run_process(
+                    self,
+                    [
+                        "tar",
+                        "-x",
+                        "-f",
+                        "-",
+                        "-C",
+                        out_path
+                    ],
+                    io=1,
+                    stdin=read_fd,
                     stderr=PIPE
+                ))
+        finally:
+            if is_tar:
+                os_close(read_fd) # type: ignore
+                os_close(write_fd) # type: ignore
+            else:
+                output.close() # type: ignore
+        if None in procs:
+            for proc in procs:
+                if proc is not None:
+                    proc.kill()
+                    await proc.wait()
+            return (
+                -9,
+                ""
+            )
+        self.subprocs.extend(procs)
+        try:
+            (
+                _,
+                *errors
+            ) = await gather(
+                self._feed_zstd(
+                    procs[0],
+                    job
+                ),
+                *(
+                    proc.stderr.read() # type: ignore
+                    for proc
+                    in procs
                 )
+            )
+            codes = [
+                await proc.wait()
+                for proc
+                in procs
+            ]
+        finally:
+            for proc in procs:
+                self.subprocs.remove(proc)
+        try:
+            stderr = " ".join(
+                error.decode().strip()
+                for error
+                in errors
+            ).strip()
+        except:
+            stderr = "Unable to decode the error!"
+        return (
+            next(
+                (
+                    code
+                    for code
+                    in codes
+                    if code != 0
+                ),
+                0
+            ),
+            stderr
+        )
+
+    async def _unpacked_size(self, job, pswd):
+        if job["path"].endswith(".tar"):
+            return job["size"]
+        if job["path"].endswith(".zst"):
+            (
+                stdout,
+                _,
+                code
+            ) = await cmd_exec([
+                "zstd",
+                "-lv",
+                job["path"]
+            ])
+            # frames written without a content size only give the compressed size
+            if (
+                code == 0
+                and (match := re_search(
+                    r"Decompressed Size:.*\((\d+) B\)",
+                    stdout
+                ))
+            ):
+                return int(match.group(1))
+            return job["size"]
+        async with extract_limit:
             (
+                stdout,
                 _,
+                code
+            ) = await cmd_exec([
+                "7z",
+                "l",
+                "-slt",
+                "-ba",
+                f"-p{pswd}",
+                job["path"]
+            ])
+        if code != 0:
+            return job["size"]
+        return sum(
+            int(line[7:])
+            for line
+            in stdout.splitlines()
+            if line.startswith("Size = ")
+            and line[7:].isdigit()
+        )
+
+    async def _report_extract_size(self, jobs, pswd):
+        needed = sum(await gather(*(
+            self._unpacked_size(
+                job,
+                pswd
+            )
+            for job
+            in jobs
+        )))
+        free = (await sync_to_async(
+            disk_usage,
+            DOWNLOAD_DIR
+        )).free
+        self.extract_space = (
+            needed,
+            free
+        )
+        LOGGER.info(
+            f"Extracting {self.name} needs up to {get_readable_file_size(needed)} of extra disk space. Free: {get_readable_file_size(free)}"
+        )
+        if needed > free:
+            LOGGER.warning(f"Not enough disk space to extract {self.name}, trying anyway!")
+
+    def _extract_target(self, dirpath):
+        if self.seed:
+            return dirpath.replace(
+                self.dir,
+                self.new_dir
+            )
+        return dirpath
+
+    async def _extract_zst_job(self, job):
+        t_path = self._extract_target(job["dir"])
+        out_path = ospath.join(
+            t_path,
+            ospath.basename(get_base_name(job["path"]))
+        )
+        is_tar = out_path.endswith(".tar")
+        if not is_tar:
+            await makedirs(
+                t_path,
+                exist_ok=True
+            )
+        async with extract_limit:
+            if self.is_cancelled:
+                return None
+            (
+                code,
                 stderr
-            ) = await self.suproc.communicate()
+            ) = await self._run_zstd(
+                job,
+                t_path
+                if is_tar
+                else out_path,
+                is_tar
+            )
+        if self.is_cancelled:
+            return None
+        if code != 0:
+            LOGGER.error(
+                f"{stderr}. Unable to extract zst file!. Path: {job['path']}"
+            )
+            return None
+        if not self.seed:
+            await remove(job["path"])
+        file_ = ospath.basename(out_path)
+        if is_tar or not (
+            is_first_archive_split(file_)
+            or is_archive(file_)
+            and not file_.endswith(".rar")
+        ):
+            return None
+        return {
+            "path": out_path,
+            "dir": t_path,
+            "volumes": [out_path],
+            "size": await aiopath.getsize(out_path),
+            "done": 0,
+            "temp": True,
+        }
+
+    async def _extract_archive_job(self, job, pswd):
+        t_path = (
+            job["dir"]
+            if job.get("temp")
+            else self._extract_target(job["dir"])
+        )
+        async with extract_limit:
             if self.is_cancelled:
-                return ""
-            code = self.suproc.returncode
-            if code != 0:
+                return
+            (
+                code,
+                stderr
+            ) = await self._run_7z(
+                job,
+                t_path,
+                pswd
+            )
+        if self.is_cancelled:
+            return
+        if code != 0:
+            LOGGER.error(
+                f"{stderr}. Unable to extract archive splits!. Path: {job['path']}"
+            )
+            return
+        job["done"] = job["size"]
+        if (
+            not self.seed
+            or job.get("temp")
+        ):
+            for part in job["volumes"]:
                 try:
-                    stderr = stderr.decode().strip()
+                    await remove(part)
                 except:
-                    stderr = "Unable to decode the error!"
-                LOGGER.error(f"{stderr}. Unable to extract zst file!. Path: {dl_path}")
-            elif not self.seed:
-                await remove(dl_path)
-            return out_path
-        return dl_path
+                    self.is_cancelled = True
 
     async def proceed_extract(self, dl_path, gid):
         pswd = (
@@ -1036,92 +1393,84 @@ class TaskConfig:
                     up_path = f"{self.new_dir}/{self.name}"
                 else:
                     up_path = dl_path
-                await self.decompress_zst(
-                    dl_path,
-                    is_dir=True
+                (
+                    zst_jobs,
+                    archives
+                ) = await sync_to_async(
+                    get_extract_plan,
+                    dl_path
                 )
-                for (
-                    dirpath,
-                    _,
-                    files
-                ) in await sync_to_async(
-                    walk,
-                    dl_path,
-                    topdown=False
-                ):
-                    for file_ in files:
-                        if (
-                            is_first_archive_split(file_)
-                            or is_archive(file_)
-                            and not file_.endswith(".rar")
-                            and not file_.endswith(".zst")
-                        ):
-                            f_path = ospath.join(
-                                dirpath,
-                                file_
-                            )
-                            t_path = (
-                                dirpath.replace(
-                                    self.dir,
-                                    self.new_dir
-                                )
-                                if self.seed
-                                else dirpath
-                            )
-                            cmd = [
-                                "7z",
-                                "x",
-                                f"-p{pswd}",
-                                f_path,
-                                f"-o{t_path}",
-                                "-aot",
-                                "-xr!@PaxHeader",
-                            ]
-                            if not pswd:
-                                del cmd[2]
-                            if self.is_cancelled:
-                                return ""
-                            async with subprocess_lock:
-                                self.suproc = await create_subprocess_exec(
-                                    *cmd,
-                                    stderr=PIPE
-                                )
-                            (
-                                _,
-                                stderr
-                            ) = await self.suproc.communicate()
-                            if self.is_cancelled:
-                                return ""
-                            code = self.suproc.returncode
-                            if code != 0:
-                                try:
-                                    stderr = stderr.decode().strip()
-                                except:
-                                    stderr = "Unable to decode the error!"
-                                LOGGER.error(
-                                    f"{stderr}. Unable to extract archive splits!. Path: {f_path}"
-                                )
-                    if (
-                        not self.seed
-                        and self.suproc is not None
-                        and self.suproc.returncode == 0
-                    ):
-                        for file_ in files:
-                            if (
-                                is_archive_split(file_) or
-                                is_archive(file_)
-                            ):
-                                del_path = ospath.join(
-                                    dirpath,
-                                    file_
-                                )
-                                try:
-                                    await remove(del_path)
-                                except:
-                                    self.is_cancelled = True
+                self.extract_jobs = zst_jobs + archives
+                await self._report_extract_size(
+                    self.extract_jobs,
+                    pswd
+                )
+                for job in await gather(*(
+                    self._extract_zst_job(job)
+                    for job
+                    in zst_jobs
+                )):
+                    if job is not None:
+                        archives.append(job)
+                        self.extract_jobs.append(job)
+                if self.is_cancelled:
+                    return ""
+                await gather(*(
+                    self._extract_archive_job(
+                        job,
+                        pswd
+                    )
+                    for job
+                    in archives
+                ))
+                if self.is_cancelled:
+                    return ""
                 return up_path
             else:
-                dl_path = await self.decompress_zst(dl_path)
+                if dl_path.endswith(".zst"):
+                    job = {
+                        "path": dl_path,
+                        "size": await aiopath.getsize(dl_path),
+                        "done": 0,
+                    }
+                    self.extract_jobs = [job]
+                    await self._report_extract_size(
+                        self.extract_jobs,
+                        pswd
+                    )
+                    out_path = get_base_name(dl_path)
+                    is_tar = out_path.endswith(".tar")
+                    if is_tar:
+                        out_path = get_base_name(out_path)
+                        if self.seed:
+                            self.new_dir = f"{self.dir}10000"
+                            out_path = out_path.replace(
+                                self.dir,
+                                self.new_dir
+                            )
+                    async with extract_limit:
+                        (
+                            code,
+                            stderr
+                        ) = await self._run_zstd(
+                            job,
+                            out_path,
+                            is_tar
+                        )
+                    if self.is_cancelled:
+                        return ""
+                    if code != 0:
+                        LOGGER.error(
+                            f"{stderr}. Unable to extract zst file! Uploading anyway. Path: {dl_path}"
+                        )
+                        self.new_dir = ""
+                        return dl_path
+                    if not self.seed:
+                        await remove(dl_path)
+                    if is_tar:
+                        LOGGER.info(f"Extracted Path: {out_path}")
+                        return out_path
+                    dl_path = out_path
                 up_path = get_base_name(dl_path)
                 if self.seed:
                     self.new_dir = f"{self.dir}10000"
@@ -1129,31 +1478,29 @@ class TaskConfig:
                         self.dir,
                         self.new_dir
                     )
-                cmd = [
-                    "7z",
-                    "x",
-                    f"-p{pswd}",
-                    dl_path,
-                    f"-o{up_path}",
-                    "-aot",
-                    "-xr!@PaxHeader",
-                ]
-                if not pswd:
-                    del cmd[2]
+                job = {
+                    "path": dl_path,
+                    "size": await aiopath.getsize(dl_path),
+                    "done": 0,
+                }
+                self.extract_jobs = [job]
+                await self._report_extract_size(
+                    self.extract_jobs,
+                    pswd
+                )
                 if self.is_cancelled:
                     return ""
-                async with subprocess_lock:
-                    self.suproc = await create_subprocess_exec(
-                        *cmd,
-                        stderr=PIPE
+                async with extract_limit:
+                    (
+                        code,
+                        stderr
+                    ) = await self._run_7z(
+                        job,
+                        up_path,
+                        pswd
                     )
-                (
-                    _,
-                    stderr
-                ) = await self.suproc.communicate()
                 if self.is_cancelled:
                     return ""
-                code = self.suproc.returncode
                 if code == -9:
                     self.is_cancelled = True
                     return ""
@@ -1166,10 +1513,6 @@ class TaskConfig:
                             self.is_cancelled = True
                     return up_path
                 else:
-                    try:
-                        stderr = stderr.decode().strip()
-                    except:
-                        stderr = "Unable to decode the error!"
                     LOGGER.error(
                         f"{stderr}. Unable to extract archive! Uploading anyway. Path: {dl_path}"
                     )
@@ -1182,7 +1525,36 @@ class TaskConfig:
             self.new_dir = ""
             return dl_path
 
-    async def proceed_compress(self, dl_path, gid, o_files, ft_delete):
+    def _compress_options(self):
+        data = (
+            self.zip_level.split(":")
+            if isinstance(
+                self.zip_level,
+                str
+            )
+            else []
+        )
+        level = (
+            int(data[0])
+            if data
+            and data[0].isdigit()
+            else config_dict["ZIP_LEVEL"]
+        )
+        threads = (
+            int(data[1])
+            if len(data) > 1
+            and data[1].isdigit()
+            else config_dict["ZIP_THREADS"]
+        )
+        return (
+            min(
+                level,
+                9
+            ),
+            threads
+        )
+
+    async def _compress_cmd(self, dl_path, up_path, o_files, split_size):
         pswd = (
             self.compress
             if isinstance(
@@ -1191,33 +1563,27 @@ class TaskConfig:
             )
             else ""
         )
-        if (
-            self.seed
-            and not self.new_dir
-        ):
-            self.new_dir = f"{self.dir}10000"
-            up_path = f"{self.new_dir}/{self.name}.7z"
-            delete = False
-        else:
-            up_path = f"{dl_path}.7z"
-            delete = True
-        async with task_dict_lock:
-            task_dict[self.mid] = ZipStatus(self, gid)
-        size = await get_path_size(dl_path)
-        if self.equal_splits:
-            parts = -(-size // self.split_size)
-            split_size = (size // parts) + (size % parts)
-        else:
-            split_size = self.split_size
+        (
+            level,
+            threads
+        ) = self._compress_options()
         cmd = [
             "7z",
-            f"-v{split_size}b",
             "a",
-            "-mx=0",
-            f"-p{pswd}",
-            up_path,
-            dl_path,
+            f"-mx={level}",
+            "-bsp1",
+            "-bso0",
         ]
+        if threads:
+            cmd.append(f"-mmt{threads}")
+        if split_size:
+            cmd.append(f"-v{split_size}b")
+        if pswd:
+            cmd.append(f"-p{pswd}")
+        cmd.extend((
+            up_path,
+            dl_path
+        ))
         if await aiopath.isdir(dl_path):
             cmd.extend(
                 f"-xr!*.{ext}"
@@ -1237,115 +1603,97 @@ class TaskConfig:
                             ""
                         )
                     cmd.append(f"-xr!{fte}")
-        if self.is_leech and int(size) > self.split_size:
-            if not pswd:
-                del cmd[4]
-            LOGGER.info(f"Zip: orig_path: {dl_path}, zip_path: {up_path}.0*")
+        return cmd
+
+    async def finish_compress(self, dl_path, delete, ft_delete):
+        if not self.seed or delete:
+            await clean_target(dl_path)
+        for f in ft_delete:
+            if await aiopath.exists(f):
+                try:
+                    await remove(f)
+                except:
+                    pass
+        ft_delete.clear()
+
+    async def proceed_compress(self, dl_path, gid, o_files, ft_delete):
+        if (
+            self.seed
+            and not self.new_dir
+        ):
+            self.new_dir = f"{self.dir}10000"
+            up_path = f"{self.new_dir}/{self.name}.7z"
+            delete = False
+        else:
+            up_path = f"{dl_path}.7z"
+            delete = True
+        size = await get_path_size(dl_path)
+        if (
+            self.is_leech
+            and int(size) > self.split_size
+        ):
+            if self.equal_splits:
+                parts = -(-size // self.split_size)
+                split_size = (size // parts) + (size % parts)
+            else:
+                split_size = self.split_size
         else:
-            del cmd[1]
-            if not pswd:
-                del cmd[3]
-            LOGGER.info(f"Zip: orig_path: {dl_path}, zip_path: {up_path}")
+            split_size = 0
+        cmd = await self._compress_cmd(
+            dl_path,
+            up_path,
+            o_files,
+            split_size
+        )
+        cpu = self._compress_options()[1] or ENCODE_WEIGHT
+        if split_size:
+            LOGGER.info(f"Zip: orig_path: {dl_path}, zip_path: {up_path}.0*")
+            self.stream_compress = {
+                "cmd": cmd,
+                "cpu": cpu,
+                "source": dl_path,
+                "up_path": up_path,
+                "delete": delete,
+                "size": size,
+            }
+            return dl_path
+        LOGGER.info(f"Zip: orig_path: {dl_path}, zip_path: {up_path}")
+        async with task_dict_lock:
+            task_dict[self.mid] = ZipStatus(self, gid)
         if self.is_cancelled:
             return ""
-        async with subprocess_lock:
-            self.suproc = await create_subprocess_exec(
-                *cmd,
-                stderr=PIPE
-            )
+        self.compress_job = {
+            "size": size,
+            "done": 0,
+        }
         (
-            _,
+            code,
             stderr
-        ) = await self.suproc.communicate()
+        ) = await self.run_7z(
+            cmd,
+            self.compress_job,
+            cpu=cpu,
+            mem=1
+        )
         if self.is_cancelled:
             return ""
-        code = self.suproc.returncode
         if code == -9:
             self.is_cancelled = True
             return ""
         elif code == 0:
-            if not self.seed or delete:
-                await clean_target(dl_path)
-            for f in ft_delete:
-                if await aiopath.exists(f):
-                    try:
-                        await remove(f)
-                    except:
-                        pass
-            ft_delete.clear()
+            await self.finish_compress(
+                dl_path,
+                delete,
+                ft_delete
+            )
             return up_path
         else:
             await clean_target(self.new_dir)
             if not delete:
                 self.new_dir = ""
-            try:
-                stderr = stderr.decode().strip()
-            except:
-                stderr = "Unable to decode the error!"
             LOGGER.error(f"{stderr}. Unable to zip this path: {dl_path}")
             return dl_path
 
-    async def proceed_split(self, up_dir, m_size, o_files, gid):
-        checked = False
-        for (
-            dirpath,
-            _,
-            files
-        ) in await sync_to_async(
-            walk,
-            up_dir,
-            topdown=False
-        ):
-            for file_ in files:
-                f_path = ospath.join(
-                    dirpath,
-                    file_
-                )
-                if f_path in o_files:
-                    continue
-                f_size = await aiopath.getsize(f_path)
-                if f_size > self.split_size:
-                    if not checked:
-                        checked = True
-                        async with task_dict_lock:
-                            task_dict[self.mid] = SplitStatus(self, gid)
-                        LOGGER.info(f"Splitting: {self.name}")
-                    res = await split_file(
-                        f_path,
-                        f_size,
-                        dirpath,
-                        file_,
-                        self.split_size,
-                        self
-                    )
-                    if self.is_cancelled:
-                        return
-                    if not res:
-                        if f_size >= self.max_split_size:
-                            if (
-                                self.seed
-                                and not self.new_dir
-                            ):
-                                m_size.append(f_size)
-                                o_files.append(f_path)
-                            else:
-                                try:
-                                    await remove(f_path)
-                                except:
-                                    return
-                        continue
-                    elif (
-                        not self.seed
-                        or self.new_dir
-                    ):
-                        try:
-                            await remove(f_path)
-                        except:
-                            return
-                    else:
-                        m_size.append(f_size)
-                        o_files.append(f_path)
-
     async def generate_sample_video(self, dl_path, gid, unwanted_files, ft_delete):
         data = (
             self.sample_video.split(":")
@@ -1379,15 +1727,13 @@ class TaskConfig:
         checked = False
         if await aiopath.isfile(dl_path):
             if (await get_document_type(dl_path))[0]:
-                checked = True
-                async with cpu_eater_lock:
-                    LOGGER.info(f"Creating Sample video: {self.name}")
-                    res = await create_sample_video(
-                        self,
-                        dl_path,
-                        sample_duration,
-                        part_duration
-                    )
+                LOGGER.info(f"Creating Sample video: {self.name}")
+                res = await create_sample_video(
+                    self,
+                    dl_path,
+                    sample_duration,
+                    part_duration
+                )
                 if res:
                     newfolder = ospath.splitext(dl_path)[0]
                     name = dl_path.rsplit(
@@ -1458,10 +1804,8 @@ class TaskConfig:
                     if (await get_document_type(f_path))[0]:
                         if not checked:
                             checked = True
-                            await cpu_eater_lock.acquire()
                             LOGGER.info(f"Creating Sample videos: {self.name}")
                         if self.is_cancelled:
-                            cpu_eater_lock.release()
                             return ""
                         res = await create_sample_video(
                             self,
@@ -1471,8 +1815,6 @@ class TaskConfig:
                         )
                         if res:
                             ft_delete.append(res)
-            if checked:
-                cpu_eater_lock.release()
 
         return dl_path
 
@@ -1549,7 +1891,6 @@ class TaskConfig:
                             self,
                             gid
                         )
-                    await cpu_eater_lock.acquire()
                     LOGGER.info(f"Converting: {self.name}")
                 else:
                     LOGGER.info(f"Converting: {m_path}")
@@ -1583,7 +1924,6 @@ class TaskConfig:
                             self,
                             gid
                         )
-                    await cpu_eater_lock.acquire()
                     LOGGER.info(f"Converting: {self.name}")
                 else:
                     LOGGER.info(f"Converting: {m_path}")
@@ -1602,8 +1942,6 @@ class TaskConfig:
 
         if await aiopath.isfile(dl_path):
             output_file = await proceed_convert(dl_path) # type: ignore
-            if checked:
-                cpu_eater_lock.release()
             if output_file:
                 if self.seed:
                     self.new_dir = f"{self.dir}10000"
@@ -1638,7 +1976,6 @@ class TaskConfig:
             ):
                 for file_ in files:
                     if self.is_cancelled:
-                        cpu_eater_lock.release()
                         return ""
                     f_path = ospath.join(
                         dirpath,
@@ -1656,8 +1993,6 @@ class TaskConfig:
                                 await remove(f_path)
                             except:
                                 pass
-            if checked:
-                cpu_eater_lock.release()
         return dl_path
 
     async def generate_screenshots(self, dl_path):
@@ -3,15 +3,30 @@ from aiofiles.os import (
     path as aiopath,
     makedirs
 )
+from asyncio import (
+    Lock,
+    sleep
+)
+from copy import deepcopy
 from dotenv import dotenv_values
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import (
+    DeleteOne,
+    MongoClient,
+    ReplaceOne,
+    UpdateOne
+)
 from pymongo.server_api import ServerApi
-from pymongo.errors import PyMongoError
+from pymongo.errors import (
+    BulkWriteError,
+    PyMongoError
+)
 
 from bot import (
     BOT_ID,
     LOGGER,
     aria2_options,
+    bot_loop,
     bot_name,
     config_dict,
     qbit_options,
@@ -19,17 +34,386 @@ from bot import (
     user_data,
 )
 
+DB_FLUSH_INTERVAL = 1
+DB_RETRY_MAX = 60
+USER_FILE_KEYS = [
+    "thumb",
+    "rclone_config",
+    "token_pickle"
+]
+
+
+def _combine_ops(current, change):
+    if (
+        current is None
+        or "set" not in change
+    ):
+        return dict(change)
+    if "delete" in current:
+        return {"replace": dict(change["set"])}
+    if "replace" in current:
+        doc = {
+            **current["replace"],
+            **change["set"]
+        }
+        for key in change["unset"]:
+            doc.pop(
+                key,
+                None
+            )
+        return {"replace": doc}
+    fields = dict(current["set"])
+    for key in change["unset"]:
+        fields.pop(
+            key,
+            None
+        )
+    fields.update(change["set"])
+    return {
+        "set": fields,
+        "unset": (current["unset"] - change["set"].keys()) | change["unset"],
+    }
+
+
+def _merge_op(current, change):
+    op = _combine_ops(
+        current,
+        change
+    )
+    op.pop(
+        "state",
+        None
+    )
+    if "state" in change:
+        op["state"] = change["state"]
+    elif (
+        current is not None
+        and "state" in current
+    ):
+        op["state"] = current["state"]
+    return op
+
+
+def _build_request(_id, op):
+    if "delete" in op:
+        return DeleteOne({"_id": _id})
+    if "replace" in op:
+        return ReplaceOne(
+            {"_id": _id},
+            op["replace"],
+            upsert=True
+        )
+    if not (
+        op["set"]
+        or op["unset"]
+    ):
+        return None
+    update = {}
+    if op["set"]:
+        update["$set"] = op["set"]
+    if op["unset"]:
+        update["$unset"] = {
+            key: ""
+            for key
+            in op["unset"]
+        }
+    return UpdateOne(
+        {"_id": _id},
+        update,
+        upsert=True
+    )
+
+
+def _build_requests(pending):
+    requests = {}
+    for (
+        key,
+        op
+    ) in pending.items():
+        if (request := _build_request(
+            key[1],
+            op
+        )) is not None:
+            requests.setdefault(
+                key[0],
+                []
+            ).append((
+                key,
+                request
+            ))
+    return requests
+
 
 class DbManager:
     def __init__(self):
         self._return  = False
         self._db = None
         self._conn = None
+        self._pending = {}
+        self._inflight = {}
+        self._snapshots = {}
+        self._flusher = None
+        self._flush_lock = Lock()
+        self._retry_delay = 0
+
+    def _queue(self, name, _id, op):
+        key = (
+            name,
+            _id
+        )
+        self._pending[key] = _merge_op(
+            self._pending.get(key),
+            op
+        )
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        if (
+            self._flusher is None
+            or self._flusher.done()
+        ):
+            self._flusher = bot_loop.create_task(self._flush_later())
+
+    def _base_state(self, key):
+        for store in [
+            self._pending,
+            self._inflight
+        ]:
+            if (
+                (op := store.get(key)) is not None
+                and "state" in op
+            ):
+                return op["state"]
+        return self._snapshots.get(key)
+
+    def _queue_diff(self, name, _id, data, replace=False, unset=()):
+        key = (
+            name,
+            _id
+        )
+        old = self._base_state(key)
+        data = deepcopy(data)
+        if any(
+            "." in f"{field}"
+            or f"{field}".startswith("$")
+            for field
+            in data
+        ):
+            op = {"replace": dict(data)}
+        elif old is None:
+            op = (
+                {"replace": dict(data)}
+                if replace
+                else {
+                    "set": dict(data),
+                    "unset": set(unset)
+                }
+            )
+        else:
+            op = {
+                "set": {
+                    field: value
+                    for (
+                        field,
+                        value
+                    ) in data.items()
+                    if field not in old
+                    or old[field] != value
+                },
+                "unset": (old.keys() - data.keys()) | set(unset)
+            }
+            if not (
+                op["set"]
+                or op["unset"]
+            ):
+                return
+        op["state"] = data
+        self._queue(
+            name,
+            _id,
+            op
+        )
+
+    def _commit_state(self, key, op):
+        if "delete" in op:
+            self._snapshots.pop(
+                key,
+                None
+            )
+        elif "state" in op:
+            self._snapshots[key] = op["state"]
+
+    def _drop_state(self, key):
+        self._snapshots.pop(
+            key,
+            None
+        )
+        if (
+            (op := self._pending.get(key)) is not None
+            and "set" in op
+            and "state" in op
+        ):
+            op["set"] = dict(op["state"])
+
+    def _discard(self, name):
+        for store in [
+            self._pending,
+            self._snapshots
+        ]:
+            for key in [
+                key
+                for key
+                in store
+                if key[0] == name
+            ]:
+                del store[key]
+
+    async def _flush_later(self):
+        # writes queued mid-flush see this task still running and don't
+        # start another one, so keep flushing until nothing is left
+        while True:
+            await sleep(self._retry_delay or DB_FLUSH_INTERVAL)
+            await self.flush()
+            if (
+                self._return
+                or not self._pending
+            ):
+                return
+
+    async def flush(self):
+        async with self._flush_lock:
+            if (
+                self._return
+                or not self._pending
+            ):
+                return
+            self._inflight = self._pending
+            self._pending = {}
+            try:
+                await self._write(self._inflight)
+            finally:
+                self._inflight = {}
+            if self._pending:
+                self._schedule_flush()
+
+    async def _write(self, pending):
+        requests = _build_requests(pending)
+        for (
+            key,
+            op
+        ) in pending.items():
+            if key[0] not in requests:
+                self._commit_state(
+                    key,
+                    op
+                )
+        retry = False
+        for (
+            name,
+            entries
+        ) in requests.items():
+            failed = set()
+            try:
+                await self._db[name].bulk_write( # type: ignore
+                    [
+                        request
+                        for (
+                            _,
+                            request
+                        ) in entries
+                    ],
+                    ordered=False
+                )
+            except BulkWriteError as e:
+                LOGGER.error(f"DataBase bulk write error in {name}: {e}")
+                failed = {
+                    entries[error["index"]][0]
+                    for error
+                    in e.details.get(
+                        "writeErrors",
+                        []
+                    )
+                }
+            except Exception as e:
+                LOGGER.error(f"DataBase bulk write error in {name}: {e}")
+                retry = True
+                for (
+                    key,
+                    op
+                ) in pending.items():
+                    if key[0] == name:
+                        self._pending[key] = (
+                            _merge_op(
+                                op,
+                                self._pending[key]
+                            )
+                            if key in self._pending
+                            else op
+                        )
+                continue
+            for (
+                key,
+                op
+            ) in pending.items():
+                if key[0] != name:
+                    continue
+                if key in failed:
+                    self._drop_state(key)
+                else:
+                    self._commit_state(
+                        key,
+                        op
+                    )
+        # back off while the server keeps failing, the ops stay queued
+        self._retry_delay = (
+            min(
+                max(
+                    self._retry_delay * 2,
+                    DB_FLUSH_INTERVAL * 2
+                ),
+                DB_RETRY_MAX
+            )
+            if retry
+            else 0
+        )
+
+
+    def flush_sync(self):
+        if (
+            self._return
+            or not self._pending
+        ):
+            return
+        client = MongoClient(
+            config_dict["DATABASE_URL"],
+            server_api=ServerApi("1")
+        )
+        try:
+            for (
+                name,
+                entries
+            ) in _build_requests(self._pending).items():
+                client.zee[name].bulk_write(
+                    [
+                        request
+                        for (
+                            _,
+                            request
+                        ) in entries
+                    ],
+                    ordered=False
+                )
+            self._pending.clear()
+        except Exception as e:
+            LOGGER.error(f"DataBase bulk write error on exit: {e}")
+        finally:
+            client.close()
 
     async def connect(self):
         try:
             if config_dict["DATABASE_URL"]:
                 if self._conn is not None:
+                    await self.flush()
                     await self._conn.close()
                 self._conn = AsyncIOMotorClient(
                     config_dict["DATABASE_URL"],
@@ -46,6 +430,7 @@ class DbManager:
 
     async def disconnect(self):
         if self._conn is not None:
+            await self.flush()
             await self._conn.close()
         self._conn = None
         self._return = True
@@ -113,6 +498,17 @@ class DbManager:
                         await f.write(row["token_pickle"])
                     row["token_pickle"] = token_path
                 user_data[uid] = row
+                self._snapshots[(
+                    f"users.{BOT_ID}",
+                    uid
+                )] = {
+                    key: deepcopy(value)
+                    for (
+                        key,
+                        value
+                    ) in row.items()
+                    if key not in USER_FILE_KEYS
+                }
         # Rss Data
         if await self._db.rss[BOT_ID].find_one(): # type: ignore
             # return a dict ==> {_id, title: {link, last_feed, last_name, inf, exf, command, paused}
@@ -121,6 +517,10 @@ class DbManager:
                 user_id = row["_id"]
                 del row["_id"]
                 rss_dict[user_id] = row
+                self._snapshots[(
+                    f"rss.{BOT_ID}",
+                    user_id
+                )] = deepcopy(row)
 
     async def update_deploy_config(self):
         if self._return :
@@ -192,16 +592,23 @@ class DbManager:
             user_id,
             {}
         )
-        if data.get("thumb"):
-            del data["thumb"]
-        if data.get("rclone_config"):
-            del data["rclone_config"]
-        if data.get("token_pickle"):
-            del data["token_pickle"]
-        await self._db.users[BOT_ID].replace_one( # type: ignore
-            {"_id": user_id},
-            data,
-            upsert=True
+        self._queue_diff(
+            f"users.{BOT_ID}",
+            user_id,
+            {
+                key: value
+                for (
+                    key,
+                    value
+                ) in data.items()
+                if key not in USER_FILE_KEYS
+            },
+            unset=[
+                key
+                for key
+                in USER_FILE_KEYS
+                if key not in data
+            ]
         )
 
     async def update_user_doc(self, user_id, key, path=""):
@@ -215,56 +622,77 @@ class DbManager:
                 doc_bin = await doc.read()
         else:
             doc_bin = ""
-        await self._db.users[BOT_ID].update_one( # type: ignore
-            {"_id": user_id},
-            {"$set": {key: doc_bin}},
-            upsert=True
+        self._queue(
+            f"users.{BOT_ID}",
+            user_id,
+            {
+                "set": {key: doc_bin},
+                "unset": set()
+            }
         )
 
     async def rss_update_all(self):
         if self._return :
             return
         for user_id in list(rss_dict.keys()):
-            await self._db.rss[BOT_ID].replace_one( # type: ignore
-                {"_id": user_id},
+            self._queue_diff(
+                f"rss.{BOT_ID}",
+                user_id,
                 rss_dict[user_id],
-                upsert=True
+                True
             )
 
     async def rss_update(self, user_id):
         if self._return :
             return
-        await self._db.rss[BOT_ID].replace_one( # type: ignore
-            {"_id": user_id},
+        self._queue_diff(
+            f"rss.{BOT_ID}",
+            user_id,
             rss_dict[user_id],
-            upsert=True
+            True
         )
 
     async def rss_delete(self, user_id):
         if self._return :
             return
-        await self._db.rss[BOT_ID].delete_one({"_id": user_id}) # type: ignore
+        self._queue(
+            f"rss.{BOT_ID}",
+            user_id,
+            {
+                "delete": True,
+                "state": {}
+            }
+        )
 
     async def add_incomplete_task(self, cid, link, tag):
         if self._return :
             return
-        await self._db.tasks[BOT_ID].insert_one( # type: ignore
+        self._queue(
+            f"tasks.{BOT_ID}",
+            link,
             {
-                "_id": link,
-                "cid": cid,
-                "tag": tag
+                "replace": {
+                    "cid": cid,
+                    "tag": tag
+                }
             }
         )
+        await self.flush()
 
     async def rm_complete_task(self, link):
         if self._return :
             return
-        await self._db.tasks[BOT_ID].delete_one({"_id": link}) # type: ignore
+        self._queue(
+            f"tasks.{BOT_ID}",
+            link,
+            {"delete": True}
+        )
 
     async def get_incomplete_tasks(self):
         notifier_dict = {}
         if self._return :
             return notifier_dict
+        await self.flush()
         if await self._db.tasks[BOT_ID].find_one(): # type: ignore
             # return a dict ==> {_id, cid, tag}
             rows = self._db.tasks[BOT_ID].find({}) # type: ignore
@@ -282,6 +710,7 @@ class DbManager:
     async def trunc_table(self, name):
         if self._return :
             return
+        self._discard(f"{name}.{BOT_ID}")
         await self._db[name][BOT_ID].drop() # type: ignore
 
     async def add_download_url(self, url: str, tag: str):
@@ -294,15 +723,23 @@ class DbManager:
             "botname": bot_name,
             "suffix": suffix
         }
-        await self._db.download_links.update_one( # type: ignore
-            {"_id": url},
-            {"$set": download},
-            upsert=True
+        self._queue(
+            "download_links",
+            url,
+            {
+                "set": download,
+                "unset": set()
+            }
         )
 
     async def check_download(self, url: str):
         if self._return :
             return
+        if (
+            "download_links",
+            url
+        ) in self._pending:
+            await self.flush()
         exist = await self._db.download_links.find_one({"_id": url}) # type: ignore
         return exist
 
@@ -311,12 +748,17 @@ class DbManager:
             return
         if not botName:
             botName = bot_name
+        await self.flush()
         await self._db.download_links.delete_many({"botname": botName}) # type: ignore
 
     async def remove_download(self, url: str):
         if self._return :
             return
-        await self._db.download_links.delete_one({"_id": url}) # type: ignore
+        self._queue(
+            "download_links",
+            url,
+            {"delete": True}
+        )
 
     async def update_user_tdata(self, user_id, token, time):
         if self._return :
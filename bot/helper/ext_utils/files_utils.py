@@ -5,13 +5,33 @@ from aiofiles.os import (
     rmdir
 )
 from aioshutil import rmtree as aiormtree
+from errno import (
+    EBADF,
+    EINVAL,
+    ENOSYS,
+    EOPNOTSUPP,
+    EXDEV
+)
 from magic import Magic
+from mmap import (
+    mmap,
+    ACCESS_READ,
+    ALLOCATIONGRANULARITY
+)
 from os import (
     walk,
     path as ospath,
-    makedirs
+    makedirs,
+    open as os_open,
+    close as os_close,
+    write as os_write,
+    fstat,
+    copy_file_range,
+    sendfile,
+    O_RDONLY
 )
 from re import (
+    compile as re_compile,
     split as re_split,
     I,
     search as re_search,
@@ -31,10 +51,8 @@ from bot import (
     pkg_info,
     qbittorrent_client
 )
-from .bot_utils import (
-    sync_to_async,
-    cmd_exec
-)
+from .bot_utils import sync_to_async
+from .db_handler import database
 from .exceptions import NotSupportedExtractionArchive
 
 ARCH_EXT = [
@@ -82,6 +100,44 @@ FIRST_SPLIT_REGEX = r"(\.|_)part0*1\.rar$|(\.|_)7z\.0*1$|(\.|_)zip\.0*1$|^(?!.*(
 
 SPLIT_REGEX = r"\.r\d+$|\.7z\.\d+$|\.z\d+$|\.zip\.\d+$"
 
+VOLUME_PATTERNS = (
+    (
+        re_compile(
+            r"^(.+)(?:\.|_)part\d+\.rar$",
+            I
+        ),
+        "rar"
+    ),
+    (
+        re_compile(
+            r"^(.+)\.(?:rar|r\d+)$",
+            I
+        ),
+        "rar"
+    ),
+    (
+        re_compile(
+            r"^(.+)\.7z(?:\.\d+)?$",
+            I
+        ),
+        "7z"
+    ),
+    (
+        re_compile(
+            r"^(.+)\.(?:zip(?:\.\d+)?|z\d+)$",
+            I
+        ),
+        "zip"
+    ),
+)
+
+COPY_CHUNK_SIZE = 16 * 1024 * 1024
+
+copy_methods = {
+    "copy_file_range": True,
+    "sendfile": True
+}
+
 
 def is_first_archive_split(file):
     return bool(
@@ -105,6 +161,78 @@ def is_archive_split(file):
     )
 
 
+def _volume_key(file):
+    for (
+        pattern,
+        kind
+    ) in VOLUME_PATTERNS:
+        if match := pattern.match(file):
+            return (
+                match[1],
+                kind
+            )
+    return None
+
+
+def get_extract_plan(path):
+    zst_files = []
+    archives = []
+    for (
+        dirpath,
+        _,
+        files
+    ) in walk(
+        path,
+        topdown=False
+    ):
+        volumes = {}
+        for file_ in files:
+            if (key := _volume_key(file_)) is not None:
+                volumes.setdefault(
+                    key,
+                    []
+                ).append(ospath.join(
+                    dirpath,
+                    file_
+                ))
+        for file_ in files:
+            f_path = ospath.join(
+                dirpath,
+                file_
+            )
+            if file_.endswith(".zst"):
+                zst_files.append({
+                    "path": f_path,
+                    "dir": dirpath,
+                    "size": ospath.getsize(f_path),
+                    "done": 0,
+                })
+            elif (
+                is_first_archive_split(file_)
+                or is_archive(file_)
+                and not file_.endswith(".rar")
+            ):
+                parts = volumes.get(
+                    _volume_key(file_),
+                    [f_path]
+                )
+                archives.append({
+                    "path": f_path,
+                    "dir": dirpath,
+                    "volumes": parts,
+                    "size": sum(
+                        ospath.getsize(part)
+                        for part
+                        in parts
+                    ),
+                    "done": 0,
+                })
+    return (
+        zst_files,
+        archives
+    )
+
+
 async def clean_target(path):
     if await aiopath.exists(path):
         LOGGER.info(f"Cleaning Target: {path}")
@@ -151,6 +279,7 @@ def clean_all():
 def exit_clean_up(signal, frame):
     try:
         LOGGER.info("Please wait, while we clean up and stop the running downloads")
+        database.flush_sync()
         clean_all()
         srun([
             "pkill",
@@ -288,6 +417,151 @@ def get_mime_type(file_path):
     return mime_type
 
 
+def _copy_chunk(src_fd, dst_fd, offset, count):
+    for method in [
+        "copy_file_range",
+        "sendfile"
+    ]:
+        if not copy_methods[method]:
+            continue
+        try:
+            if method == "copy_file_range":
+                return copy_file_range(
+                    src_fd,
+                    dst_fd,
+                    count,
+                    offset
+                )
+            return sendfile(
+                dst_fd,
+                src_fd,
+                offset,
+                count
+            )
+        except OSError as e:
+            if e.errno not in [
+                EBADF,
+                EINVAL,
+                ENOSYS,
+                EOPNOTSUPP,
+                EXDEV
+            ]:
+                raise
+            LOGGER.warning(f"{method} not usable here, falling back: {e}")
+            copy_methods[method] = False
+    delta = offset % ALLOCATIONGRANULARITY
+    with mmap(
+        src_fd,
+        count + delta,
+        access=ACCESS_READ,
+        offset=offset - delta
+    ) as mm:
+        with memoryview(mm) as view:
+            return os_write(
+                dst_fd,
+                view[delta:delta + count]
+            )
+
+
+def _copy_fd(src_fd, dst_fd, offset, count, listener=None, progress=None):
+    copied = 0
+    while copied < count:
+        if (
+            listener is not None
+            and listener.is_cancelled
+        ):
+            break
+        written = _copy_chunk(
+            src_fd,
+            dst_fd,
+            offset + copied,
+            min(
+                COPY_CHUNK_SIZE,
+                count - copied
+            )
+        )
+        if written == 0:
+            break
+        copied += written
+        if progress is not None:
+            progress(written)
+    return copied
+
+
+def copy_range(src_fd, dst_path, offset, count, listener=None, progress=None):
+    with open(
+        dst_path,
+        "wb"
+    ) as dst:
+        return _copy_fd(
+            src_fd,
+            dst.fileno(),
+            offset,
+            count,
+            listener,
+            progress
+        )
+
+
+async def split_parts(path, out_path, split_size, listener, progress=None):
+    src_fd = await sync_to_async(
+        os_open,
+        path,
+        O_RDONLY
+    )
+    try:
+        size = fstat(src_fd).st_size
+        offset = 0
+        part = 1
+        while offset < size:
+            part_path = f"{out_path}{part:03d}"
+            copied = await sync_to_async(
+                copy_range,
+                src_fd,
+                part_path,
+                offset,
+                min(
+                    split_size,
+                    size - offset
+                ),
+                listener,
+                progress
+            )
+            if listener.is_cancelled:
+                if await aiopath.exists(part_path):
+                    await remove(part_path)
+                return
+            if copied == 0:
+                await remove(part_path)
+                return
+            yield part_path
+            offset += copied
+            part += 1
+    finally:
+        os_close(src_fd)
+
+
+def _join_parts(parts, dst_path):
+    with open(
+        dst_path,
+        "wb"
+    ) as dst:
+        for part in parts:
+            src_fd = os_open(
+                part,
+                O_RDONLY
+            )
+            try:
+                _copy_fd(
+                    src_fd,
+                    dst.fileno(),
+                    0,
+                    fstat(src_fd).st_size
+                )
+            finally:
+                os_close(src_fd)
+
+
 async def join_files(path):
     files = await listdir(path)
     results = []
@@ -305,17 +579,30 @@ async def join_files(path):
             exists = True
             final_name = file_.rsplit(".", 1)[0]
             fpath = f"{path}/{final_name}"
-            cmd = f'cat "{fpath}."* > "{fpath}"'
-            (
-                _,
-                stderr,
-                code
-            ) = await cmd_exec(
-                cmd,
-                True
+            parts = sorted(
+                (
+                    int(match.group(1)),
+                    f"{path}/{name}"
+                )
+                for name
+                in files
+                if (match := re_search(
+                    rf"^{escape(final_name)}\.(\d+)$",
+                    name
+                ))
             )
-            if code != 0:
-                LOGGER.error(f"Failed to join {final_name}, stderr: {stderr}")
+            try:
+                await sync_to_async(
+                    _join_parts,
+                    [
+                        part
+                        for _, part
+                        in parts
+                    ],
+                    fpath
+                )
+            except Exception as e:
+                LOGGER.error(f"Failed to join {final_name}, error: {e}")
                 if await aiopath.isfile(fpath):
                     await remove(fpath)
             else:
@@ -151,6 +151,7 @@ extract_zip = """
 /cmd link -e password (extract password protected)
 
 /cmd link -z password -e (extract and zip password protected)
+/cmd link -z -zl 5:4 (zip with compression level 5 using 4 threads) or /cmd link -z -zl 9 or /cmd link -z -zl :2
 Note: When both extract and zip are added with cmd, it will extract first and then zip, so always extract first.
 """
 
@@ -210,6 +211,7 @@ zip_arg = """
 /cmd link -z password (zip password protected)
 
 /cmd link -z password -e (extract and zip password protected)
+/cmd link -z -zl 5:4 (zip with compression level 5 using 4 threads) or /cmd link -z -zl 9 or /cmd link -z -zl :2
 Note: When both extract and zip are added with cmd, it will extract first and then zip, so always extract first.
 """
 
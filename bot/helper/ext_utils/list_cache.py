@@ -0,0 +1,108 @@
+from asyncio import shield
+from collections import OrderedDict
+from time import time
+
+from bot import (
+    LOGGER,
+    bot_loop
+)
+
+LIST_CACHE_SIZE = 256
+LIST_CACHE_TTL = 300
+LIST_PREFETCH = 3
+
+list_cache = OrderedDict()
+list_pending = {}
+cache_state = {"generation": 0}
+
+
+def _get_cached(key):
+    if (cached := list_cache.get(key)) is None:
+        return None
+    if time() - cached[0] >= LIST_CACHE_TTL:
+        del list_cache[key]
+        return None
+    list_cache.move_to_end(key)
+    return cached[1]
+
+
+async def _fetch_listing(key, fetch):
+    generation = cache_state["generation"]
+    try:
+        result = await fetch()
+        if generation != cache_state["generation"]:
+            return result
+        list_cache[key] = (
+            time(),
+            result
+        )
+        list_cache.move_to_end(key)
+        while len(list_cache) > LIST_CACHE_SIZE:
+            list_cache.popitem(last=False)
+        return result
+    finally:
+        list_pending.pop(
+            key,
+            None
+        )
+
+
+def _start_fetch(key, fetch):
+    if (task := list_pending.get(key)) is None:
+        task = bot_loop.create_task(_fetch_listing(
+            key,
+            fetch
+        ))
+        list_pending[key] = task
+    return task
+
+
+async def get_listing(key, fetch):
+    if (result := _get_cached(key)) is not None:
+        return result
+    return await shield(_start_fetch(
+        key,
+        fetch
+    ))
+
+
+async def _prefetch(jobs):
+    for (
+        key,
+        fetch
+    ) in jobs:
+        try:
+            await get_listing(
+                key,
+                fetch
+            )
+        except Exception as e:
+            LOGGER.debug(f"List prefetch failed for {key}: {e}")
+
+
+def prefetch_listings(jobs):
+    jobs = [
+        (
+            key,
+            fetch
+        )
+        for (
+            key,
+            fetch
+        ) in jobs
+        if key not in list_pending
+        and _get_cached(key) is None
+    ][:LIST_PREFETCH]
+    if jobs:
+        bot_loop.create_task(_prefetch(jobs))
+
+
+def invalidate_listings(*prefix):
+    cache_state["generation"] += 1
+    for key in [
+        key
+        for key
+        in list_cache
+        if key[:len(prefix)] == prefix
+    ]:
+        del list_cache[key]
@@ -2,14 +2,20 @@ from aioshutil import rmtree
 from aiofiles.os import (
     remove,
     path as aiopath,
-    makedirs
+    makedirs,
+    stat
 )
 from asyncio import (
-    create_subprocess_exec,
+    create_task,
     gather,
+    sleep,
     wait_for
 )
-from asyncio.subprocess import PIPE
+from asyncio.subprocess import (
+    DEVNULL,
+    PIPE
+)
+from collections import OrderedDict
 from os import (
     cpu_count,
     path as ospath
@@ -25,8 +31,7 @@ from time import time
 from bot import (
     LOGGER,
     DOWNLOAD_DIR,
-    pkg_info,
-    subprocess_lock
+    pkg_info
 )
 from .bot_utils import (
     cmd_exec,
@@ -34,9 +39,15 @@ from .bot_utils import (
 )
 from .files_utils import (
     ARCH_EXT, 
-    get_mime_type
+    get_mime_type,
+    split_parts
 )
 from .links_utils import is_telegram_link
+from .parsers import parse_probe
+from .process_manager import (
+    ENCODE_WEIGHT,
+    run_process
+)
 from ..telegram_helper.message_utils import get_tg_link_message
 
 
@@ -84,11 +95,16 @@ async def convert_video(listener, video_file, ext, retry=False):
         ]
     if listener.is_cancelled:
         return False
-    async with subprocess_lock:
-        listener.suproc = await create_subprocess_exec(
-            *cmd,
-            stderr=PIPE
-        )
+    listener.suproc = await run_process(
+        listener,
+        cmd,
+        cpu=ENCODE_WEIGHT if retry else 0,
+        io=0 if retry else 1,
+        mem=1 if retry else 0,
+        stderr=PIPE
+    )
+    if listener.suproc is None:
+        return False
     (
         _,
         stderr
@@ -135,11 +151,14 @@ async def convert_audio(listener, audio_file, ext):
     ]
     if listener.is_cancelled:
         return False
-    async with subprocess_lock:
-        listener.suproc = await create_subprocess_exec(
-            *cmd,
-            stderr=PIPE
-        )
+    listener.suproc = await run_process(
+        listener,
+        cmd,
+        cpu=ENCODE_WEIGHT,
+        stderr=PIPE
+    )
+    if listener.suproc is None:
+        return False
     (
         _,
         stderr
@@ -193,38 +212,76 @@ async def create_thumb(msg, _id=""):
     return output
 
 
+PROBE_CACHE_SIZE = 512
+
+probe_cache = OrderedDict()
+
+
+async def get_probe(path):
+    file_stat = await stat(path)
+    key = (
+        file_stat.st_size,
+        file_stat.st_mtime_ns
+    )
+    if (
+        (cached := probe_cache.get(path))
+        and cached[0] == key
+    ):
+        probe_cache.move_to_end(path)
+        return cached[1]
+    (
+        stdout,
+        stderr,
+        code
+    ) = await cmd_exec(
+        [
+            "ffprobe",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-print_format",
+            "json",
+            "-show_format",
+            "-show_streams",
+            path,
+        ]
+    )
+    result = (
+        parse_probe(stdout)
+        if stdout
+        and code == 0
+        else None,
+        stderr,
+        code
+    )
+    probe_cache[path] = (
+        key,
+        result
+    )
+    probe_cache.move_to_end(path)
+    while len(probe_cache) > PROBE_CACHE_SIZE:
+        probe_cache.popitem(last=False)
+    return result
+
+
 global_streams = {}
 async def is_multi_streams(path):
     try:
-        result = await cmd_exec(
-            [
-                "ffprobe",
-                "-hide_banner",
-                "-loglevel",
-                "error",
-                "-print_format",
-                "json",
-                "-show_streams",
-                path,
-            ]
-        )
+        result = await get_probe(path)
     except Exception as e:
         LOGGER.error(f"Get Video Streams: {e}. Mostly File not found! - File: {path}")
         return False
-    if (
-        result[0]
-        and result[2] == 0
-    ):
-        fields = eval(result[0]).get("streams")
+    if result[0]:
+        fields = result[0].streams
         if fields is None:
             return False
         global_streams["stream"] = fields
         videos = 0
         audios = 0
         for stream in fields:
-            if stream.get("codec_type") == "video":
+            if stream.codec_type == "video":
                 videos += 1
-            elif stream.get("codec_type") == "audio":
+            elif stream.codec_type == "audio":
                 audios += 1
         return videos > 1 or audios > 1
     return False
@@ -232,18 +289,7 @@ async def is_multi_streams(path):
 
 async def get_media_info(path):
     try:
-        result = await cmd_exec(
-            [
-                "ffprobe",
-                "-hide_banner",
-                "-loglevel",
-                "error",
-                "-print_format",
-                "json",
-                "-show_format",
-                path,
-            ]
-        )
+        result = await get_probe(path)
     except Exception as e:
         LOGGER.error(f"Get Media Info: {e}. Mostly File not found! - File: {path}")
         return (
@@ -251,11 +297,8 @@ async def get_media_info(path):
             None,
             None
         )
-    if (
-        result[0]
-        and result[2] == 0
-    ):
-        fields = eval(result[0]).get("format")
+    if result[0]:
+        fields = result[0].format
         if fields is None:
             LOGGER.error(f"get_media_info: {result}")
             return (
@@ -263,14 +306,8 @@ async def get_media_info(path):
                 None,
                 None
             )
-        duration = round(float(fields.get(
-            "duration",
-            0
-        )))
-        tags = fields.get(
-            "tags",
-            {}
-        )
+        duration = round(fields.duration)
+        tags = fields.tags
         artist = (
             tags.get("artist") or
             tags.get("ARTIST") or
@@ -323,18 +360,7 @@ async def get_document_type(path):
             True
         )
     try:
-        result = await cmd_exec(
-            [
-                "ffprobe",
-                "-hide_banner",
-                "-loglevel",
-                "error",
-                "-print_format",
-                "json",
-                "-show_streams",
-                path,
-            ]
-        )
+        result = await get_probe(path)
         if result[1] and mime_type.startswith("video"):
             is_video = True
     except Exception as e:
@@ -361,11 +387,8 @@ async def get_document_type(path):
             is_audio,
             is_image
         )
-    if (
-        result[0]
-        and result[2] == 0
-    ):
-        fields = eval(result[0]).get("streams")
+    if result[0]:
+        fields = result[0].streams
         if fields is None:
             LOGGER.error(f"get_document_type: {result}")
             return (
@@ -375,9 +398,9 @@ async def get_document_type(path):
             )
         is_video = False
         for stream in fields:
-            if stream.get("codec_type") == "video":
+            if stream.codec_type == "video":
                 is_video = True
-            elif stream.get("codec_type") == "audio":
+            elif stream.codec_type == "audio":
                 is_audio = True
     return (
         is_video,
@@ -618,6 +641,270 @@ async def get_multiple_frames_thumbnail(video_file, layout, keep_screenshots):
     return output
 
 
+async def get_split_points(listener, path, split_size):
+    try:
+        result = await get_probe(path)
+    except Exception as e:
+        LOGGER.error(f"Get Split Points: {e}. Mostly File not found! - File: {path}")
+        return None
+    if not (
+        result[0]
+        and result[0].streams
+    ):
+        return None
+    video_index = next(
+        (
+            f"{stream.index}".encode()
+            for stream
+            in result[0].streams
+            if stream.codec_type == "video"
+        ),
+        None
+    )
+    if video_index is None:
+        return None
+    cmd = [
+        "ffprobe",
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-show_entries",
+        "packet=stream_index,pts_time,size,flags",
+        "-of",
+        "csv=p=0",
+        path,
+    ]
+    if listener.is_cancelled:
+        return None
+    listener.suproc = await run_process(
+        listener,
+        cmd,
+        io=1,
+        stdout=PIPE,
+        stderr=DEVNULL
+    )
+    if listener.suproc is None:
+        return None
+    points = []
+    total = 0
+    part_start = 0
+    last_key = None
+    async for line in listener.suproc.stdout: # type: ignore
+        fields = line.rstrip().split(b",")
+        if len(fields) < 4:
+            continue
+        try:
+            packet_size = int(fields[2])
+        except ValueError:
+            continue
+        if (
+            fields[0] == video_index
+            and b"K" in fields[3]
+            and fields[1] != b"N/A"
+        ):
+            last_key = (
+                float(fields[1]),
+                total
+            )
+        total += packet_size
+        if total - part_start > split_size:
+            if (
+                last_key is None
+                or last_key[1] <= part_start
+            ):
+                listener.suproc.kill()
+                await listener.suproc.wait()
+                return None
+            points.append(last_key[0])
+            part_start = last_key[1]
+    await listener.suproc.wait()
+    if (
+        listener.is_cancelled
+        or listener.suproc.returncode != 0
+        or not points
+    ):
+        return None
+    return points
+
+
+async def _queue_part(part, part_queue, progress):
+    if progress is not None:
+        progress(await aiopath.getsize(part))
+    if part_queue is not None:
+        await part_queue.put(part)
+
+
+async def _segment_ready(parts, index, done):
+    # the segment muxer closes a part before it opens the next one
+    if (
+        index + 1 < len(parts)
+        and await aiopath.exists(parts[index + 1])
+    ):
+        return True
+    return (
+        done
+        and await aiopath.exists(parts[index])
+    )
+
+
+async def segment_split(
+    listener,
+    path,
+    dirpath,
+    base_name,
+    extension,
+    split_size,
+    multi_streams,
+    points=None,
+    part_queue=None,
+    progress=None,
+):
+    if points is None:
+        points = await get_split_points(
+            listener,
+            path,
+            split_size
+        )
+    if points is None:
+        return None
+    parts = [
+        f"{dirpath}/{base_name}.part{i:03}{extension}"
+        for i in range(
+            1,
+            len(points) + 2
+        )
+    ]
+    pattern = f"{dirpath}/{base_name.replace('%', '%%')}.part%03d{extension}"
+    cmd = [
+        pkg_info["pkgs"][2],
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-i",
+        path,
+        "-map",
+        "0",
+        "-map_chapters",
+        "-1",
+        "-c",
+        "copy",
+        "-strict",
+        "-2",
+        "-f",
+        "segment",
+        "-segment_times",
+        ",".join(f"{point}" for point in points),
+        "-segment_start_number",
+        "1",
+        "-reset_timestamps",
+        "1",
+        pattern,
+    ]
+    if not multi_streams:
+        del cmd[6]
+        del cmd[6]
+    if listener.is_cancelled:
+        return False
+    proc = listener.suproc = await run_process(
+        listener,
+        cmd,
+        io=1,
+        stderr=PIPE
+    )
+    if proc is None:
+        return False
+    waiter = create_task(proc.communicate())
+    queued = 0
+    oversized = False
+    # hand parts to the uploader as the muxer finishes them
+    while queued < len(parts):
+        done = waiter.done()
+        if (
+            done
+            and proc.returncode != 0
+        ):
+            break
+        if await _segment_ready(
+            parts,
+            queued,
+            done
+        ):
+            if await aiopath.getsize(parts[queued]) > listener.max_split_size:
+                oversized = True
+                if proc.returncode is None:
+                    proc.kill()
+                break
+            await _queue_part(
+                parts[queued],
+                part_queue,
+                progress
+            )
+            queued += 1
+            continue
+        if (
+            done
+            or listener.is_cancelled
+        ):
+            break
+        await sleep(1)
+    (
+        _,
+        stderr
+    ) = await waiter
+    if listener.is_cancelled:
+        return False
+    code = proc.returncode
+    if (
+        code == -9
+        and not oversized
+    ):
+        listener.is_cancelled = True
+        return False
+    if (
+        code == 0
+        and queued == len(parts)
+    ):
+        return True
+    for part in parts[queued:]:
+        if await aiopath.exists(part):
+            await remove(part)
+    if queued:
+        # parts already went out, carry on part by part from the first missing one
+        LOGGER.warning(f"Segment split stopped after {queued} parts, splitting the rest part by part. Path: {path}")
+        return (
+            points[queued - 1],
+            queued + 1
+        )
+    if code != 0 and not oversized:
+        try:
+            stderr = stderr.decode().strip()
+        except:
+            stderr = "Unable to decode the error!"
+        if multi_streams:
+            LOGGER.warning(
+                f"{stderr}. Retrying segment split without map, -map 0 not working in all situations. Path: {path}"
+            )
+            return await segment_split(
+                listener,
+                path,
+                dirpath,
+                base_name,
+                extension,
+                split_size,
+                False,
+                points,
+                part_queue,
+                progress,
+            )
+        LOGGER.warning(f"{stderr}. Segment split failed, splitting part by part. Path: {path}")
+    else:
+        LOGGER.warning(f"Segment split produced an oversized part, splitting part by part. Path: {path}")
+    return (
+        0,
+        1
+    )
+
+
 async def split_file(
     path,
     size,
@@ -629,6 +916,8 @@ async def split_file(
     i=1,
     inLoop=False,
     multi_streams=True,
+    part_queue=None,
+    progress=None,
 ):
     if (
         listener.seed and not
@@ -657,6 +946,29 @@ async def split_file(
             extension
         ) = ospath.splitext(file_)
         split_size -= 5000000
+        if not inLoop:
+            result = await segment_split(
+                listener,
+                path,
+                dirpath,
+                base_name,
+                extension,
+                split_size,
+                multi_streams,
+                part_queue=part_queue,
+                progress=progress,
+            )
+            if not isinstance(
+                result,
+                tuple
+            ):
+                return result
+            if listener.is_cancelled:
+                return False
+            (
+                start_time,
+                i
+            ) = result
         while i <= parts or start_time < duration - 4:
             out_path = f"{dirpath}/{base_name}.part{i:03}{extension}"
             cmd = [
@@ -687,11 +999,14 @@ async def split_file(
                 del cmd[10]
             if listener.is_cancelled:
                 return False
-            async with subprocess_lock:
-                listener.suproc = await create_subprocess_exec(
-                    *cmd,
-                    stderr=PIPE
-                )
+            listener.suproc = await run_process(
+                listener,
+                cmd,
+                io=1,
+                stderr=PIPE
+            )
+            if listener.suproc is None:
+                return False
             (
                 _,
                 stderr
@@ -726,6 +1041,8 @@ async def split_file(
                         i,
                         True,
                         False,
+                        part_queue,
+                        progress,
                     )
                 else:
                     LOGGER.warning(
@@ -748,8 +1065,21 @@ async def split_file(
                     i,
                     True,
                     multi_streams,
+                    part_queue,
+                    progress,
                 )
             lpd = (await get_media_info(out_path))[0]
+            if (
+                0 < lpd <= 3
+                and duration != lpd
+            ):
+                await remove(out_path)
+                break
+            await _queue_part(
+                out_path,
+                part_queue,
+                progress
+            )
             if lpd == 0:
                 LOGGER.error(
                     f"Something went wrong while splitting, mostly file is corrupted. Path: {path}"
@@ -760,41 +1090,24 @@ async def split_file(
                     f"This file has been splitted with default stream and audio, so you will only see one part with less size from orginal one because it doesn't have all streams and audios. This happens mostly with MKV videos. Path: {path}"
                 )
                 break
-            elif lpd <= 3:
-                await remove(out_path)
-                break
             start_time += lpd - 3
             i += 1
     else:
         out_path = f"{dirpath}/{file_}."
-        async with subprocess_lock:
-            if listener.is_cancelled:
-                return False
-            listener.suproc = await create_subprocess_exec(
-                "split",
-                "--numeric-suffixes=1",
-                "--suffix-length=3",
-                f"--bytes={split_size}",
+        try:
+            async for part in split_parts(
                 path,
                 out_path,
-                stderr=PIPE,
-            )
-        (
-            _,
-            stderr
-        ) = await listener.suproc.communicate()
+                split_size,
+                listener,
+                progress
+            ):
+                if part_queue is not None:
+                    await part_queue.put(part)
+        except OSError as e:
+            LOGGER.error(f"{e}. Split Document: {path}")
         if listener.is_cancelled:
             return False
-        code = listener.suproc.returncode
-        if code == -9:
-            listener.is_cancelled = True
-            return False
-        elif code != 0:
-            try:
-                stderr = stderr.decode().strip()
-            except:
-                stderr = "Unable to decode the error!"
-            LOGGER.error(f"{stderr}. Split Document: {path}")
     return True
 
 
@@ -869,11 +1182,15 @@ async def create_sample_video(listener, video_file, sample_duration, part_durati
 
     if listener.is_cancelled:
         return False
-    async with subprocess_lock:
-        listener.suproc = await create_subprocess_exec(
-            *cmd,
-            stderr=PIPE
-        )
+    listener.suproc = await run_process(
+        listener,
+        cmd,
+        cpu=ENCODE_WEIGHT,
+        mem=1,
+        stderr=PIPE
+    )
+    if listener.suproc is None:
+        return False
     (
         _,
         stderr
@@ -967,8 +1284,8 @@ async def edit_video_metadata(listener, dir):
 
     if global_streams:
         for stream in global_streams["stream"]:
-            stream_index = stream["index"]
-            stream_type = stream["codec_type"]
+            stream_index = stream.index
+            stream_type = stream.codec_type
 
             if stream_type == "video":
                 if not first_video:
@@ -992,10 +1309,7 @@ async def edit_video_metadata(listener, dir):
                 audio_index += 1
 
             elif stream_type == "subtitle":
-                codec_name = stream.get(
-                    "codec_name",
-                    "unknown"
-                )
+                codec_name = stream.codec_name or "unknown"
                 if codec_name not in [
                     "webvtt",
                     "unknown"
@@ -1023,16 +1337,17 @@ async def edit_video_metadata(listener, dir):
     LOGGER.info(f"Modifying metadata for file: {file_name}")
 
     try:
-        async with subprocess_lock:
-            if listener.is_cancelled:
-                if work_path.exists():
-                    work_path.unlink()
-                return
-            listener.suproc = await create_subprocess_exec(
-                *cmd,
-                stderr=PIPE,
-                stdout=PIPE
-            )
+        listener.suproc = await run_process(
+            listener,
+            cmd,
+            io=1,
+            stderr=PIPE,
+            stdout=PIPE
+        )
+        if listener.suproc is None:
+            if work_path.exists():
+                work_path.unlink()
+            return
         (
             _,
             stderr
@@ -1120,16 +1435,17 @@ async def add_attachment(listener, dir):
     ]
 
     try:
-        async with subprocess_lock:
-            if listener.is_cancelled:
-                if work_path.exists():
-                    work_path.unlink()
-                return
-            listener.suproc = await create_subprocess_exec(
-                *cmd,
-                stderr=PIPE,
-                stdout=PIPE
-            )
+        listener.suproc = await run_process(
+            listener,
+            cmd,
+            io=1,
+            stderr=PIPE,
+            stdout=PIPE
+        )
+        if listener.suproc is None:
+            if work_path.exists():
+                work_path.unlink()
+            return
         (
             _,
             _
@@ -0,0 +1,104 @@
+from json import loads
+
+
+class ProbeStream:
+    __slots__ = (
+        "index",
+        "codec_type",
+        "codec_name",
+        "tags"
+    )
+
+    def __init__(self, data):
+        self.index = data.get(
+            "index",
+            0
+        )
+        self.codec_type = data.get("codec_type")
+        self.codec_name = data.get("codec_name")
+        self.tags = data.get(
+            "tags",
+            {}
+        )
+
+
+class ProbeFormat:
+    __slots__ = (
+        "duration",
+        "size",
+        "tags"
+    )
+
+    def __init__(self, data):
+        try:
+            self.duration = float(data.get(
+                "duration",
+                0
+            ))
+        except (
+            TypeError,
+            ValueError
+        ):
+            self.duration = 0.0
+        try:
+            self.size = int(data.get(
+                "size",
+                0
+            ))
+        except (
+            TypeError,
+            ValueError
+        ):
+            self.size = 0
+        self.tags = data.get(
+            "tags",
+            {}
+        )
+
+
+class ProbeData:
+    __slots__ = (
+        "format",
+        "streams"
+    )
+
+    def __init__(self, data):
+        self.format = (
+            ProbeFormat(fmt)
+            if (fmt := data.get("format")) is not None
+            else None
+        )
+        self.streams = (
+            [
+                ProbeStream(stream)
+                for stream
+                in streams
+            ]
+            if (streams := data.get("streams")) is not None
+            else None
+        )
+
+
+def parse_probe(raw):
+    try:
+        data = loads(raw)
+    except (
+        TypeError,
+        ValueError
+    ):
+        return None
+    if not isinstance(data, dict):
+        return None
+    return ProbeData(data)
+
+
+def get_error_reason(content):
+    try:
+        return loads(content)["error"]["errors"][0]["reason"]
+    except (
+        TypeError,
+        ValueError,
+        KeyError,
+        IndexError
+    ):
+        return None
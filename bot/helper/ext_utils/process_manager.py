@@ -0,0 +1,275 @@
+from asyncio import (
+    CancelledError,
+    create_subprocess_exec
+)
+from collections import deque
+from itertools import count
+from os import (
+    cpu_count,
+    path as ospath
+)
+from shutil import which
+from time import time
+
+from bot import (
+    LOGGER,
+    bot_loop,
+    subprocess_lock
+)
+
+CPU_SLOTS = cpu_count() or 1
+IO_SLOTS = max(
+    CPU_SLOTS // 2,
+    2
+)
+MEM_SLOTS = max(
+    CPU_SLOTS // 4,
+    1
+)
+ENCODE_WEIGHT = max(
+    CPU_SLOTS // 2,
+    1
+)
+CPU_NICE = 10
+IO_NICE = 7
+NICE_BIN = which("nice")
+IONICE_BIN = which("ionice")
+
+slot_pools = {
+    "cpu": {
+        "size": CPU_SLOTS,
+        "used": 0,
+        "waiting": deque()
+    },
+    "io": {
+        "size": IO_SLOTS,
+        "used": 0,
+        "waiting": deque()
+    },
+    "mem": {
+        "size": MEM_SLOTS,
+        "used": 0,
+        "waiting": deque()
+    },
+}
+process_jobs = {}
+job_ids = count()
+
+
+def _wake(pool):
+    while pool["waiting"]:
+        (
+            weight,
+            future
+        ) = pool["waiting"][0]
+        if future.done():
+            pool["waiting"].popleft()
+            continue
+        if pool["used"] + weight > pool["size"]:
+            break
+        pool["waiting"].popleft()
+        pool["used"] += weight
+        future.set_result(True)
+
+
+def _release(name, weight):
+    pool = slot_pools[name]
+    pool["used"] -= weight
+    _wake(pool)
+
+
+async def _acquire(job, name, weight):
+    pool = slot_pools[name]
+    if (
+        not pool["waiting"]
+        and pool["used"] + weight <= pool["size"]
+    ):
+        pool["used"] += weight
+        return True
+    LOGGER.info(f"{job['name']} is waiting for {weight} {name} slot(s)")
+    job["future"] = future = bot_loop.create_future()
+    pool["waiting"].append((
+        weight,
+        future
+    ))
+    try:
+        return await future
+    except CancelledError:
+        if (
+            future.done()
+            and not future.cancelled()
+            and future.result()
+        ):
+            _release(
+                name,
+                weight
+            )
+        else:
+            _wake(pool)
+        raise
+    finally:
+        job["future"] = None
+
+
+def _priority_prefix(job, nice, ionice):
+    prefix = []
+    if nice is None:
+        nice = CPU_NICE if "cpu" in job["slots"] else 0
+    if ionice is None:
+        ionice = IO_NICE if "io" in job["slots"] else None
+    if (
+        nice
+        and NICE_BIN
+    ):
+        prefix.extend((
+            NICE_BIN,
+            "-n",
+            f"{nice}"
+        ))
+    if (
+        ionice is not None
+        and IONICE_BIN
+    ):
+        prefix.extend((
+            IONICE_BIN,
+            "-c",
+            "2",
+            "-n",
+            f"{ionice}"
+        ))
+    return prefix
+
+
+async def _release_on_exit(proc, job):
+    try:
+        await proc.wait()
+    finally:
+        _finish_job(job)
+
+
+def _finish_job(job):
+    process_jobs.pop(
+        job["id"],
+        None
+    )
+    for (
+        name,
+        weight
+    ) in job["held"]:
+        _release(
+            name,
+            weight
+        )
+    job["held"].clear()
+
+
+async def run_process(listener, cmd, cpu=0, io=0, mem=0, nice=None, ionice=None, **kwargs):
+    job = {
+        "id": next(job_ids),
+        "name": ospath.basename(cmd[0]),
+        "listener": listener,
+        "slots": {
+            name: min(
+                weight,
+                slot_pools[name]["size"]
+            )
+            for (
+                name,
+                weight
+            ) in (
+                ("cpu", cpu),
+                ("io", io),
+                ("mem", mem),
+            )
+            if weight
+        },
+        "held": [],
+        "future": None,
+        "waiting": None,
+        "since": time(),
+    }
+    process_jobs[job["id"]] = job
+    proc = None
+    try:
+        for (
+            name,
+            weight
+        ) in job["slots"].items():
+            job["waiting"] = name
+            if (
+                listener is not None
+                and listener.is_cancelled
+            ):
+                return None
+            if not await _acquire(
+                job,
+                name,
+                weight
+            ):
+                return None
+            job["held"].append((
+                name,
+                weight
+            ))
+        job["waiting"] = None
+        async with subprocess_lock:
+            if (
+                listener is not None
+                and listener.is_cancelled
+            ):
+                return None
+            proc = await create_subprocess_exec(
+                *_priority_prefix(
+                    job,
+                    nice,
+                    ionice
+                ),
+                *cmd,
+                **kwargs
+            )
+            if listener is not None:
+                listener.suproc = proc
+        job["since"] = time()
+        bot_loop.create_task(_release_on_exit(
+            proc,
+            job
+        ))
+        return proc
+    finally:
+        if proc is None:
+            _finish_job(job)
+
+
+async def kill_processes(listener):
+    async with subprocess_lock:
+        for job in list(process_jobs.values()):
+            if (
+                job["listener"] is listener
+                and (future := job["future"]) is not None
+                and not future.done()
+            ):
+                future.set_result(False)
+        for pool in slot_pools.values():
+            _wake(pool)
+        if (
+            listener.suproc is not None
+            and listener.suproc.returncode is None
+        ):
+            listener.suproc.kill()
+        for proc in listener.subprocs:
+            if proc.returncode is None:
+                proc.kill()
+
+
+def get_process_stats():
+    waiting = sum(
+        1
+        for job
+        in process_jobs.values()
+        if job["waiting"] is not None
+    )
+    return (
+        len(process_jobs) - waiting,
+        waiting
+    )
+
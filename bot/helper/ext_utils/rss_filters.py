@@ -0,0 +1,122 @@
+from re import (
+    compile as re_compile,
+    escape as re_escape
+)
+
+rss_filters = {}
+
+
+def _build_trie(words):
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(
+                char,
+                {}
+            )
+        node[""] = None
+    return trie
+
+
+def _trie_pattern(node):
+    # a word ending here already matches, longer words below it add nothing
+    if "" in node:
+        return ""
+    leaves = []
+    branches = []
+    for char in sorted(node):
+        if (child := _trie_pattern(node[char])):
+            branches.append(f"{re_escape(char)}{child}")
+        else:
+            leaves.append(re_escape(char))
+    if leaves:
+        branches.append(
+            leaves[0]
+            if len(leaves) == 1
+            else f"[{''.join(leaves)}]"
+        )
+    if len(branches) == 1:
+        return branches[0]
+    return f"(?:{'|'.join(branches)})"
+
+
+def _compile_group(words, sensitive):
+    if not words:
+        return None
+    # "sensitive" feeds lower-case both sides, as the old substring checks did
+    if sensitive:
+        words = [
+            x.lower()
+            for x in words
+        ]
+    return re_compile(_trie_pattern(_build_trie(words)))
+
+
+def get_rss_filter(user, title, data):
+    sensitive = data.get(
+        "sensitive",
+        False
+    )
+    source = (
+        tuple(tuple(x) for x in data["inf"]),
+        tuple(tuple(x) for x in data["exf"]),
+        sensitive
+    )
+    key = (
+        user,
+        title
+    )
+    if (
+        (cached := rss_filters.get(key))
+        and cached[0] == source
+    ):
+        return cached[1]
+    exclude = _compile_group(
+        [
+            x
+            for flist in data["exf"]
+            for x in flist
+        ],
+        sensitive
+    )
+    rss_filter = {
+        "include": [
+            _compile_group(
+                flist,
+                sensitive
+            )
+            for flist in data["inf"]
+        ],
+        "exclude": exclude
+        if any(data["exf"])
+        else None,
+        "sensitive": sensitive,
+    }
+    rss_filters[key] = (
+        source,
+        rss_filter
+    )
+    return rss_filter
+
+
+def filter_titles(rss_filter, titles):
+    if rss_filter["sensitive"]:
+        titles = [
+            x.lower()
+            for x in titles
+        ]
+    include = rss_filter["include"]
+    exclude = rss_filter["exclude"]
+    return [
+        all(
+            pattern is not None
+            and pattern.search(x)
+            for pattern in include
+        )
+        and not (
+            exclude is not None
+            and exclude.search(x)
+        )
+        for x in titles
+    ]
@@ -17,6 +17,7 @@ from bot import (
     status_dict,
 )
 from .bot_utils import sync_to_async
+from .process_manager import get_process_stats
 from ..telegram_helper.button_build import ButtonMaker
 from ..telegram_helper.bot_commands import BotCommands
 
@@ -69,46 +70,49 @@ STATUSES = {
 async def get_task_by_gid(gid: str):
     gid = gid[:10]
     async with task_dict_lock:
-        for tk in task_dict.values():
+        if tk := task_dict.get_by_gid(gid):
             if hasattr(tk, "seeding"):
                 await sync_to_async(tk.update)
+            task_dict.reindex_gid(tk.listener.mid)
             if tk.gid().startswith(gid):
                 return tk
+        # status polls keep moved gids indexed, a miss only rereads cached gids
+        for (
+            mid,
+            tk
+        ) in list(task_dict.items()):
+            task_dict.reindex_gid(mid)
+            try:
+                if tk.gid().startswith(gid):
+                    return tk
+            except:
+                continue
         return None
 
 
+def get_task_status(tk):
+    st = tk.status()
+    # status() polls the engine, which is when aria2 follow-up gids appear
+    task_dict.reindex_gid(tk.listener.mid)
+    return st
+
+
 def get_specific_tasks(status, user_id):
+    tasks = (
+        task_dict.by_user(user_id)
+        if user_id
+        else list(task_dict.values())
+    )
     if status == "All":
-        if user_id:
-            return [
-                tk
-                for tk
-                in task_dict.values()
-                if tk.listener.user_id == user_id
-            ]
-        else:
-            return list(task_dict.values())
-    elif user_id:
-        return [
-            tk
-            for tk in task_dict.values()
-            if tk.listener.user_id == user_id
-            and (
-                (st := tk.status())
-                and st == status
-                or status == MirrorStatus.STATUS_DOWNLOADING
-                and st not in STATUSES.values()
-            )
-        ]
-    else:
-        return [
-            tk
-            for tk in task_dict.values()
-            if (st := tk.status())
-            and st == status
-            or status == MirrorStatus.STATUS_DOWNLOADING
-            and st not in STATUSES.values()
-        ]
+        return tasks
+    return [
+        tk
+        for tk in tasks
+        if (st := get_task_status(tk))
+        and st == status
+        or status == MirrorStatus.STATUS_DOWNLOADING
+        and st not in STATUSES.values()
+    ]
 
 
 async def get_all_tasks(req_status: str, user_id):
@@ -194,19 +198,306 @@ def get_progress_bar_string(pct):
     return f"{p_str}"
 
 
+SNAPSHOT_TTL = 1
+ELAPSED_MARK = "\x00"
+
+status_snapshot = {
+    "time": 0,
+    "tasks": [],
+    "footer": ""
+}
+task_blocks = {}
+
+
+def _get_sys_footer():
+    (
+        running,
+        waiting
+    ) = get_process_stats()
+    return (
+        f"──────────────────\n"
+        f"<b>CPU</b>: {cpu_percent()}% | "
+        f"<b>FREE</b>: {get_readable_file_size(disk_usage(DOWNLOAD_DIR).free)}\n"
+        f"<b>RAM</b>: {virtual_memory().percent}% | "
+        f"<b>UPTM</b>: {get_readable_time(time() - bot_start_time)}\n"
+        f"<b>PROC</b>: {running} | "
+        f"<b>WAIT</b>: {waiting}"
+    )
+
+
+def _build_snapshot():
+    tasks = []
+    for tk in list(task_dict.values()):
+        try:
+            gid = tk.gid()
+        except:
+            continue
+        tasks.append({
+            "task": tk,
+            "gid": gid,
+            "user_id": tk.listener.user_id,
+            "status": None,
+            "blocks": {}
+        })
+    alive = {
+        entry["gid"]
+        for entry
+        in tasks
+    }
+    for key in list(task_blocks.keys()):
+        if key[0] not in alive:
+            task_blocks.pop(
+                key,
+                None
+            )
+    return (
+        tasks,
+        _get_sys_footer()
+    )
+
+
+async def get_status_snapshot(force=False):
+    if (
+        force
+        or time() - status_snapshot["time"] >= SNAPSHOT_TTL
+    ):
+        (
+            tasks,
+            footer
+        ) = await sync_to_async(_build_snapshot)
+        status_snapshot.update({
+            "time": time(),
+            "tasks": tasks,
+            "footer": footer
+        })
+    return status_snapshot
+
+
+def _entry_status(entry):
+    if entry["status"] is None:
+        entry["status"] = get_task_status(entry["task"])
+    return entry["status"]
+
+
+def filter_snapshot(snapshot, status, user_id):
+    entries = (
+        [
+            entry
+            for entry
+            in snapshot["tasks"]
+            if entry["user_id"] == user_id
+        ]
+        if user_id
+        else snapshot["tasks"]
+    )
+    if status == "All":
+        return list(entries)
+    return [
+        entry
+        for entry in entries
+        if (st := _entry_status(entry))
+        and st == status
+        or status == MirrorStatus.STATUS_DOWNLOADING
+        and st not in STATUSES.values()
+    ]
+
+
+def _get_task_fields(task, tstatus, progress=None):
+    elapse = time() - task.listener.time
+    elapsed = (
+        "-"
+        if elapse < 1
+        else get_readable_time(elapse)
+    )
+    gid = task.gid()
+    task_name = (
+        f"<b>{escape(f'{task.name()}')}</b>"
+        if config_dict["DELETE_LINKS"] and int(config_dict["HIDE_TASK"]) > 0
+        and elapse <= config_dict["HIDE_TASK"]
+        else f"<b>Task is being Processed!</b>"
+        if config_dict["DELETE_LINKS"] and int(config_dict["HIDE_TASK"]) > 0
+        else f"<b>{escape(f'{task.name()}')}</b>"
+    )
+    fields = {
+        "name": task_name,
+        "status": tstatus,
+        "elapsed": elapsed,
+        "user_tag": f"<code>{task.listener.message.from_user.mention(style='html')}</code>",
+        "user_id": task.listener.user_id,
+        "mode": task.listener.mode,
+        "engine": task.engine,
+        "cancel": (
+            f"<code>/{BotCommands.CancelTaskCommand}_{gid[:10]}</code>"
+            if "-" in gid
+            else f"<b>/{BotCommands.CancelTaskCommand}_{gid[:10]}</b>"
+        )
+    }
+    if tstatus not in [
+        MirrorStatus.STATUS_SEEDING,
+        MirrorStatus.STATUS_QUEUEDL,
+        MirrorStatus.STATUS_QUEUEUP,
+        MirrorStatus.STATUS_METADATA
+    ]:
+        fields.update({
+            "progress": (
+                task.progress()
+                if progress is None
+                else progress
+            ),
+            "processed": task.processed_bytes(),
+            "size": task.size(),
+            "speed": task.speed(),
+            "eta": task.eta(),
+            "playlist": None,
+            "peers": None,
+            "disk": None
+        })
+        if hasattr(
+            task,
+            "playList"
+        ):
+            try:
+                fields["playlist"] = task.playList()
+            except:
+                pass
+        if hasattr(
+            task,
+            "seeders_num"
+        ):
+            try:
+                fields["peers"] = f"{task.seeders_num()}/{task.leechers_num()}"
+            except:
+                pass
+        if hasattr(
+            task,
+            "disk_space"
+        ):
+            fields["disk"] = task.disk_space()
+    elif tstatus == MirrorStatus.STATUS_SEEDING:
+        fields.update({
+            "size": task.size(),
+            "seed_speed": task.seed_speed(),
+            "uploaded": task.uploaded_bytes(),
+            "ratio": task.ratio(),
+            "seeding_time": task.seeding_time()
+        })
+    else:
+        fields["size"] = task.size()
+    return fields
+
+
+def _render_task_block(fields):
+    tstatus = fields["status"]
+    msg = f"{fields['name']}</pre>"
+    if tstatus not in [
+        MirrorStatus.STATUS_SEEDING,
+        MirrorStatus.STATUS_QUEUEDL,
+        MirrorStatus.STATUS_QUEUEUP,
+        MirrorStatus.STATUS_METADATA
+    ]:
+        progress = fields["progress"]
+        msg += (
+            f"\n{get_progress_bar_string(progress)} » <b><i>{progress}</i></b>"
+            f"\n<code>Status :</code> <b>{tstatus}</b>"
+            f"\n<code>Done   :</code> {fields['processed']} of {fields['size']}"
+            f"\n<code>Speed  :</code> {fields['speed']}"
+            f"\n<code>ETA    :</code> {fields['eta']}"
+            f"\n<code>Past   :</code> {fields['elapsed']}"
+            f"\n<code>User   :</code> <b>{fields['user_tag']}</b>"
+            f"\n<code>UserID :</code> {fields['user_id']}"
+            f"\n<code>Detail :</code> {fields['mode']}"
+        )
+        if playlist := fields["playlist"]:
+            msg += f"\n<code>YtList :</code> {playlist}"
+        if peers := fields["peers"]:
+            msg += f"\n<code>S/L    :</code> {peers}"
+        if disk := fields["disk"]:
+            msg += f"\n<code>Disk   :</code> {disk}"
+    elif tstatus == MirrorStatus.STATUS_SEEDING:
+        msg += (
+            f"\n<code>Size   : </code>{fields['size']}"
+            f"\n<code>Speed  : </code>{fields['seed_speed']}"
+            f"\n<code>Upload : </code>{fields['uploaded']}"
+            f"\n<code>Ratio  : </code>{fields['ratio']}"
+            f"\n<code>Time   : </code>{fields['seeding_time']}"
+        )
+    else:
+        msg += (
+            f"\n<code>Status :</code> <b>{tstatus}</b>"
+            f"\n<code>Size   :</code> {fields['size']}"
+            f"\n<code>Detail :</code> {fields['mode']}"
+            f"\n<code>Past   :</code> {fields['elapsed']}"
+            f"\n<code>User   :</code> {fields['user_tag']}"
+            f"\n<code>UserID :</code> {fields['user_id']}"
+        )
+    msg += f"\n<code>Engine :</code> {fields['engine']}\n{fields['cancel']}\n\n"
+    return msg
+
+
+async def get_task_block(entry, tstatus):
+    if block := entry["blocks"].get(tstatus):
+        return block
+    task = entry["task"]
+    if iscoroutinefunction(task.progress):
+        progress = (
+            await task.progress()
+            if tstatus not in [
+                MirrorStatus.STATUS_SEEDING,
+                MirrorStatus.STATUS_QUEUEDL,
+                MirrorStatus.STATUS_QUEUEUP,
+                MirrorStatus.STATUS_METADATA
+            ]
+            else None
+        )
+    else:
+        progress = None
+    fields = await sync_to_async(
+        _get_task_fields,
+        task,
+        tstatus,
+        progress
+    )
+    key = (
+        entry["gid"],
+        tstatus
+    )
+    # elapsed ticks every second, keep it out of the cache key
+    elapsed = fields.pop("elapsed")
+    cached = task_blocks.get(key)
+    if cached and cached[0] == fields:
+        template = cached[1]
+    else:
+        template = _render_task_block({
+            **fields,
+            "elapsed": ELAPSED_MARK
+        })
+        task_blocks[key] = (
+            fields,
+            template
+        )
+    block = template.replace(
+        ELAPSED_MARK,
+        elapsed
+    )
+    entry["blocks"][tstatus] = block
+    return block
+
 
 async def get_readable_message(
         sid,
         is_user,
         page_no=1,
         status="All",
-        page_step=1
+        page_step=1,
+        snapshot=None
     ):
     msg = ""
     button = None
 
+    snapshot = snapshot or await get_status_snapshot()
     tasks = await sync_to_async(
-        get_specific_tasks,
+        filter_snapshot,
+        snapshot,
         status,
         sid
         if is_user
@@ -224,95 +515,23 @@ async def get_readable_message(
         status_dict[sid]["page_no"] = page_no
     start_position = (page_no - 1) * STATUS_LIMIT
 
-    for index, task in enumerate(
+    for index, entry in enumerate(
         tasks[start_position : STATUS_LIMIT + start_position],
         start=1
     ):
         tstatus = (
-            await sync_to_async(task.status)
+            await sync_to_async(
+                _entry_status,
+                entry
+            )
             if status == "All"
             else status
         )
-        elapse = time() - task.listener.time
-        elapsed = (
-            "-"
-            if elapse < 1
-            else get_readable_time(elapse)
+        block = await get_task_block(
+            entry,
+            tstatus
         )
-        user_tag = f"<code>{task.listener.message.from_user.mention(style='html')}</code>"
-        cancel_task = (
-            f"<code>/{BotCommands.CancelTaskCommand}_{task.gid()[:10]}</code>" 
-            if "-" in task.gid() 
-            else f"<b>/{BotCommands.CancelTaskCommand}_{task.gid()[:10]}</b>"
-        )
-        task_name = (
-            f"<b>{escape(f'{task.name()}')}</b>"
-            if config_dict["DELETE_LINKS"] and int(config_dict["HIDE_TASK"]) > 0
-            and elapse <= config_dict["HIDE_TASK"]
-            else f"<b>Task is being Processed!</b>"
-            if config_dict["DELETE_LINKS"] and int(config_dict["HIDE_TASK"]) > 0
-            else f"<b>{escape(f'{task.name()}')}</b>"
-        )
-
-        msg += f"<pre language=ZyradaexLeech>{index + start_position}.{task_name}</pre>"
-
-        if tstatus not in [
-            MirrorStatus.STATUS_SEEDING,
-            MirrorStatus.STATUS_QUEUEDL,
-            MirrorStatus.STATUS_QUEUEUP,
-            MirrorStatus.STATUS_METADATA
-        ]:
-            progress = (
-                await task.progress()
-                if iscoroutinefunction(task.progress)
-                else task.progress()
-            )
-            msg += (
-                f"\n{get_progress_bar_string(progress)} » <b><i>{progress}</i></b>"
-                f"\n<code>Status :</code> <b>{tstatus}</b>"
-                f"\n<code>Done   :</code> {task.processed_bytes()} of {task.size()}"
-                f"\n<code>Speed  :</code> {task.speed()}"
-                f"\n<code>ETA    :</code> {task.eta()}"
-                f"\n<code>Past   :</code> {elapsed}"
-                f"\n<code>User   :</code> <b>{user_tag}</b>"
-                f"\n<code>UserID :</code> {task.listener.user_id}"
-                f"\n<code>Detail :</code> {task.listener.mode}"
-            )
-            if hasattr(
-                task,
-                "playList"
-            ):
-                try:
-                    if playlist := task.playList():
-                        msg += f"\n<code>YtList :</code> {playlist}"
-                except:
-                    pass
-            if hasattr(
-                task,
-                "seeders_num"
-            ):
-                try:
-                    msg += f"\n<code>S/L    :</code> {task.seeders_num()}/{task.leechers_num()}"
-                except:
-                    pass
-        elif tstatus == MirrorStatus.STATUS_SEEDING:
-            msg += (
-                f"\n<code>Size   : </code>{task.size()}"
-                f"\n<code>Speed  : </code>{task.seed_speed()}"
-                f"\n<code>Upload : </code>{task.uploaded_bytes()}"
-                f"\n<code>Ratio  : </code>{task.ratio()}"
-                f"\n<code>Time   : </code>{task.seeding_time()}"
-            )
-        else:
-            msg += (
-                f"\n<code>Status :</code> <b>{tstatus}</b>"
-                f"\n<code>Size   :</code> {task.size()}"
-                f"\n<code>Detail :</code> {task.listener.mode}"
-                f"\n<code>Past   :</code> {elapsed}"
-                f"\n<code>User   :</code> {user_tag}"
-                f"\n<code>UserID :</code> {task.listener.user_id}"
-            )
-        msg += f"\n<code>Engine :</code> {task.engine}\n{cancel_task}\n\n"
+        msg += f"<pre language=ZyradaexLeech>{index + start_position}.{block}"
 
     if len(msg) == 0:
         if status == "All":
@@ -385,13 +604,7 @@ async def get_readable_message(
                     f"status {sid} st {status_value}"
                 )
     button = buttons.build_menu(8)
-    msg += (
-        f"──────────────────\n"
-        f"<b>CPU</b>: {cpu_percent()}% | "
-        f"<b>FREE</b>: {get_readable_file_size(disk_usage(DOWNLOAD_DIR).free)}\n"
-        f"<b>RAM</b>: {virtual_memory().percent}% | "
-        f"<b>UPTM</b>: {get_readable_time(time() - bot_start_time)}"
-    )
+    msg += snapshot["footer"]
     remaining_time = 86400 - (time() - bot_start_time)
     if remaining_time < 3600:
         if remaining_time > 0:
@@ -1,7 +1,10 @@
 from asyncio import Event
+from time import time
 
 from bot import (
     config_dict,
+    task_dict,
+    user_data,
     queued_dl,
     queued_up,
     non_queued_up,
@@ -18,10 +21,7 @@ from .files_utils import (
     get_base_name
 )
 from .links_utils import is_gdrive_id
-from .status_utils import (
-    get_specific_tasks,
-    get_readable_file_size
-)
+from .status_utils import get_readable_file_size
 from ..task_utils.gdrive_utils.search import GoogleDriveSearch
 from ..telegram_helper.message_utils import is_admin
 
@@ -82,13 +82,144 @@ async def stop_duplicate_check(listener):
     )
 
 
-async def check_running_tasks(listener, state="dl"):
+QUEUE_AGING_TIME = 1800
+
+queued_meta = {}
+running_meta = {
+    "dl": {},
+    "up": {}
+}
+
+
+def get_engine_limits():
+    limits = {}
+    for item in str(config_dict["QUEUE_ENGINE_LIMITS"]).split():
+        (
+            engine,
+            _,
+            limit
+        ) = item.partition(":")
+        if limit.isdigit():
+            limits[engine.lower()] = int(limit)
+    return limits
+
+
+def get_upload_engine(listener):
+    if listener.is_leech:
+        return "telegram"
+    elif is_gdrive_id(listener.up_dest):
+        return "gdrive"
+    return "rclone"
+
+
+def _is_priority_user(user_id):
+    return (
+        user_id == config_dict["OWNER_ID"]
+        or (
+            user_id in user_data
+            and user_data[user_id].get("is_sudo")
+        )
+    )
+
+
+def _is_over_limit(state):
     all_limit = config_dict["QUEUE_ALL"]
     state_limit = (
         config_dict["QUEUE_DOWNLOAD"]
         if state == "dl"
         else config_dict["QUEUE_UPLOAD"]
     )
+    dl_count = len(non_queued_dl)
+    up_count = len(non_queued_up)
+    t_count = (
+        dl_count
+        if state == "dl"
+        else up_count
+    )
+    return bool(
+        (
+            all_limit
+            and dl_count + up_count >= all_limit
+            and (
+                not state_limit
+                or t_count >= state_limit
+            )
+        ) or (
+            state_limit
+            and t_count >= state_limit
+        )
+    )
+
+
+def _get_running_load(state):
+    non_queued = (
+        non_queued_dl
+        if state == "dl"
+        else non_queued_up
+    )
+    running = running_meta[state]
+    for mid in list(running.keys()):
+        if mid not in non_queued:
+            del running[mid]
+    engines = {}
+    users = {}
+    for (
+        engine,
+        user_id
+    ) in running.values():
+        engines[engine] = engines.get(engine, 0) + 1
+        users[user_id] = users.get(user_id, 0) + 1
+    return (
+        engines,
+        users
+    )
+
+
+def _set_running(mid, state, engine, user_id):
+    running_meta[state][mid] = (
+        engine,
+        user_id
+    )
+
+
+def _pick_next(state, engines, users, limits):
+    queued = (
+        queued_dl
+        if state == "dl"
+        else queued_up
+    )
+    now = time()
+    best = None
+    best_key = None
+    for mid in list(queued.keys()):
+        if (meta := queued_meta.get(mid)) is None:
+            continue
+        engine = meta[state]
+        if (
+            engine in limits
+            and engines.get(engine, 0) >= limits[engine]
+        ):
+            continue
+        key = (
+            0
+            if meta["priority"]
+            or now - meta["time"] >= QUEUE_AGING_TIME
+            else 1,
+            users.get(meta["user_id"], 0),
+            meta["time"]
+        )
+        if (
+            best_key is None
+            or key < best_key
+        ):
+            best = mid
+            best_key = key
+    return best
+
+
+async def check_running_tasks(listener, state="dl", engine=None):
+    if state == "up":
+        engine = get_upload_engine(listener)
     event = None
     is_over_limit = False
     async with queue_dict_lock:
@@ -98,8 +229,7 @@ async def check_running_tasks(listener, state="dl"):
         ):
             non_queued_dl.remove(listener.mid)
         if (
-            (all_limit or state_limit)
-            and not listener.force_run
+            not listener.force_run
             and not (
                 listener.force_upload
                 and state == "up"
@@ -109,23 +239,25 @@ async def check_running_tasks(listener, state="dl"):
                 and state == "dl"
             )
         ):
-            dl_count = len(non_queued_dl)
-            up_count = len(non_queued_up)
-            t_count = (
-                dl_count
-                if state == "dl"
-                else up_count
+            limits = get_engine_limits()
+            engines, _ = _get_running_load(state)
+            is_over_limit = _is_over_limit(state) or (
+                engine in limits
+                and engines.get(engine, 0) >= limits[engine]
             )
-            is_over_limit = (
-                all_limit
-                and dl_count + up_count >= all_limit
-                and (
-                    not state_limit
-                    or t_count >= state_limit
-                )
-            ) or (state_limit and t_count >= state_limit)
             if is_over_limit:
                 event = Event()
+                meta = queued_meta.setdefault(
+                    listener.mid,
+                    {
+                        "user_id": listener.user_id,
+                        "priority": _is_priority_user(listener.user_id),
+                        "dl": None,
+                        "up": None
+                    }
+                )
+                meta[state] = engine
+                meta["time"] = time()
                 if state == "dl":
                     queued_dl[listener.mid] = event
                 else:
@@ -135,6 +267,12 @@ async def check_running_tasks(listener, state="dl"):
                 non_queued_up.add(listener.mid)
             else:
                 non_queued_dl.add(listener.mid)
+            _set_running(
+                listener.mid,
+                state,
+                engine,
+                listener.user_id
+            )
 
     return (
         is_over_limit,
@@ -146,114 +284,76 @@ async def start_dl_from_queued(mid: int):
     queued_dl[mid].set()
     del queued_dl[mid]
     non_queued_dl.add(mid)
+    if meta := queued_meta.pop(mid, None):
+        _set_running(
+            mid,
+            "dl",
+            meta["dl"],
+            meta["user_id"]
+        )
 
 
 async def start_up_from_queued(mid: int):
     queued_up[mid].set()
     del queued_up[mid]
     non_queued_up.add(mid)
+    if meta := queued_meta.pop(mid, None):
+        _set_running(
+            mid,
+            "up",
+            meta["up"],
+            meta["user_id"]
+        )
 
 
 async def start_from_queued():
-    if all_limit := config_dict["QUEUE_ALL"]:
-        dl_limit = config_dict["QUEUE_DOWNLOAD"]
-        up_limit = config_dict["QUEUE_UPLOAD"]
-        async with queue_dict_lock:
-            dl = len(non_queued_dl)
-            up = len(non_queued_up)
-            all_ = dl + up
-            if all_ < all_limit:
-                f_tasks = all_limit - all_
-                if queued_up and (
-                    not up_limit
-                    or up < up_limit
-                ):
-                    for (
-                        index,
-                        mid
-                    ) in enumerate(
-                        list(queued_up.keys()),
-                        start=1
-                    ):
-                        await start_up_from_queued(mid)
-                        f_tasks -= 1
-                        if f_tasks == 0 or (
-                            up_limit
-                            and index >= up_limit - up
-                        ):
-                            break
-                if queued_dl and (
-                    not dl_limit
-                    or dl < dl_limit
-                ) and f_tasks != 0:
-                    for index, mid in enumerate(
-                        list(queued_dl.keys()),
-                        start=1
-                    ):
-                        await start_dl_from_queued(mid)
-                        if (
-                            dl_limit
-                            and index >= dl_limit - dl
-                        ) or index == f_tasks:
-                            break
-        return
-
-    if up_limit := config_dict["QUEUE_UPLOAD"]:
-        async with queue_dict_lock:
-            up = len(non_queued_up)
+    async with queue_dict_lock:
+        for mid in list(queued_meta.keys()):
             if (
-                queued_up and
-                up < up_limit
+                mid not in queued_dl
+                and mid not in queued_up
             ):
-                f_tasks = up_limit - up
-                for (
-                    index,
-                    mid
-                ) in enumerate(
-                    list(queued_up.keys()),
-                    start=1
-                ):
-                    await start_up_from_queued(mid)
-                    if index == f_tasks:
-                        break
-    else:
-        async with queue_dict_lock:
-            if queued_up:
-                for mid in list(queued_up.keys()):
-                    await start_up_from_queued(mid)
-
-    if dl_limit := config_dict["QUEUE_DOWNLOAD"]:
-        async with queue_dict_lock:
-            dl = len(non_queued_dl)
-            if (
-                queued_dl and
-                dl < dl_limit
+                del queued_meta[mid]
+        limits = get_engine_limits()
+        for (
+            state,
+            queued,
+            start_queued
+        ) in [
+            (
+                "up",
+                queued_up,
+                start_up_from_queued
+            ),
+            (
+                "dl",
+                queued_dl,
+                start_dl_from_queued
+            )
+        ]:
+            (
+                engines,
+                users
+            ) = _get_running_load(state)
+            while (
+                queued
+                and not _is_over_limit(state)
             ):
-                f_tasks = dl_limit - dl
-                for (
-                    index,
-                    mid
-                ) in enumerate(
-                    list(queued_dl.keys()),
-                    start=1
-                ):
-                    await start_dl_from_queued(mid)
-                    if index == f_tasks:
-                        break
-    else:
-        async with queue_dict_lock:
-            if queued_dl:
-                for mid in list(queued_dl.keys()):
-                    await start_dl_from_queued(mid)
+                if (mid := _pick_next(
+                    state,
+                    engines,
+                    users,
+                    limits
+                )) is None:
+                    break
+                meta = queued_meta[mid]
+                engines[meta[state]] = engines.get(meta[state], 0) + 1
+                users[meta["user_id"]] = users.get(meta["user_id"], 0) + 1
+                await start_queued(mid)
 
 
 async def check_user_tasks(user_id, maxtask):
-    all_tasks = await sync_to_async(
-        get_specific_tasks,
-        "All",
-        user_id
-    )
-    return len(all_tasks) >= maxtask
+    return task_dict.user_count(user_id) >= maxtask
 
 
 async def list_checker(listener):
@@ -0,0 +1,109 @@
+class TaskRegistry(dict):
+    """task_dict with gid and user indexes kept in sync on every write"""
+
+    def __init__(self):
+        super().__init__()
+        self._gids = {}
+        self._users = {}
+        self._keys = {}
+
+    def __setitem__(self, mid, task):
+        if (
+            mid in self
+            and self[mid].listener.user_id != task.listener.user_id
+        ):
+            self._unindex(mid)
+        super().__setitem__(
+            mid,
+            task
+        )
+        self._index(
+            mid,
+            task
+        )
+
+    def __delitem__(self, mid):
+        super().__delitem__(mid)
+        self._unindex(mid)
+
+    def pop(self, mid, *args):
+        if mid in self:
+            self._unindex(mid)
+        return super().pop(
+            mid,
+            *args
+        )
+
+    def clear(self):
+        super().clear()
+        self._gids.clear()
+        self._users.clear()
+        self._keys.clear()
+
+    def _index(self, mid, task):
+        user_id = task.listener.user_id
+        self._users.setdefault(
+            user_id,
+            {}
+        )[mid] = None
+        self._keys.setdefault(
+            mid,
+            {
+                "gid": None,
+                "user_id": user_id
+            }
+        )
+        self.reindex_gid(mid)
+
+    def _unindex(self, mid):
+        if (keys := self._keys.pop(mid, None)) is None:
+            return
+        if (
+            keys["gid"] is not None
+            and self._gids.get(keys["gid"]) == mid
+        ):
+            del self._gids[keys["gid"]]
+        if mids := self._users.get(keys["user_id"]):
+            mids.pop(
+                mid,
+                None
+            )
+            if not mids:
+                del self._users[keys["user_id"]]
+
+    def reindex_gid(self, mid):
+        if (
+            (task := self.get(mid)) is None
+            or (keys := self._keys.get(mid)) is None
+        ):
+            return
+        try:
+            gid = task.gid()[:10]
+        except:
+            gid = None
+        if keys["gid"] == gid:
+            return
+        if (
+            keys["gid"] is not None
+            and self._gids.get(keys["gid"]) == mid
+        ):
+            del self._gids[keys["gid"]]
+        keys["gid"] = gid
+        if gid is not None:
+            self._gids[gid] = mid
+
+    def get_by_gid(self, gid):
+        if (mid := self._gids.get(gid[:10])) is not None:
+            return self.get(mid)
+        return None
+
+    def by_user(self, user_id):
+        return [
+            self[mid]
+            for mid
+            in list(self._users.get(user_id, ()))
+            if mid in self
+        ]
+
+    def user_count(self, user_id):
+        return len(self._users.get(user_id, ()))
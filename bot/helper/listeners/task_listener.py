@@ -41,6 +41,7 @@ from ..ext_utils.files_utils import (
     join_files
 )
 from ..ext_utils.links_utils import is_gdrive_id
+from ..ext_utils.list_cache import invalidate_listings
 from ..ext_utils.status_utils import (
     get_readable_file_size,
     get_readable_time
@@ -62,6 +63,7 @@ from ..telegram_helper.message_utils import (
     delete_links,
     delete_status,
     send_message,
+    stop_status_ticker,
     update_status_message,
 )
 
@@ -73,10 +75,8 @@ class TaskListener(TaskConfig):
 
     async def clean(self):
         try:
-            if st := intervals["status"]:
-                for intvl in list(st.values()):
-                    intvl.cancel()
             intervals["status"].clear()
+            stop_status_ticker()
             await gather(
                 sync_to_async(aria2.purge),
                 delete_status()
@@ -111,7 +111,7 @@ class TaskListener(TaskConfig):
         ):
             await database.add_incomplete_task(
                 self.message.chat.id, # type: ignore
-                self.message.link, # type: ignore
+                self.task_link or self.message.link, # type: ignore
                 self.tag
             )
 
@@ -307,7 +307,11 @@ class TaskListener(TaskConfig):
         )
         self.size = await get_path_size(up_dir)
 
-        if self.metadata:
+        # a streamed archive still points at the source files, leave them untouched
+        if (
+            self.metadata
+            and not self.stream_compress
+        ):
             await self.proceedMetadata(
                 up_path,
                 gid
@@ -315,7 +319,10 @@ class TaskListener(TaskConfig):
             if self.is_cancelled:
                 return
 
-        if self.m_attachment:
+        if (
+            self.m_attachment
+            and not self.stream_compress
+        ):
             await self.proceedAttachment(
                 up_path,
                 gid
@@ -323,16 +330,6 @@ class TaskListener(TaskConfig):
             if self.is_cancelled:
                 return
 
-        if self.is_leech and not self.compress:
-            await self.proceed_split(
-                up_dir,
-                unwanted_files_size,
-                unwanted_files,
-                gid
-            )
-            if self.is_cancelled:
-                return
-
         (
             add_to_queue,
             event
@@ -399,6 +396,13 @@ class TaskListener(TaskConfig):
                     files_to_delete
                 )
             )
+            invalidate_listings(
+                "gdrive",
+                self.up_dest.rsplit( # type: ignore
+                    ":",
+                    1
+                )[-1]
+            )
         else:
             LOGGER.info(f"Rclone Upload Name: {self.name}")
             RCTransfer = RcloneTransferHelper(self)
@@ -438,7 +442,7 @@ class TaskListener(TaskConfig):
             and config_dict["INCOMPLETE_TASK_NOTIFIER"]
             and config_dict["DATABASE_URL"]
         ):
-            await database.rm_complete_task(self.message.link) # type: ignore
+            await database.rm_complete_task(self.task_link or self.message.link) # type: ignore
         LOGGER.info(f"Task Done: {self.name}")
         lmsg = (
             f"<b><i>{escape(self.name)}</i></b>"
@@ -762,7 +766,7 @@ class TaskListener(TaskConfig):
             and config_dict["INCOMPLETE_TASK_NOTIFIER"]
             and config_dict["DATABASE_URL"]
         ):
-            await database.rm_complete_task(self.message.link) # type: ignore
+            await database.rm_complete_task(self.task_link or self.message.link) # type: ignore
 
         async with queue_dict_lock:
             if self.mid in queued_dl:
@@ -832,7 +836,7 @@ class TaskListener(TaskConfig):
             and config_dict["INCOMPLETE_TASK_NOTIFIER"]
             and config_dict["DATABASE_URL"]
         ):
-            await database.rm_complete_task(self.message.link) # type: ignore
+            await database.rm_complete_task(self.task_link or self.message.link) # type: ignore
 
         async with queue_dict_lock:
             if self.mid in queued_dl:
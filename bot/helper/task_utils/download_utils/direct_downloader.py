@@ -68,7 +68,10 @@ async def add_direct_download(listener, path):
     (
         add_to_queue,
         event
-    ) = await check_running_tasks(listener)
+    ) = await check_running_tasks(
+        listener,
+        engine="direct"
+    )
     if add_to_queue:
         LOGGER.info(f"Added to Queue/Download: {listener.name}")
         async with task_dict_lock:
@@ -157,7 +157,10 @@ async def add_mega_download(listener, path):
     (
         added_to_queue,
         event
-    ) = await check_running_tasks(listener)
+    ) = await check_running_tasks(
+        listener,
+        engine="mega"
+    )
     if added_to_queue:
         LOGGER.info(f"Added to Queue/Download: {listener.name}")
         async with task_dict_lock:
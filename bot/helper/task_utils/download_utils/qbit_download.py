@@ -38,7 +38,10 @@ async def add_qb_torrent(listener, path, ratio, seed_time):
         (
             add_to_queue,
             event
-        ) = await check_running_tasks(listener)
+        ) = await check_running_tasks(
+            listener,
+            engine="qbit"
+        )
         op = await sync_to_async(
             qbittorrent_client.torrents_add,
             url,
@@ -418,7 +418,10 @@ class YoutubeDLHelper:
         (
             add_to_queue,
             event
-        ) = await check_running_tasks(self._listener)
+        ) = await check_running_tasks(
+            self._listener,
+            engine="ytdlp"
+        )
         if add_to_queue:
             LOGGER.info(f"Added to Queue/Download: {self._listener.name}")
             async with task_dict_lock:
@@ -1,6 +1,5 @@
 from googleapiclient.errors import HttpError
 from logging import getLogger
-from os import path as ospath
 from tenacity import (
     retry,
     wait_exponential,
@@ -11,10 +10,13 @@ from tenacity import (
 from time import time
 
 from ...ext_utils.bot_utils import async_to_sync
+from ...ext_utils.parsers import get_error_reason
 from ...task_utils.gdrive_utils.helper import GoogleDriveHelper
 
 LOGGER = getLogger(__name__)
 
+COPY_BATCH_SIZE = 50
+
 
 class GoogleDriveClone(GoogleDriveHelper):
 
@@ -166,42 +168,153 @@ class GoogleDriveClone(GoogleDriveHelper):
 
     def _cloneFolder(self, folder_name, folder_id, dest_id):
         LOGGER.info(f"Syncing: {folder_name}")
-        files = self.get_files_by_folder_id(folder_id)
-        if len(files) == 0:
-            return dest_id
-        for file in files:
-            if file.get("mimeType") == self.G_DRIVE_DIR_MIME_TYPE:
-                self.total_folders += 1
-                file_path = ospath.join(
-                    folder_name,
-                    file.get("name")
+        self._start_pool()
+        try:
+            level = [(
+                folder_name,
+                folder_id,
+                dest_id
+            )]
+            while level:
+                folders = []
+                for (
+                    _,
+                    source_id,
+                    target_id
+                ) in level:
+                    files = []
+                    for file in self.get_files_by_folder_id(source_id):
+                        if file.get("mimeType") == self.G_DRIVE_DIR_MIME_TYPE:
+                            # keep the raw name, Drive folder names may contain "/"
+                            folders.append((
+                                file.get("name"),
+                                file.get("id"),
+                                target_id
+                            ))
+                        elif (
+                            not file.get("name")
+                            .lower()
+                            .endswith(tuple(self.listener.extension_filter))
+                        ):
+                            files.append(file)
+                    for i in range(
+                        0,
+                        len(files),
+                        COPY_BATCH_SIZE
+                    ):
+                        self._submit(
+                            "_copy_batch",
+                            files[i : i + COPY_BATCH_SIZE],
+                            target_id
+                        )
+                    if (
+                        self.listener.is_cancelled
+                        or self._error is not None
+                    ):
+                        break
+                if (
+                    not folders
+                    or self.listener.is_cancelled
+                    or self._error is not None
+                ):
+                    break
+                folder_ids = self.create_directories([
+                    (
+                        name,
+                        target_id
+                    )
+                    for (
+                        name,
+                        _,
+                        target_id
+                    ) in folders
+                ])
+                self.total_folders += len(folders)
+                level = [
+                    (
+                        name,
+                        source_id,
+                        new_id
+                    )
+                    for (
+                        (
+                            name,
+                            source_id,
+                            _
+                        ),
+                        new_id
+                    ) in zip(
+                        folders,
+                        folder_ids
+                    )
+                ]
+            self._wait_pool()
+        finally:
+            self._stop_pool()
+
+    def _copy_request(self, file_id, dest_id):
+        return (
+            self.service.files() # type: ignore
+            .copy(
+                fileId=file_id,
+                body={"parents": [dest_id]},
+                supportsAllDrives=True
+            )
+        )
+
+    def _copy_batch(self, files, dest_id):
+        try:
+            results = self.execute_batch([
+                (
+                    file["id"],
+                    self._copy_request(
+                        file["id"],
+                        dest_id
+                    )
                 )
-                current_dir_id = self.create_directory(
-                    file.get("name"),
-                    dest_id
+                for file
+                in files
+            ])
+        except Exception as e:
+            LOGGER.error(f"Batch copy failed, copying one by one: {e}")
+            results = {}
+        for file in files:
+            if self.listener.is_cancelled:
+                return
+            (
+                response,
+                exception
+            ) = results.get(
+                file["id"],
+                (None, None)
+            )
+            if (
+                exception is not None
+                and isinstance(
+                    exception,
+                    HttpError
                 )
-                self._cloneFolder(
-                    file_path,
-                    file.get("id"),
-                    current_dir_id
+                and get_error_reason(exception.content) == "cannotCopyFile"
+            ):
+                LOGGER.error(
+                    f"cannotCopyFile: {file.get('name')}, ID: {file['id']}. {exception}"
                 )
             elif (
-                not file.get("name")
-                .lower()
-                .endswith(tuple(self.listener.extension_filter))
+                response is None
+                or exception is not None
             ):
-                self.total_files += 1
                 self._copyFile(
-                    file.get("id"),
+                    file["id"],
                     dest_id
                 )
-                self.proc_bytes += int(file.get(
+            self._add_progress(
+                int(file.get(
                     "size",
                     0
-                ))
-                self.total_time = int(time() - self._start_time)
-            if self.listener.is_cancelled:
-                break
+                )),
+                1
+            )
+            (self._owner or self).total_time = int(time() - self._start_time)
 
     @retry(
         wait=wait_exponential(
@@ -213,45 +326,31 @@ class GoogleDriveClone(GoogleDriveHelper):
         retry=retry_if_exception_type(Exception),
     )
     def _copyFile(self, file_id, dest_id):
-        body = {"parents": [dest_id]}
         try:
-            return (
-                self.service.files()
-                .copy(
-                    fileId=file_id,
-                    body=body,
-                    supportsAllDrives=True
-                )
-                .execute()
-            )
+            return self._copy_request(
+                file_id,
+                dest_id
+            ).execute()
         except HttpError as err:
-            if err.resp.get(
-                "content-type",
-                ""
-            ).startswith("application/json"):
-                reason = eval(err.content).get("error").get("errors")[0].get("reason")
-                if reason not in [
+            if (
+                err.resp.get(
+                    "content-type",
+                    ""
+                ).startswith("application/json")
+                and get_error_reason(err.content) == "cannotCopyFile"
+            ):
+                LOGGER.error(err)
+                return None
+            if self.listener.is_cancelled:
+                return None
+            self._switch_on_quota(
+                err,
+                [
                     "userRateLimitExceeded",
                     "dailyLimitExceeded",
-                    "cannotCopyFile",
-                ]:
-                    raise err
-                if reason == "cannotCopyFile":
-                    LOGGER.error(err)
-                elif self.use_sa:
-                    if self.sa_count >= self.sa_number:
-                        LOGGER.info(
-                            f"Reached maximum number of service accounts switching, which is {self.sa_count}"
-                        )
-                        raise err
-                    else:
-                        if self.listener.is_cancelled:
-                            return
-                        self.switch_service_account()
-                        return self._copyFile(
-                            file_id,
-                            dest_id
-                        )
-                else:
-                    LOGGER.error(f"Got: {reason}")
-                    raise err
+                ]
+            )
+            return self._copyFile(
+                file_id,
+                dest_id
+            )
@@ -3,6 +3,7 @@ from googleapiclient.http import MediaIoBaseDownload
 from io import FileIO
 from logging import getLogger
 from os import makedirs, path as ospath
+from time import sleep
 from tenacity import (
     retry,
     wait_exponential,
@@ -11,12 +12,22 @@ from tenacity import (
     RetryError,
 )
 
+from bot import config_dict
 from ...ext_utils.bot_utils import async_to_sync
 from ...ext_utils.bot_utils import SetInterval
 from ...task_utils.gdrive_utils.helper import GoogleDriveHelper
 
 LOGGER = getLogger(__name__)
 
+RANGE_CHUNK_SIZE = 32 * 1024 * 1024
+RANGE_SPLIT_SIZE = 4 * RANGE_CHUNK_SIZE
+RANGE_RETRIES = 10
+RANGE_BACKOFF_MAX = 64
+DOWNLOAD_QUOTA_REASONS = [
+    "downloadQuotaExceeded",
+    "dailyLimitExceeded",
+]
+
 
 class GoogleDriveDownload(GoogleDriveHelper):
 
@@ -43,23 +54,29 @@ class GoogleDriveDownload(GoogleDriveHelper):
         )
         try:
             meta = self.get_file_metadata(file_id)
-            if meta.get("mimeType") == self.G_DRIVE_DIR_MIME_TYPE:
-                self._download_folder(
-                    file_id,
-                    self._path,
-                    self.listener.name
-                )
-            else:
-                makedirs(
-                    self._path,
-                    exist_ok=True
-                )
-                self._download_file(
-                    file_id,
-                    self._path,
-                    self.listener.name,
-                    meta.get("mimeType")
-                )
+            self._start_pool()
+            try:
+                if meta.get("mimeType") == self.G_DRIVE_DIR_MIME_TYPE:
+                    self._download_folder(
+                        file_id,
+                        self._path,
+                        self.listener.name
+                    )
+                else:
+                    makedirs(
+                        self._path,
+                        exist_ok=True
+                    )
+                    self._submit_file(
+                        file_id,
+                        self._path,
+                        self.listener.name,
+                        meta.get("mimeType"),
+                        meta.get("size")
+                    )
+                self._wait_pool()
+            finally:
+                self._stop_pool()
         except Exception as err:
             if isinstance(
                 err,
@@ -132,15 +149,131 @@ class GoogleDriveDownload(GoogleDriveHelper):
                 not ospath.isfile(f"{path}{filename}")
                 and not filename.lower().endswith(tuple(self.listener.extension_filter))
             ):
-                self._download_file(
+                self._submit_file(
                     file_id,
                     path,
                     filename,
-                    mime_type
+                    mime_type,
+                    None
+                    if shortcut_details is not None
+                    else item.get("size")
                 )
-            if self.listener.is_cancelled:
+            if (
+                self.listener.is_cancelled
+                or self._error is not None
+            ):
                 break
 
+    def _submit_file(self, file_id, path, filename, mime_type, size):
+        filename = filename.replace(
+            "/",
+            ""
+        )
+        if len(filename.encode()) > 255:
+            ext = ospath.splitext(filename)[1]
+            filename = f"{filename[:245]}{ext}"
+            if self.listener.name.endswith(ext):
+                self.listener.name = filename
+        if (
+            size is not None
+            and int(size) >= RANGE_SPLIT_SIZE
+            and config_dict["GDRIVE_WORKERS"] > 1
+        ):
+            size = int(size)
+            file_path = f"{path}/{filename}"
+            with open(
+                file_path,
+                "wb"
+            ) as f:
+                f.truncate(size)
+            for start in range(
+                0,
+                size,
+                RANGE_CHUNK_SIZE
+            ):
+                self._submit(
+                    "_download_range",
+                    file_id,
+                    file_path,
+                    start,
+                    min(
+                        start + RANGE_CHUNK_SIZE,
+                        size
+                    ) - 1
+                )
+        else:
+            self._submit(
+                "_download_file",
+                file_id,
+                path,
+                filename,
+                mime_type
+            )
+
+    @retry(
+        wait=wait_exponential(
+            multiplier=2,
+            min=3,
+            max=6
+        ),
+        stop=stop_after_attempt(3),
+        retry=(retry_if_exception_type(Exception)),
+    )
+    def _download_range(self, file_id, file_path, start, end):
+        retries = 0
+        while not self.listener.is_cancelled:
+            request = self.service.files().get_media( # type: ignore
+                fileId=file_id,
+                supportsAllDrives=True
+            )
+            (
+                resp,
+                content
+            ) = request.http.request( # type: ignore
+                request.uri,
+                headers={"range": f"bytes={start}-{end}"}
+            )
+            if resp.status == 206:
+                if len(content) != end - start + 1:
+                    raise ValueError(
+                        f"Drive sent {len(content)} bytes for range {start}-{end}"
+                    )
+                break
+            if resp.status == 200:
+                # the whole body would land at every chunk offset
+                raise ValueError("Drive ignored the byte range request")
+            err = HttpError(
+                resp,
+                content,
+                uri=request.uri
+            )
+            if resp.status in [
+                500,
+                502,
+                503,
+                504,
+                429
+            ] and retries < RANGE_RETRIES:
+                sleep(min(
+                    2 ** retries,
+                    RANGE_BACKOFF_MAX
+                ))
+                retries += 1
+                continue
+            self._switch_on_quota(
+                err,
+                DOWNLOAD_QUOTA_REASONS
+            )
+        else:
+            return
+        with open(
+            file_path,
+            "r+b"
+        ) as f:
+            f.seek(start)
+            f.write(content)
+        self._add_progress(len(content))
+
     @retry(
         wait=wait_exponential(
             multiplier=2,
@@ -155,17 +288,9 @@ class GoogleDriveDownload(GoogleDriveHelper):
             fileId=file_id,
             supportsAllDrives=True
         )
-        filename = filename.replace(
-            "/",
-            ""
-        )
-        if len(filename.encode()) > 255:
-            ext = ospath.splitext(filename)[1]
-            filename = f"{filename[:245]}{ext}"
-            if self.listener.name.endswith(ext):
-                self.listener.name = filename
         if self.listener.is_cancelled:
             return
+        downloaded = 0
         fh = FileIO(
             f"{path}/{filename}",
             "wb"
@@ -177,52 +302,44 @@ class GoogleDriveDownload(GoogleDriveHelper):
         )
         done = False
         retries = 0
-        while not done:
-            if self.listener.is_cancelled:
-                fh.close()
-                break
-            try:
-                self.status, done = downloader.next_chunk()
-            except HttpError as err:
-                if err.resp.status in [
-                    500,
-                    502,
-                    503,
-                    504,
-                    429
-                ] and retries < 10:
-                    retries += 1
-                    continue
-                if err.resp.get(
-                    "content-type",
-                    ""
-                ).startswith("application/json"):
-                    reason = (
-                        eval(err.content).get("error").get("errors")[0].get("reason")
+        try:
+            while not done:
+                if self.listener.is_cancelled:
+                    break
+                try:
+                    (
+                        status,
+                        done
+                    ) = downloader.next_chunk()
+                except HttpError as err:
+                    if err.resp.status in [
+                        500,
+                        502,
+                        503,
+                        504,
+                        429
+                    ] and retries < 10:
+                        retries += 1
+                        continue
+                    if self.listener.is_cancelled:
+                        return
+                    self._switch_on_quota(
+                        err,
+                        DOWNLOAD_QUOTA_REASONS
+                    )
+                    fh.close()
+                    self._add_progress(-downloaded)
+                    downloaded = 0
+                    return self._download_file(
+                        file_id,
+                        path,
+                        filename,
+                        mime_type
                     )
-                    if reason not in [
-                        "downloadQuotaExceeded",
-                        "dailyLimitExceeded",
-                    ]:
-                        raise err
-                    if self.use_sa:
-                        if self.sa_count >= self.sa_number:
-                            LOGGER.info(
-                                f"Reached maximum number of service accounts switching, which is {self.sa_count}"
-                            )
-                            raise err
-                        else:
-                            if self.listener.is_cancelled:
-                                return
-                            self.switch_service_account()
-                            LOGGER.info(f"Got: {reason}, Trying Again...")
-                            return self._download_file(
-                                file_id,
-                                path,
-                                filename,
-                                mime_type
-                            )
-                    else:
-                        LOGGER.error(f"Got: {reason}")
-                        raise err
-        self.file_processed_bytes = 0
+                self._add_progress(status.resumable_progress - downloaded)
+                downloaded = status.resumable_progress
+        except:
+            self._add_progress(-downloaded)
+            raise
+        finally:
+            fh.close()
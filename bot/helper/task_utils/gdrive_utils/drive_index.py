@@ -0,0 +1,426 @@
+from concurrent.futures import ThreadPoolExecutor
+from googleapiclient.errors import HttpError
+from logging import getLogger
+from os import (
+    makedirs,
+    path as ospath,
+    replace
+)
+from pickle import (
+    dump as pdump,
+    load as pload
+)
+from re import compile as re_compile
+from threading import Lock
+from time import time
+
+from bot import (
+    config_dict,
+    drives_ids
+)
+from .helper import GoogleDriveHelper
+
+LOGGER = getLogger(__name__)
+
+INDEX_DIR = "drive_index"
+INDEX_PAGE_SIZE = 1000
+INDEX_RESULTS = 200
+INDEX_RETRY_MAX = 21600
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+FILE_FIELDS = "id, name, mimeType, size, parents, trashed, ownedByMe"
+TOKEN_PATTERN = re_compile(r"\w+")
+
+drive_indexes = {}
+index_lock = Lock()
+index_builder = ThreadPoolExecutor(max_workers=1)
+
+
+def _index_path(dir_id):
+    return f"{INDEX_DIR}/{dir_id}.pickle"
+
+
+def _new_index(dir_id):
+    return {
+        "dir_id": dir_id,
+        "files": {},
+        "names": {},
+        "tokens": {},
+        "page_token": None,
+        "synced": 0,
+        "ready": False,
+        "building": False,
+        "failures": 0,
+        "retry_at": 0,
+        "lock": Lock(),
+    }
+
+
+def _remove_file(index, file_id):
+    if (file := index["files"].pop(
+        file_id,
+        None
+    )) is None:
+        return
+    index["tokens"].pop(
+        file_id,
+        None
+    )
+    if ids := index["names"].get(file["name"]):
+        ids.discard(file_id)
+        if not ids:
+            del index["names"][file["name"]]
+
+
+def _add_file(index, file):
+    _remove_file(
+        index,
+        file["id"]
+    )
+    if (
+        file.get("trashed")
+        or (
+            index["dir_id"] == "root"
+            and not file.get(
+                "ownedByMe",
+                True
+            )
+        )
+    ):
+        return
+    name = file.get(
+        "name",
+        ""
+    )
+    index["files"][file["id"]] = {
+        "id": file["id"],
+        "name": name,
+        "mimeType": file.get("mimeType", ""),
+        "size": file.get("size", 0),
+        "parents": file.get("parents", []),
+    }
+    index["names"].setdefault(
+        name,
+        set()
+    ).add(file["id"])
+    index["tokens"][file["id"]] = tuple(TOKEN_PATTERN.findall(name.lower()))
+
+
+def _load_index(dir_id):
+    index = _new_index(dir_id)
+    path = _index_path(dir_id)
+    if not ospath.exists(path):
+        return index
+    try:
+        with open(
+            path,
+            "rb"
+        ) as f:
+            data = pload(f)
+    except Exception as e:
+        LOGGER.error(f"Drive index {dir_id} is unreadable: {e}")
+        return index
+    for file in data["files"]:
+        _add_file(
+            index,
+            file
+        )
+    index["page_token"] = data["page_token"]
+    index["ready"] = True
+    return index
+
+
+def _save_index(index):
+    makedirs(
+        INDEX_DIR,
+        exist_ok=True
+    )
+    path = _index_path(index["dir_id"])
+    with open(
+        f"{path}.tmp",
+        "wb"
+    ) as f:
+        pdump(
+            {
+                "files": list(index["files"].values()),
+                "page_token": index["page_token"],
+            },
+            f
+        )
+    replace(
+        f"{path}.tmp",
+        path
+    )
+
+
+def _drive_kwargs(dir_id):
+    if dir_id == "root":
+        return {}
+    return {
+        "driveId": dir_id,
+        "supportsAllDrives": True,
+        "includeItemsFromAllDrives": True,
+    }
+
+
+def _start_page_token(service, dir_id):
+    kwargs = {}
+    if dir_id != "root":
+        kwargs = {
+            "driveId": dir_id,
+            "supportsAllDrives": True
+        }
+    return service.changes().getStartPageToken(**kwargs).execute()["startPageToken"]
+
+
+def _list_all(service, dir_id):
+    if dir_id == "root":
+        kwargs = {"q": "'me' in owners and trashed = false"}
+    else:
+        kwargs = {
+            "q": "trashed = false",
+            "corpora": "drive",
+            **_drive_kwargs(dir_id),
+        }
+    page_token = None
+    while True:
+        response = (
+            service.files()
+            .list(
+                spaces="drive",
+                pageSize=INDEX_PAGE_SIZE,
+                fields=f"nextPageToken, files({FILE_FIELDS})",
+                pageToken=page_token,
+                **kwargs,
+            )
+            .execute()
+        )
+        yield from response.get(
+            "files",
+            []
+        )
+        if (page_token := response.get("nextPageToken")) is None:
+            break
+
+
+def _sync_changes(service, index):
+    page_token = index["page_token"]
+    changed = False
+    while page_token is not None:
+        response = (
+            service.changes()
+            .list(
+                pageToken=page_token,
+                pageSize=INDEX_PAGE_SIZE,
+                spaces="drive",
+                includeRemoved=True,
+                fields=f"nextPageToken, newStartPageToken, changes(fileId, removed, file({FILE_FIELDS}))",
+                **_drive_kwargs(index["dir_id"]),
+            )
+            .execute()
+        )
+        for change in response.get(
+            "changes",
+            []
+        ):
+            changed = True
+            if (
+                change.get("removed")
+                or "file" not in change
+            ):
+                _remove_file(
+                    index,
+                    change["fileId"]
+                )
+            else:
+                _add_file(
+                    index,
+                    change["file"]
+                )
+        if "newStartPageToken" in response:
+            index["page_token"] = response["newStartPageToken"]
+            break
+        page_token = response.get("nextPageToken")
+    index["synced"] = time()
+    if changed:
+        _save_index(index)
+
+
+def _authorize(use_sa):
+    drive = GoogleDriveHelper()
+    drive.use_sa = use_sa
+    drive.service = drive.authorize()
+    return drive
+
+
+def _build_index(dir_id, use_sa):
+    drive = None
+    try:
+        drive = _authorize(use_sa)
+        index = _new_index(dir_id)
+        index["page_token"] = _start_page_token(
+            drive.service,
+            dir_id
+        )
+        for file in _list_all(
+            drive.service,
+            dir_id
+        ):
+            _add_file(
+                index,
+                file
+            )
+        _sync_changes(
+            drive.service,
+            index
+        )
+        _save_index(index)
+        index["ready"] = True
+        with index_lock:
+            drive_indexes[dir_id] = index
+        LOGGER.info(f"Drive index built for {dir_id}: {len(index['files'])} items")
+    except Exception as e:
+        LOGGER.error(f"Drive index build failed for {dir_id}: {e}")
+        with index_lock:
+            index = drive_indexes[dir_id]
+            index["building"] = False
+            index["failures"] += 1
+            # don't crawl the whole drive again on every search while it keeps failing
+            index["retry_at"] = time() + min(
+                config_dict["GDRIVE_INDEX_INTERVAL"] * 2 ** index["failures"],
+                INDEX_RETRY_MAX
+            )
+    finally:
+        if drive is not None:
+            drive.release()
+
+
+def _get_index(dir_id, use_sa):
+    with index_lock:
+        if (index := drive_indexes.get(dir_id)) is None:
+            index = _load_index(dir_id)
+            drive_indexes[dir_id] = index
+        if (
+            not index["ready"]
+            and not index["building"]
+            and time() >= index["retry_at"]
+        ):
+            index["building"] = True
+            index_builder.submit(
+                _build_index,
+                dir_id,
+                use_sa
+            )
+    return index
+
+
+def _has_prefix(tokens, term):
+    return any(
+        token.startswith(term)
+        for token
+        in tokens
+    )
+
+
+def _match(index, file_name, exact, item_type):
+    if exact:
+        ids = index["names"].get(
+            file_name,
+            ()
+        )
+    else:
+        terms = [
+            term
+            for word
+            in file_name.split()
+            for term
+            in TOKEN_PATTERN.findall(word.lower())
+        ]
+        ids = [
+            file_id
+            for (
+                file_id,
+                tokens
+            ) in index["tokens"].items()
+            if all(
+                _has_prefix(
+                    tokens,
+                    term
+                )
+                for term
+                in terms
+            )
+        ]
+    files = [
+        index["files"][file_id]
+        for file_id
+        in ids
+    ]
+    if item_type == "files":
+        files = [
+            file
+            for file
+            in files
+            if file["mimeType"] != FOLDER_MIME_TYPE
+        ]
+    elif item_type == "folders":
+        files = [
+            file
+            for file
+            in files
+            if file["mimeType"] == FOLDER_MIME_TYPE
+        ]
+    files.sort(key=lambda file: (
+        file["mimeType"] != FOLDER_MIME_TYPE,
+        file["name"]
+    ))
+    return files[:INDEX_RESULTS]
+
+
+def search_index(dir_id, file_name, exact, item_type, use_sa):
+    interval = config_dict["GDRIVE_INDEX_INTERVAL"]
+    if (
+        not interval
+        or dir_id not in drives_ids
+    ):
+        return None
+    index = _get_index(
+        dir_id,
+        use_sa
+    )
+    if not index["ready"]:
+        return None
+    with index["lock"]:
+        if time() - index["synced"] > interval:
+            drive = None
+            try:
+                drive = _authorize(use_sa)
+                _sync_changes(
+                    drive.service,
+                    index
+                )
+            except Exception as e:
+                LOGGER.error(f"Drive index sync failed for {dir_id}: {e}")
+                if (
+                    isinstance(
+                        e,
+                        HttpError
+                    )
+                    and e.resp.status in [
+                        400,
+                        404,
+                        410
+                    ]
+                ):
+                    index["ready"] = False
+                return None
+            finally:
+                if drive is not None:
+                    drive.release()
+        return {
+            "files": _match(
+                index,
+                file_name,
+                exact,
+                item_type
+            )
+        }
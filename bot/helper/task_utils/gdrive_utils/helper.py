@@ -1,18 +1,18 @@
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-from google_auth_httplib2 import AuthorizedHttp
-from googleapiclient.http import build_http
+from concurrent.futures import (
+    ThreadPoolExecutor,
+    as_completed
+)
+from copy import copy
 from logging import (
     ERROR,
     getLogger
 )
-from os import (
-    listdir,
-    path as ospath
-)
-from pickle import load as pload
-from random import randrange
+from os import path as ospath
 from re import search as re_search
+from threading import (
+    Lock,
+    local
+)
 from tenacity import (
     retry,
     retry_if_exception_type,
@@ -26,15 +26,27 @@ from urllib.parse import (
 
 from bot import config_dict
 from ...ext_utils.links_utils import is_gdrive_id
+from ...ext_utils.parsers import get_error_reason
+from .service_pool import (
+    QUOTA_COOLDOWN,
+    RATE_COOLDOWN,
+    build_service,
+    checkin_service,
+    checkout_service,
+    get_sa_files,
+    mark_exhausted,
+    pick_service_account
+)
 
 LOGGER = getLogger(__name__)
 getLogger("googleapiclient.discovery").setLevel(ERROR)
 
+BATCH_SIZE = 100
+
 
 class GoogleDriveHelper:
 
     def __init__(self):
-        self._OAUTH_SCOPE = ["https://www.googleapis.com/auth/drive"]
         self.token_path = "token.pickle"
         self.G_DRIVE_DIR_MIME_TYPE = "application/vnd.google-apps.folder"
         self.G_DRIVE_BASE_DOWNLOAD_URL = "https://drive.google.com/uc?id={}&export=download"
@@ -42,19 +54,24 @@ class GoogleDriveHelper:
         self.is_uploading = False
         self.is_downloading = False
         self.is_cloning = False
-        self.sa_index = 0
         self.sa_count = 1
         self.sa_number = 100
         self.alt_auth = False
         self.service = None
+        self._service_key = None
+        self._service_mtime = None
         self.total_files = 0
         self.total_folders = 0
-        self.file_processed_bytes = 0
         self.proc_bytes = 0
         self.total_time = 0
-        self.status = None
         self.update_interval = 3
         self.use_sa = config_dict["USE_SERVICE_ACCOUNTS"]
+        self._lock = Lock()
+        self._owner = None
+        self._workers = local()
+        self._pool = None
+        self._futures = []
+        self._error = None
 
     @property
     def speed(self):
@@ -68,55 +85,179 @@ class GoogleDriveHelper:
         return self.proc_bytes
 
     async def progress(self):
-        if self.status is not None:
-            chunk_size = (
-                self.status.total_size * self.status.progress()
-                - self.file_processed_bytes
+        self.total_time += self.update_interval
+
+    def _add_progress(self, size, files=0):
+        owner = self._owner or self
+        with self._lock:
+            owner.proc_bytes += size
+            owner.total_files += files
+
+    def _start_pool(self):
+        self._workers = local()
+        self._futures = []
+        self._error = None
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(
+                config_dict["GDRIVE_WORKERS"],
+                1
+            )
+        )
+
+    def _submit(self, method, *args):
+        self._futures.append(
+            self._pool.submit( # type: ignore
+                self._run_job,
+                method,
+                *args
+            )
+        )
+
+    def _wait_pool(self):
+        for future in as_completed(self._futures):
+            future.result()
+
+    def _stop_pool(self):
+        if self._pool is not None:
+            self._pool.shutdown(
+                wait=True,
+                cancel_futures=True
+            )
+        self._workers = local()
+
+    def _get_worker(self):
+        if (worker := getattr(
+            self._workers,
+            "drive",
+            None
+        )) is None:
+            worker = copy(self)
+            worker._owner = self
+            worker.service = None
+            worker._service_key = None
+            worker.service = worker.authorize()
+            self._workers.drive = worker
+        return worker
+
+    def _run_job(self, method, *args):
+        if (
+            self.listener.is_cancelled # type: ignore
+            or self._error is not None
+        ):
+            return
+        try:
+            getattr(
+                self._get_worker(),
+                method
+            )(*args)
+        except Exception as e:
+            with self._lock:
+                if self._error is None:
+                    self._error = e
+            raise
+
+    def _switch_on_quota(self, err, reasons):
+        if not err.resp.get(
+            "content-type",
+            ""
+        ).startswith("application/json"):
+            raise err
+        reason = get_error_reason(err.content)
+        if reason not in reasons:
+            raise err
+        if not self.use_sa:
+            LOGGER.error(f"Got: {reason}")
+            raise err
+        if self.sa_count >= self.sa_number:
+            LOGGER.info(
+                f"Reached maximum number of service accounts switching, which is {self.sa_count}"
             )
-            self.file_processed_bytes = self.status.total_size * self.status.progress()
-            self.proc_bytes += chunk_size
-            self.total_time += self.update_interval
+            raise err
+        self.switch_service_account(
+            RATE_COOLDOWN
+            if reason == "userRateLimitExceeded"
+            else QUOTA_COOLDOWN
+        )
+        LOGGER.info(f"Got: {reason}, Trying Again...")
+
+    def execute_batch(self, requests):
+        results = {}
+
+        def _callback(request_id, response, exception):
+            results[request_id] = (
+                response,
+                exception
+            )
+
+        for i in range(
+            0,
+            len(requests),
+            BATCH_SIZE
+        ):
+            batch = self.service.new_batch_http_request(callback=_callback) # type: ignore
+            for (
+                request_id,
+                request
+            ) in requests[i : i + BATCH_SIZE]:
+                batch.add(
+                    request,
+                    request_id=request_id
+                )
+            batch.execute()
+        return results
 
     def authorize(self):
-        credentials = None
+        exclude = (
+            ospath.basename(self._service_key)
+            if self._service_key is not None
+            else None
+        )
+        self.release()
         if self.use_sa:
-            json_files = listdir("accounts")
-            self.sa_number = len(json_files)
-            self.sa_index = randrange(self.sa_number)
-            LOGGER.info(f"Authorizing with {json_files[self.sa_index]} service account")
-            credentials = service_account.Credentials.from_service_account_file(
-                f"accounts/{json_files[self.sa_index]}",
-                scopes=self._OAUTH_SCOPE
-            )
+            self.sa_number = len(get_sa_files())
+            sa_file = pick_service_account(exclude)
+            LOGGER.info(f"Authorizing with {sa_file} service account")
+            self._service_key = f"accounts/{sa_file}"
         elif ospath.exists(self.token_path):
             LOGGER.info(f"Authorize with {self.token_path}")
-            with open(
-                self.token_path,
-                "rb"
-            ) as f:
-                credentials = pload(f)
+            self._service_key = self.token_path
         else:
             LOGGER.error("token.pickle not found!")
-        authorized_http = AuthorizedHttp(
-            credentials,
-            http=build_http()
-        )
-        authorized_http.http.disable_ssl_certificate_validation = True
-        return build(
-            "drive",
-            "v3",
-            http=authorized_http,
-            cache_discovery=False
-        )
+            return build_service(None)
+        (
+            service,
+            self._service_mtime
+        ) = checkout_service(self._service_key)
+        return service
 
-    def switch_service_account(self):
-        if self.sa_index == self.sa_number - 1:
-            self.sa_index = 0
-        else:
-            self.sa_index += 1
+    def release(self):
+        if (
+            self.service is not None
+            and self._service_key is not None
+        ):
+            checkin_service(
+                self._service_key,
+                self._service_mtime,
+                self.service
+            )
+        self.service = None
+        self._service_key = None
+
+    def __del__(self):
+        try:
+            self.release()
+        except:
+            pass
+
+    def switch_service_account(self, cooldown=QUOTA_COOLDOWN):
+        if self._service_key is not None:
+            mark_exhausted(
+                self._service_key,
+                cooldown
+            )
         self.sa_count += 1
-        LOGGER.info(f"Switching to {self.sa_index} index")
         self.service = self.authorize()
+        LOGGER.info(f"Switching to {self._service_key}")
 
     def get_id_from_url(self, link, user_id=""):
         if (
@@ -171,6 +312,9 @@ class GoogleDriveHelper:
         retry=retry_if_exception_type(Exception),
     )
     def set_permission(self, file_id):
+        return self._permission_request(file_id).execute()
+
+    def _permission_request(self, file_id):
         permissions = {
             "role": "reader",
             "type": "anyone",
@@ -184,9 +328,24 @@ class GoogleDriveHelper:
                 body=permissions,
                 supportsAllDrives=True
             )
-            .execute()
         )
 
+    def set_permissions(self, file_ids):
+        results = self.execute_batch([
+            (
+                file_id,
+                self._permission_request(file_id)
+            )
+            for file_id
+            in file_ids
+        ])
+        for file_id in file_ids:
+            if (
+                file_id not in results
+                or results[file_id][1] is not None
+            ):
+                self.set_permission(file_id)
+
     @retry(
         wait=wait_exponential(
             multiplier=2,
@@ -256,6 +415,17 @@ class GoogleDriveHelper:
         retry=retry_if_exception_type(Exception),
     )
     def create_directory(self, directory_name, dest_id):
+        file = self._directory_request(
+            directory_name,
+            dest_id
+        ).execute()
+        file_id = file.get("id")
+        if not config_dict["IS_TEAM_DRIVE"]:
+            self.set_permission(file_id)
+        LOGGER.info(f'Created G-Drive Folder:\nName: {file.get("name")}\nID: {file_id}')
+        return file_id
+
+    def _directory_request(self, directory_name, dest_id):
         file_metadata = {
             "name": directory_name,
             "description": f"Uploaded using Zee by {self.listener.tag}, ID: {self.listener.message.from_user.id}", # type: ignore
@@ -263,19 +433,59 @@ class GoogleDriveHelper:
         }
         if dest_id is not None:
             file_metadata["parents"] = [dest_id]
-        file = (
+        return (
             self.service.files() # type: ignore
             .create(
                 body=file_metadata,
                 supportsAllDrives=True
             )
-            .execute()
         )
-        file_id = file.get("id")
-        if not config_dict["IS_TEAM_DRIVE"]:
-            self.set_permission(file_id)
-        LOGGER.info(f'Created G-Drive Folder:\nName: {file.get("name")}\nID: {file_id}')
-        return file_id
+
+    def create_directories(self, folders):
+        results = self.execute_batch([
+            (
+                f"{index}",
+                self._directory_request(
+                    directory_name,
+                    dest_id
+                )
+            )
+            for (
+                index,
+                (
+                    directory_name,
+                    dest_id
+                )
+            ) in enumerate(folders)
+        ])
+        folder_ids = []
+        created = []
+        for (
+            index,
+            (
+                directory_name,
+                dest_id
+            )
+        ) in enumerate(folders):
+            (
+                response,
+                exception
+            ) = results.get(
+                f"{index}",
+                (None, None)
+            )
+            if response is None or exception is not None:
+                folder_ids.append(self.create_directory(
+                    directory_name,
+                    dest_id
+                ))
+            else:
+                folder_ids.append(response["id"])
+                created.append(response["id"])
+        if created and not config_dict["IS_TEAM_DRIVE"]:
+            self.set_permissions(created)
+        LOGGER.info(f"Created {len(folders)} G-Drive Folders")
+        return folder_ids
 
     def escapes(self, estr):
         chars = [
@@ -1,6 +1,7 @@
 from aiofiles.os import path as aiopath
 from asyncio import (
     Event,
+    Lock,
     gather,
     wait_for
 )
@@ -18,9 +19,14 @@ from time import time
 from bot import config_dict
 from ...ext_utils.bot_utils import (
     new_task,
+    sync_to_async,
     update_user_ldata
 )
 from ...ext_utils.db_handler import database
+from ...ext_utils.list_cache import (
+    get_listing,
+    prefetch_listings
+)
 from ...ext_utils.status_utils import (
     get_readable_file_size,
     get_readable_time
@@ -166,6 +172,9 @@ class GoogleDriveList(GoogleDriveHelper):
         self.iter_start = 0
         self.page_step = 1
         super().__init__()
+        self._list_lock = Lock()
+        self._prefetch_lock = Lock()
+        self._prefetcher = None
 
     async def _event_handler(self):
         pfunc = partial(id_updates, obj=self)
@@ -218,6 +227,16 @@ class GoogleDriveList(GoogleDriveHelper):
             self.iter_start = 0
         elif self.iter_start < 0 or self.iter_start > items_no:
             self.iter_start = LIST_LIMIT * (pages - 1)
+        prefetch_listings(
+            self._list_job(
+                item["id"],
+                self.item_type,
+                True
+            )
+            for item
+            in self.items_list[self.iter_start : LIST_LIMIT + self.iter_start]
+            if item["mimeType"] == self.G_DRIVE_DIR_MIME_TYPE
+        )
         page = (
             (self.iter_start / LIST_LIMIT) + 1
             if self.iter_start != 0
@@ -342,16 +361,78 @@ class GoogleDriveList(GoogleDriveHelper):
             button
         )
 
+    def _prefetch_files(self, token_path, folder_id, item_type):
+        # prefetches get their own service so they never hold _list_lock
+        helper = self._prefetcher
+        if (
+            helper is None
+            or helper.token_path != token_path
+        ):
+            if helper is not None:
+                helper.release()
+            helper = self._prefetcher = GoogleDriveHelper()
+            helper.token_path = token_path
+            helper.use_sa = self.use_sa
+            helper.service = helper.authorize()
+        return helper.get_files_by_folder_id(
+            folder_id,
+            item_type
+        )
+
+    async def _fetch_items(self, token_path, folder_id, item_type, prefetch=False):
+        async with (
+            self._prefetch_lock
+            if prefetch
+            else self._list_lock
+        ):
+            if token_path != self.token_path:
+                raise ValueError("Drive token changed while listing!")
+            if prefetch:
+                return await sync_to_async(
+                    self._prefetch_files,
+                    token_path,
+                    folder_id,
+                    item_type
+                )
+            return await sync_to_async(
+                self.get_files_by_folder_id,
+                folder_id,
+                item_type
+            )
+
+    async def _close_prefetcher(self):
+        async with self._prefetch_lock:
+            if self._prefetcher is not None:
+                self._prefetcher.release()
+                self._prefetcher = None
+
+    def _list_job(self, folder_id, item_type, prefetch=False):
+        return (
+            (
+                "gdrive",
+                folder_id,
+                self.token_path,
+                item_type
+            ),
+            partial(
+                self._fetch_items,
+                self.token_path,
+                folder_id,
+                item_type,
+                prefetch
+            )
+        )
+
     async def get_items(self, itype=""):
         if itype:
             self.item_type == itype # type: ignore
         elif self.list_status == "gdu":
             self.item_type == "folders" # type: ignore
         try:
-            files = self.get_files_by_folder_id(
+            files = await get_listing(*self._list_job(
                 self.id,
                 self.item_type
-            )
+            ))
             if self.listener.is_cancelled:
                 return
         except Exception as err:
@@ -387,7 +468,8 @@ class GoogleDriveList(GoogleDriveHelper):
         await self.get_items_buttons()
 
     async def list_drives(self):
-        self.service = self.authorize()
+        async with self._list_lock:
+            self.service = self.authorize()
         try:
             result = self.service.drives().list(pageSize="100").execute()
         except Exception as e:
@@ -592,6 +674,7 @@ class GoogleDriveList(GoogleDriveHelper):
             self.use_sa = self.token_path == "accounts"
             await self.list_drives()
         await self._event_handler()
+        await self._close_prefetcher()
         if self._reply_to:
             await delete_message(self._reply_to)
         if not self.listener.is_cancelled:
@@ -8,6 +8,7 @@ from bot import (
     user_data
 )
 from ...ext_utils.status_utils import get_readable_file_size
+from ...task_utils.gdrive_utils.drive_index import search_index
 from ...task_utils.gdrive_utils.helper import GoogleDriveHelper
 
 LOGGER = getLogger(__name__)
@@ -113,7 +114,8 @@ class GoogleDriveSearch(GoogleDriveHelper):
 
     def drive_list(self, file_name, target_id="", user_id=""):
         msg = f"""<figure><img src='{config_dict["COVER_IMAGES"]}'></figure>"""
-        file_name = self.escapes(str(file_name))
+        name = str(file_name).strip()
+        file_name = self.escapes(name)
         contents_no = 0
         telegraph_content = []
         Title = False
@@ -162,11 +164,24 @@ class GoogleDriveSearch(GoogleDriveHelper):
                 if self._is_recursive and len(dir_id) > 23
                 else self._is_recursive
             )
-            response = self._drive_query(
-                dir_id,
-                file_name,
+            response = None
+            if (
                 isRecur
-            )
+                and not target_id.startswith("mtp:")
+            ):
+                response = search_index(
+                    dir_id,
+                    name,
+                    self._stop_dup,
+                    self._item_type,
+                    self.use_sa
+                )
+            if response is None:
+                response = self._drive_query(
+                    dir_id,
+                    file_name,
+                    isRecur
+                )
             if not response["files"]:
                 if self._no_multi:
                     break
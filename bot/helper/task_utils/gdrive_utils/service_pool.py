@@ -0,0 +1,165 @@
+from google.oauth2 import service_account
+from googleapiclient.discovery import build
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.http import build_http
+from os import (
+    listdir,
+    path as ospath
+)
+from pickle import load as pload
+from random import random
+from threading import Lock
+from time import time
+
+OAUTH_SCOPE = ["https://www.googleapis.com/auth/drive"]
+MAX_IDLE_SERVICES = 8
+QUOTA_COOLDOWN = 3600
+RATE_COOLDOWN = 60
+
+drive_clients = {}
+sa_files = {
+    "mtime": None,
+    "files": []
+}
+pool_lock = Lock()
+
+
+def build_service(credentials):
+    authorized_http = AuthorizedHttp(
+        credentials,
+        http=build_http()
+    )
+    authorized_http.http.disable_ssl_certificate_validation = True
+    return build(
+        "drive",
+        "v3",
+        http=authorized_http,
+        cache_discovery=False
+    )
+
+
+def _load_credentials(key):
+    if key.endswith(".json"):
+        return service_account.Credentials.from_service_account_file(
+            key,
+            scopes=OAUTH_SCOPE
+        )
+    with open(
+        key,
+        "rb"
+    ) as f:
+        return pload(f)
+
+
+def _get_client(key):
+    mtime = ospath.getmtime(key)
+    client = drive_clients.get(key)
+    if (
+        client is None
+        or client["mtime"] != mtime
+    ):
+        client = {
+            "mtime": mtime,
+            "credentials": None,
+            "idle": [],
+            "busy": 0,
+            "cooldown": 0,
+        }
+        drive_clients[key] = client
+    return client
+
+
+def checkout_service(key):
+    with pool_lock:
+        client = _get_client(key)
+        client["busy"] += 1
+        if client["idle"]:
+            return (
+                client["idle"].pop(),
+                client["mtime"]
+            )
+        try:
+            if client["credentials"] is None:
+                client["credentials"] = _load_credentials(key)
+        except:
+            client["busy"] -= 1
+            raise
+        credentials = client["credentials"]
+        mtime = client["mtime"]
+    try:
+        return (
+            build_service(credentials),
+            mtime
+        )
+    except:
+        with pool_lock:
+            client["busy"] -= 1
+        raise
+
+
+def checkin_service(key, mtime, service):
+    with pool_lock:
+        if (client := drive_clients.get(key)) is None:
+            return
+        if client["mtime"] != mtime:
+            return
+        client["busy"] = max(
+            client["busy"] - 1,
+            0
+        )
+        if len(client["idle"]) < MAX_IDLE_SERVICES:
+            client["idle"].append(service)
+
+
+def get_sa_files():
+    mtime = ospath.getmtime("accounts")
+    with pool_lock:
+        if sa_files["mtime"] != mtime:
+            sa_files["files"] = sorted(
+                file
+                for file
+                in listdir("accounts")
+                if file.endswith(".json")
+            )
+            sa_files["mtime"] = mtime
+        return sa_files["files"]
+
+
+def pick_service_account(exclude=None):
+    files = get_sa_files()
+    now = time()
+    candidates = [
+        file
+        for file
+        in files
+        if file != exclude
+    ] or files
+
+    def _health(file):
+        client = drive_clients.get(f"accounts/{file}")
+        if client is None:
+            return (
+                False,
+                0,
+                0,
+                random()
+            )
+        cooling = client["cooldown"] > now
+        return (
+            cooling,
+            client["cooldown"] if cooling else 0,
+            client["busy"],
+            random()
+        )
+
+    with pool_lock:
+        return min(
+            candidates,
+            key=_health
+        )
+
+
+def mark_exhausted(key, cooldown):
+    with pool_lock:
+        if (client := drive_clients.get(key)) is not None:
+            client["cooldown"] = time() + cooldown
@@ -4,7 +4,8 @@ from logging import getLogger
 from os import (
     path as ospath,
     listdir,
-    remove
+    remove,
+    walk
 )
 from tenacity import (
     retry,
@@ -24,6 +25,12 @@ from ...task_utils.gdrive_utils.helper import GoogleDriveHelper
 
 LOGGER = getLogger(__name__)
 
+RESUMABLE_THRESHOLD = 5 * 1024 * 1024
+UPLOAD_QUOTA_REASONS = [
+    "userRateLimitExceeded",
+    "dailyLimitExceeded",
+]
+
 
 class GoogleDriveUpload(GoogleDriveHelper):
 
@@ -153,52 +160,104 @@ class GoogleDriveUpload(GoogleDriveHelper):
             )
 
     def _upload_dir(self, input_directory, dest_id, unwanted_files, ft_delete):
-        list_dirs = listdir(input_directory)
-        if len(list_dirs) == 0:
-            return dest_id
-        new_id = None
-        for item in list_dirs:
-            current_file_name = ospath.join(
-                input_directory,
-                item
-            )
-            if ospath.isdir(current_file_name):
-                current_dir_id = self.create_directory(
-                    item,
-                    dest_id
-                )
-                new_id = self._upload_dir(
-                    current_file_name,
-                    current_dir_id,
-                    unwanted_files,
-                    ft_delete
-                )
-                self.total_folders += 1
-            elif (
-                current_file_name not in unwanted_files
-                and not item.lower().endswith(tuple(self.listener.extension_filter))
-            ):
-                mime_type = get_mime_type(current_file_name)
-                file_name = current_file_name.split("/")[-1]
-                self._upload_file(
-                    current_file_name,
-                    file_name,
-                    mime_type,
-                    dest_id,
-                    ft_delete
-                )
-                self.total_files += 1
-                new_id = dest_id
-            else:
+        folder_ids = self._create_tree(
+            input_directory,
+            dest_id
+        )
+        if self.listener.is_cancelled:
+            return None
+        self._start_pool()
+        try:
+            for (
+                dirpath,
+                _,
+                files
+            ) in walk(input_directory):
+                for item in files:
+                    current_file_name = ospath.join(
+                        dirpath,
+                        item
+                    )
+                    if (
+                        current_file_name not in unwanted_files
+                        and not item.lower().endswith(tuple(self.listener.extension_filter))
+                    ):
+                        self._submit(
+                            "_upload_job",
+                            current_file_name,
+                            item,
+                            folder_ids[dirpath],
+                            ft_delete
+                        )
+                    elif (
+                        not self.listener.seed
+                        or self.listener.new_dir
+                    ):
+                        remove(current_file_name)
                 if (
-                    not self.listener.seed
-                    or self.listener.new_dir
+                    self.listener.is_cancelled
+                    or self._error is not None
                 ):
-                    remove(current_file_name)
-                new_id = "filter"
-            if self.listener.is_cancelled:
+                    break
+            self._wait_pool()
+        finally:
+            self._stop_pool()
+        if self.listener.is_cancelled:
+            return None
+        return dest_id
+
+    def _create_tree(self, input_directory, dest_id):
+        folder_ids = {input_directory: dest_id}
+        level = [input_directory]
+        while level and not self.listener.is_cancelled:
+            folders = [
+                ospath.join(
+                    dirpath,
+                    item
+                )
+                for dirpath
+                in level
+                for item
+                in sorted(listdir(dirpath))
+                if ospath.isdir(ospath.join(
+                    dirpath,
+                    item
+                ))
+            ]
+            if not folders:
                 break
-        return new_id
+            for (
+                folder,
+                folder_id
+            ) in zip(
+                folders,
+                self.create_directories([
+                    (
+                        ospath.basename(folder),
+                        folder_ids[ospath.dirname(folder)]
+                    )
+                    for folder
+                    in folders
+                ])
+            ):
+                folder_ids[folder] = folder_id
+            self.total_folders += len(folders)
+            level = folders
+        return folder_ids
+
+    def _upload_job(self, file_path, file_name, dest_id, ft_delete):
+        self._upload_file(
+            file_path,
+            file_name,
+            get_mime_type(file_path),
+            dest_id,
+            ft_delete
+        )
+        if not self.listener.is_cancelled:
+            self._add_progress(
+                0,
+                1
+            )
 
     @retry(
         wait=wait_exponential(
@@ -227,49 +286,23 @@ class GoogleDriveUpload(GoogleDriveHelper):
         if dest_id is not None:
             file_metadata["parents"] = [dest_id]
 
-        if ospath.getsize(file_path) == 0:
+        size = ospath.getsize(file_path)
+        if size < RESUMABLE_THRESHOLD:
             media_body = MediaFileUpload(
                 file_path,
                 mimetype=mime_type,
                 resumable=False
             )
-            response = (
-                self.service.files()
-                .create(
-                    body=file_metadata,
-                    media_body=media_body,
-                    supportsAllDrives=True
-                )
-                .execute()
-            )
-            if not config_dict["IS_TEAM_DRIVE"]:
-                self.set_permission(response["id"])
-
-            drive_file = (
-                self.service.files()
-                .get(
-                    fileId=response["id"],
-                    supportsAllDrives=True
-                )
-                .execute()
-            )
-            return self.G_DRIVE_BASE_DOWNLOAD_URL.format(drive_file.get("id"))
-        media_body = MediaFileUpload(
-            file_path,
-            mimetype=mime_type,
-            resumable=True,
-            chunksize=100 * 1024 * 1024
-        )
-
-        # Insert a file
-        drive_file = self.service.files().create(
-            body=file_metadata, media_body=media_body, supportsAllDrives=True
-        )
-        response = None
-        retries = 0
-        while response is None and not self.listener.is_cancelled:
             try:
-                self.status, response = drive_file.next_chunk()
+                response = (
+                    self.service.files()
+                    .create(
+                        body=file_metadata,
+                        media_body=media_body,
+                        supportsAllDrives=True
+                    )
+                    .execute()
+                )
             except HttpError as err:
                 if err.resp.status in [
                     500,
@@ -277,43 +310,41 @@ class GoogleDriveUpload(GoogleDriveHelper):
                     503,
                     504,
                     429
-                ] and retries < 10:
-                    retries += 1
-                    continue
-                if err.resp.get(
-                    "content-type",
-                    ""
-                ).startswith("application/json"):
-                    reason = (
-                        eval(err.content).get("error").get("errors")[0].get("reason")
-                    )
-                    if reason not in [
-                        "userRateLimitExceeded",
-                        "dailyLimitExceeded",
-                    ]:
-                        raise err
-                    if self.use_sa:
-                        if self.sa_count >= self.sa_number:
-                            LOGGER.info(
-                                f"Reached maximum number of service accounts switching, which is {self.sa_count}"
-                            )
-                            raise err
-                        else:
-                            if self.listener.is_cancelled:
-                                return
-                            self.switch_service_account()
-                            LOGGER.info(f"Got: {reason}, Trying Again.")
-                            return self._upload_file(
-                                file_path,
-                                file_name,
-                                mime_type,
-                                dest_id,
-                                ft_delete,
-                                in_dir,
-                            )
-                    else:
-                        LOGGER.error(f"Got: {reason}")
-                        raise err
+                ]:
+                    raise err
+                if self.listener.is_cancelled:
+                    return
+                self._switch_on_quota(
+                    err,
+                    UPLOAD_QUOTA_REASONS
+                )
+                return self._upload_file(
+                    file_path,
+                    file_name,
+                    mime_type,
+                    dest_id,
+                    ft_delete,
+                    in_dir,
+                )
+            self._add_progress(size)
+        else:
+            response = self._upload_resumable(
+                file_path,
+                file_metadata,
+                mime_type,
+                size
+            )
+            if response is None:
+                if self.listener.is_cancelled:
+                    return
+                return self._upload_file(
+                    file_path,
+                    file_name,
+                    mime_type,
+                    dest_id,
+                    ft_delete,
+                    in_dir,
+                )
         if self.listener.is_cancelled:
             return
         if (
@@ -325,7 +356,6 @@ class GoogleDriveUpload(GoogleDriveHelper):
                 remove(file_path)
             except:
                 pass
-        self.file_processed_bytes = 0
         # Insert new permissions
         if not config_dict["IS_TEAM_DRIVE"]:
             self.set_permission(response["id"]) # type: ignore
@@ -341,3 +371,55 @@ class GoogleDriveUpload(GoogleDriveHelper):
             )
             return self.G_DRIVE_BASE_DOWNLOAD_URL.format(drive_file.get("id"))
         return
+
+    def _upload_resumable(self, file_path, file_metadata, mime_type, size):
+        media_body = MediaFileUpload(
+            file_path,
+            mimetype=mime_type,
+            resumable=True,
+            chunksize=100 * 1024 * 1024
+        )
+
+        # Insert a file
+        drive_file = self.service.files().create(
+            body=file_metadata, media_body=media_body, supportsAllDrives=True
+        )
+        response = None
+        retries = 0
+        uploaded = 0
+        try:
+            while response is None and not self.listener.is_cancelled:
+                try:
+                    (
+                        status,
+                        response
+                    ) = drive_file.next_chunk()
+                except HttpError as err:
+                    if err.resp.status in [
+                        500,
+                        502,
+                        503,
+                        504,
+                        429
+                    ] and retries < 10:
+                        retries += 1
+                        continue
+                    if self.listener.is_cancelled:
+                        break
+                    self._switch_on_quota(
+                        err,
+                        UPLOAD_QUOTA_REASONS
+                    )
+                    self._add_progress(-uploaded)
+                    return None
+                done = (
+                    size
+                    if response is not None
+                    else status.resumable_progress
+                )
+                self._add_progress(done - uploaded)
+                uploaded = done
+        except:
+            self._add_progress(-uploaded)
+            raise
+        return response
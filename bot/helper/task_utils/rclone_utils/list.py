@@ -8,7 +8,6 @@ from asyncio import (
 )
 from configparser import ConfigParser
 from functools import partial
-from json import loads
 from nekozee.filters import (
     regex,
     user
@@ -18,16 +17,18 @@ from time import time
 
 from bot import (
     LOGGER,
-    config_dict,
-    pkg_info
+    config_dict
 )
 from ...ext_utils.bot_utils import (
-    cmd_exec,
     loop_thread,
     new_task,
     update_user_ldata,
 )
 from ...ext_utils.db_handler import database
+from ...ext_utils.list_cache import (
+    get_listing,
+    prefetch_listings
+)
 from ...ext_utils.status_utils import (
     get_readable_file_size,
     get_readable_time
@@ -39,8 +40,16 @@ from ...telegram_helper.message_utils import (
     delete_message,
     auto_delete_message,
 )
+from .rcd import (
+    RcloneRcError,
+    rclone_list
+)
 
 LIST_LIMIT = 6
+LIST_OPTIONS = {
+    "--dirs-only": {"dirsOnly": True},
+    "--files-only": {"filesOnly": True},
+}
 
 
 @new_task
@@ -234,6 +243,19 @@ class RcloneList:
             self.iter_start = 0
         elif self.iter_start < 0 or self.iter_start > items_no:
             self.iter_start = LIST_LIMIT * (pages - 1)
+        prefetch_listings(
+            self._list_job(
+                (
+                    f"{self.path}/{idict['Path']}"
+                    if self.path
+                    else idict["Path"]
+                ),
+                self.item_type
+            )
+            for idict
+            in self.path_list[self.iter_start : LIST_LIMIT + self.iter_start]
+            if idict["IsDir"]
+        )
         page = (
             (self.iter_start / LIST_LIMIT) + 1
             if self.iter_start != 0
@@ -372,40 +394,48 @@ class RcloneList:
         msg += f"\nTimeout: {get_readable_time(self._timeout - (time() - self._time))}" # type: ignore
         await self._send_list_message(msg, button)
 
+    def _list_job(self, path, item_type):
+        return (
+            (
+                "rclone",
+                self.config_path,
+                self.remote,
+                path,
+                item_type
+            ),
+            partial(
+                rclone_list,
+                self.config_path,
+                self.remote.rstrip(":"),
+                path,
+                LIST_OPTIONS.get(
+                    item_type,
+                    {}
+                )
+            )
+        )
+
     async def get_path(self, itype=""):
         if itype:
             self.item_type == itype # type: ignore
         elif self.list_status == "rcu":
             self.item_type == "--dirs-only" # type: ignore
-        cmd = [
-            pkg_info["pkgs"][3],
-            "lsjson",
-            self.item_type,
-            "--fast-list",
-            "--no-mimetype",
-            "--no-modtime",
-            "--config",
-            self.config_path,
-            f"{self.remote}{self.path}",
-        ]
         if self.listener.is_cancelled:
             return
-        (
-            res,
-            err,
-            code
-        ) = await cmd_exec(cmd)
-        if code not in [0, -9]:
-            if not err:
-                err = "Use <code>/shell cat rlog.txt</code> to see more information"
+        try:
+            result = await get_listing(*self._list_job(
+                self.path,
+                self.item_type
+            ))
+        except RcloneRcError as err:
+            err = str(err)
             LOGGER.error(
-                f"While rclone listing. Path: {self.remote}{self.path}. Stderr: {err}"
+                f"While rclone listing. Path: {self.remote}{self.path}. Error: {err}"
             )
             self.remote = err[:4000]
             self.path = ""
             self.event.set()
             return
-        result = loads(res)
         if (
             len(result) == 0
             and itype != self.item_type
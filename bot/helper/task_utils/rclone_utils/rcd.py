@@ -0,0 +1,308 @@
+from aiofiles import open as aiopen
+from aiofiles.os import path as aiopath
+from asyncio import (
+    Lock,
+    create_subprocess_exec,
+    sleep
+)
+from asyncio.subprocess import DEVNULL
+from configparser import ConfigParser
+from httpx import AsyncClient
+from io import StringIO
+from logging import getLogger
+from os import environ
+from re import sub as re_sub
+from secrets import token_urlsafe
+from socket import socket
+
+from bot import (
+    config_dict,
+    pkg_info
+)
+
+LOGGER = getLogger(__name__)
+
+RCD_HOST = "127.0.0.1"
+RCD_CONFIG = "rclone_rcd.conf"
+RCD_START_TIMEOUT = 15
+
+rcd_state = {
+    "proc": None,
+    "client": None,
+    "config": ConfigParser(interpolation=None),
+}
+rcd_configs = {}
+rcd_lock = Lock()
+
+
+class RcloneRcError(Exception):
+    pass
+
+
+async def _ping_rcd():
+    try:
+        resp = await rcd_state["client"].post("/rc/noop")
+        return resp.status_code == 200
+    except:
+        return False
+
+
+def _free_port():
+    with socket() as sock:
+        sock.bind((
+            RCD_HOST,
+            0
+        ))
+        return sock.getsockname()[1]
+
+
+async def _start_rcd():
+    if (
+        rcd_state["proc"] is not None
+        and rcd_state["proc"].returncode is None
+    ):
+        return
+    rcd_configs.clear()
+    # never talk to a daemon we did not spawn: fresh port and credentials each start
+    addr = f"{RCD_HOST}:{_free_port()}"
+    user = token_urlsafe(16)
+    password = token_urlsafe(32)
+    if rcd_state["client"] is not None:
+        await rcd_state["client"].aclose()
+    rcd_state["client"] = AsyncClient(
+        base_url=f"http://{addr}",
+        auth=(
+            user,
+            password
+        ),
+        timeout=None
+    )
+    cmd = [
+        pkg_info["pkgs"][3],
+        "rcd",
+        "--rc-addr",
+        addr,
+        "--config",
+        RCD_CONFIG,
+        "--use-json-log",
+    ]
+    if config_dict["RCLONE_DEBUG_LOG"]:
+        cmd.extend((
+            "--log-file",
+            "rlog.txt",
+            "--log-level",
+            "DEBUG"
+        ))
+    rcd_state["proc"] = await create_subprocess_exec(
+        *cmd,
+        stdout=DEVNULL,
+        stderr=DEVNULL,
+        env={
+            **environ,
+            "RCLONE_RC_USER": user,
+            "RCLONE_RC_PASS": password,
+        }
+    )
+    for _ in range(RCD_START_TIMEOUT * 4):
+        if rcd_state["proc"].returncode is not None:
+            break
+        if await _ping_rcd():
+            LOGGER.info("rclone rcd daemon started")
+            return
+        await sleep(0.25)
+    try:
+        rcd_state["proc"].kill()
+    except:
+        pass
+    raise RcloneRcError("rclone rcd daemon failed to start!")
+
+
+async def rcd_available():
+    try:
+        async with rcd_lock:
+            await _start_rcd()
+        return True
+    except RcloneRcError as e:
+        LOGGER.error(e)
+        return False
+
+
+async def rc_call(method, params=None):
+    async with rcd_lock:
+        await _start_rcd()
+    try:
+        resp = await rcd_state["client"].post(
+            f"/{method}",
+            json=params or {}
+        )
+    except Exception as e:
+        raise RcloneRcError(f"rclone rcd is unreachable: {e}")
+    try:
+        data = resp.json()
+    except ValueError:
+        raise RcloneRcError(resp.text)
+    if resp.status_code != 200:
+        raise RcloneRcError(data.get(
+            "error",
+            resp.text
+        ))
+    return data
+
+
+def _rc_prefix(config_path):
+    return re_sub(
+        r"\W",
+        "_",
+        config_path
+    )
+
+
+def _rename_remote(value, names, prefix):
+    (
+        remote,
+        sep,
+        path
+    ) = value.partition(":")
+    if (
+        sep
+        and remote in names
+    ):
+        return f"{prefix}-{remote}:{path}"
+    return value
+
+
+def _rename_upstream(value, names, prefix):
+    (
+        alias,
+        sep,
+        target
+    ) = value.partition("=")
+    if (
+        sep
+        and ":" not in alias
+    ):
+        return f"{alias}={_rename_remote(target, names, prefix)}"
+    return _rename_remote(
+        value,
+        names,
+        prefix
+    )
+
+
+async def _sync_config(config_path):
+    source = ConfigParser(interpolation=None)
+    async with aiopen(
+        config_path,
+        "r"
+    ) as f:
+        source.read_string(await f.read())
+    names = source.sections()
+    prefix = _rc_prefix(config_path)
+    config = rcd_state["config"]
+    for section in config.sections():
+        if section.startswith(f"{prefix}-"):
+            config.remove_section(section)
+    for section in names:
+        name = f"{prefix}-{section}"
+        config.add_section(name)
+        for (
+            key,
+            value
+        ) in source.items(section):
+            if key == "remote":
+                value = _rename_remote(
+                    value,
+                    names,
+                    prefix
+                )
+            elif key == "upstreams":
+                value = " ".join(
+                    _rename_upstream(
+                        item,
+                        names,
+                        prefix
+                    )
+                    for item
+                    in value.split()
+                )
+            config.set(
+                name,
+                key,
+                value
+            )
+    buffer = StringIO()
+    config.write(buffer)
+    async with aiopen(
+        RCD_CONFIG,
+        "w"
+    ) as f:
+        await f.write(buffer.getvalue())
+
+
+async def get_rc_remote(config_path, remote):
+    async with rcd_lock:
+        await _start_rcd()
+        mtime = await aiopath.getmtime(config_path)
+        if rcd_configs.get(config_path) != mtime:
+            await _sync_config(config_path)
+            rcd_configs[config_path] = mtime
+            synced = True
+        else:
+            synced = False
+    if synced:
+        try:
+            await rc_call("fscache/clear")
+        except RcloneRcError:
+            pass
+    return f"{_rc_prefix(config_path)}-{remote}"
+
+
+async def rc_fs(config_path, remote, path, options=None):
+    if remote is None:
+        return path
+    name = await get_rc_remote(
+        config_path,
+        remote
+    )
+    if options:
+        name += "".join(
+            f",{key}={value}"
+            for (
+                key,
+                value
+            ) in options.items()
+        )
+    return f"{name}:{path}"
+
+
+async def rclone_list(config_path, remote, path, opt=None):
+    return (await rc_call(
+        "operations/list",
+        {
+            "fs": await rc_fs(
+                config_path,
+                remote,
+                path
+            ),
+            "remote": "",
+            "opt": {
+                "noMimeType": True,
+                "noModTime": True,
+                **(opt or {}),
+            },
+        }
+    ))["list"]
+
+
+async def rclone_link(config_path, remote, path):
+    return (await rc_call(
+        "operations/publiclink",
+        {
+            "fs": await rc_fs(
+                config_path,
+                remote,
+                ""
+            ),
+            "remote": path,
+        }
+    ))["url"]
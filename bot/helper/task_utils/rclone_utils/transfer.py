@@ -6,41 +6,55 @@ from aiofiles.os import (
 )
 from asyncio import (
     create_subprocess_exec,
-    gather
+    gather,
+    sleep
 )
 from asyncio.subprocess import PIPE
+from collections import deque
 from configparser import ConfigParser
 from json import loads
 from logging import getLogger
+from os import path as ospath
 from random import randrange
-from re import findall as re_findall
 
 from bot import (
     config_dict,
     pkg_info
 )
-from ...ext_utils.bot_utils import (
-    cmd_exec,
-    sync_to_async
-)
+from ...ext_utils.bot_utils import sync_to_async
 from ...ext_utils.files_utils import (
     get_mime_type,
     count_files_and_folders,
     clean_unwanted,
 )
+from ...ext_utils.list_cache import invalidate_listings
+from .rcd import (
+    RcloneRcError,
+    rc_call,
+    rc_fs,
+    rcd_available,
+    rclone_link,
+    rclone_list
+)
 
 LOGGER = getLogger(__name__)
 
+RCLONE_STATS_INTERVAL = "2s"
+RCLONE_ERROR_LINES = 20
+RCD_POLL_INTERVAL = 2
+
 
 class RcloneTransferHelper:
     def __init__(self, listener):
         self._listener = listener
         self._proc = None
-        self._transferred_size = "0 B"
-        self._eta = "-"
-        self._percentage = "0%"
-        self._speed = "0 B/s"
-        self._size = "0 B"
+        self._job_id = None
+        self._transferred_size = 0
+        self._eta = None
+        self._speed = 0
+        self._size = 0
+        self._transfers = []
+        self._errors = deque(maxlen=RCLONE_ERROR_LINES)
         self._is_download = False
         self._is_upload = False
         self._sa_count = 1
@@ -55,7 +69,10 @@ class RcloneTransferHelper:
 
     @property
     def percentage(self):
-        return self._percentage
+        try:
+            return self._transferred_size / self._size * 100
+        except:
+            return 0
 
     @property
     def speed(self):
@@ -69,28 +86,246 @@ class RcloneTransferHelper:
     def size(self):
         return self._size
 
+    @property
+    def transfers(self):
+        return self._transfers
+
+    def _update_stats(self, stats):
+        self._transferred_size = stats.get(
+            "bytes",
+            0
+        )
+        self._size = stats.get(
+            "totalBytes",
+            0
+        )
+        self._speed = stats.get(
+            "speed",
+            0
+        )
+        self._eta = stats.get("eta")
+        self._transfers = stats.get(
+            "transferring",
+            []
+        )
+
+    def _get_error(self):
+        return "\n".join(self._errors)
+
     async def _progress(self):
-        while not (
-            self._proc is None
-            or self._listener.is_cancelled
-        ):
-            try:
-                data = (await self._proc.stdout.readline()).decode() # type: ignore
-            except:
-                continue
-            if not data:
-                break
-            if data := re_findall(
-                r"Transferred:\s+([\d.]+\s*\w+)\s+/\s+([\d.]+\s*\w+),\s+([\d.]+%)\s*,\s+([\d.]+\s*\w+/s),\s+ETA\s+([\dwdhms]+)",
-                data,
+        self._errors.clear()
+        log_file = (
+            await aiopen(
+                "rlog.txt",
+                "a"
+            )
+            if config_dict["RCLONE_DEBUG_LOG"]
+            else None
+        )
+        try:
+            while not (
+                self._proc is None
+                or self._listener.is_cancelled
             ):
+                try:
+                    line = await self._proc.stderr.readline() # type: ignore
+                except:
+                    continue
+                if not line:
+                    break
+                if log_file is not None:
+                    await log_file.write(line.decode(errors="replace"))
+                try:
+                    entry = loads(line)
+                except ValueError:
+                    self._errors.append(line.decode(errors="replace").strip())
+                    continue
+                if (stats := entry.get("stats")) is not None:
+                    self._update_stats(stats)
+                elif entry.get("level") in [
+                    "error",
+                    "critical"
+                ]:
+                    self._errors.append(entry.get(
+                        "msg",
+                        ""
+                    ).strip())
+        finally:
+            if log_file is not None:
+                await log_file.close()
+
+    async def _execute(self, cmd):
+        if isinstance(
+            cmd,
+            dict
+        ):
+            return await self._run_job(cmd)
+        self._proc = await create_subprocess_exec(
+            *cmd,
+            stdout=PIPE,
+            stderr=PIPE
+        )
+        (
+            _,
+            return_code
+        ) = await gather(
+            self._progress(),
+            self._proc.wait()
+        )
+        return return_code
+
+    async def _get_job_params(self, job):
+        config_path = job["config_path"]
+        (
+            src_remote,
+            src_path
+        ) = job["src"]
+        (
+            dst_remote,
+            dst_path
+        ) = job["dst"]
+        params = {
+            "_async": True,
+            "_filter": job["filter"],
+            "_config": job["config"],
+        }
+        if (is_file := job["is_file"]) is None:
+            is_file = False
+            if src_path:
+                item = (await rc_call(
+                    "operations/stat",
+                    {
+                        "fs": await rc_fs(
+                            config_path,
+                            src_remote,
+                            ""
+                        ),
+                        "remote": src_path,
+                    }
+                ))["item"]
+                is_file = (
+                    item is not None
+                    and not item["IsDir"]
+                )
+        if is_file:
+            (
+                src_dir,
+                name
+            ) = ospath.split(src_path)
+            params.update({
+                "srcFs": await rc_fs(
+                    config_path,
+                    src_remote,
+                    src_dir,
+                    job["src_opts"]
+                ),
+                "srcRemote": name,
+                "dstFs": await rc_fs(
+                    config_path,
+                    dst_remote,
+                    dst_path,
+                    job["dst_opts"]
+                ),
+                "dstRemote": name,
+            })
+            return (
+                "operations/movefile"
+                if job["method"] == "move"
+                else "operations/copyfile",
+                params
+            )
+        params.update({
+            "srcFs": await rc_fs(
+                config_path,
+                src_remote,
+                src_path,
+                job["src_opts"]
+            ),
+            "dstFs": await rc_fs(
+                config_path,
+                dst_remote,
+                dst_path,
+                job["dst_opts"]
+            ),
+        })
+        return (
+            f"sync/{job['method']}",
+            params
+        )
+
+    async def _run_job(self, job):
+        self._errors.clear()
+        try:
+            (
+                method,
+                params
+            ) = await self._get_job_params(job)
+            self._job_id = (await rc_call(
+                method,
+                params
+            ))["jobid"]
+        except RcloneRcError as e:
+            self._errors.append(str(e))
+            return 1
+        group = f"job/{self._job_id}"
+        try:
+            while True:
+                await sleep(RCD_POLL_INTERVAL)
+                if self._listener.is_cancelled:
+                    await self._stop_job()
+                    return -9
                 (
-                    self._transferred_size,
-                    self._size,
-                    self._percentage,
-                    self._speed,
-                    self._eta,
-                ) = data[0]
+                    status,
+                    stats
+                ) = await gather(
+                    rc_call(
+                        "job/status",
+                        {"jobid": self._job_id}
+                    ),
+                    rc_call(
+                        "core/stats",
+                        {"group": group}
+                    ),
+                )
+                self._update_stats(stats)
+                if status["finished"]:
+                    if status["success"]:
+                        return 0
+                    self._errors.append(status["error"])
+                    return 1
+        except RcloneRcError as e:
+            self._errors.append(str(e))
+            return 1
+        finally:
+            self._job_id = None
+            try:
+                await rc_call(
+                    "core/stats-delete",
+                    {"group": group}
+                )
+            except RcloneRcError:
+                pass
+
+    @staticmethod
+    def _set_remote(cmd, side, remote):
+        if isinstance(
+            cmd,
+            dict
+        ):
+            cmd[side] = (
+                remote,
+                cmd[side][1]
+            )
+            return
+        index = (
+            6
+            if side == "src"
+            else 7
+        )
+        cmd[index] = f"{remote}:{cmd[index].split(
+            ':',
+            1
+        )[1]}"
 
     def _switch_service_account(self):
         if self._sa_index == self._sa_number - 1:
@@ -137,18 +372,7 @@ class RcloneTransferHelper:
         return sa_conf_file
 
     async def _start_download(self, cmd, remote_type):
-        self._proc = await create_subprocess_exec(
-            *cmd,
-            stdout=PIPE,
-            stderr=PIPE
-        )
-        (
-            _,
-            return_code
-        ) = await gather(
-            self._progress(),
-            self._proc.wait()
-        )
+        return_code = await self._execute(cmd)
 
         if self._listener.is_cancelled:
             return
@@ -156,10 +380,7 @@ class RcloneTransferHelper:
         if return_code == 0:
             await self._listener.on_download_complete()
         elif return_code != -9:
-            error = (
-                (await self._proc.stderr.read()).decode().strip() # type: ignore
-                or "Use <code>/shell cat rlog.txt</code> to see more information"
-            )
+            error = self._get_error()
             if (
                 not error
                 and remote_type == "drive"
@@ -177,11 +398,11 @@ class RcloneTransferHelper:
                 and self._use_service_accounts
             ):
                 if self._sa_count < self._sa_number:
-                    remote = self._switch_service_account()
-                    cmd[6] = f"{remote}:{cmd[6].split(
-                        ':',
-                        1
-                    )[1]}"
+                    self._set_remote(
+                        cmd,
+                        "src",
+                        self._switch_service_account()
+                    )
                     if self._listener.is_cancelled:
                         return
                     return await self._start_download(
@@ -225,24 +446,40 @@ class RcloneTransferHelper:
                 remote = f"sa{self._sa_index:03}"
                 LOGGER.info(f"Download with service account {remote}")
 
-        cmd = self._get_updated_command(
-            config_path,
-            f"{remote}:{self._listener.link}",
-            path,
-            "copy"
-        )
+        if await self._can_use_rcd():
+            cmd = self._get_rc_job(
+                config_path,
+                (
+                    remote,
+                    self._listener.link
+                ),
+                (
+                    None,
+                    path
+                ),
+                "copy"
+            )
+            if remote_type == "drive":
+                cmd["src_opts"]["acknowledge_abuse"] = "true"
+        else:
+            cmd = self._get_updated_command(
+                config_path,
+                f"{remote}:{self._listener.link}",
+                path,
+                "copy"
+            )
 
-        if (
-            remote_type == "drive"
-            and not config_dict["RCLONE_FLAGS"]
-            and not self._listener.rc_flags
-        ):
-            cmd.append("--drive-acknowledge-abuse")
-        elif remote_type != "drive":
-            cmd.extend((
-                "--retries-sleep",
-                "3s"
-            ))
+            if (
+                remote_type == "drive"
+                and not config_dict["RCLONE_FLAGS"]
+                and not self._listener.rc_flags
+            ):
+                cmd.append("--drive-acknowledge-abuse")
+            elif remote_type != "drive":
+                cmd.extend((
+                    "--retries-sleep",
+                    "3s"
+                ))
 
         await self._start_download(
             cmd,
@@ -256,36 +493,24 @@ class RcloneTransferHelper:
                 1
             )
             epath = (
-                f"{remote}:{epath[0]}"
+                epath[0]
                 if len(epath) > 1
-                else f"{remote}:"
+                else ""
             )
             destination = f"{remote}:{rc_path}"
         elif rc_path:
-            epath = f"{remote}:{rc_path}/{self._listener.name}"
-            destination = epath
+            epath = rc_path
+            destination = f"{remote}:{rc_path}/{self._listener.name}"
         else:
-            epath = f"{remote}:{rc_path}{self._listener.name}"
-            destination = epath
+            epath = rc_path
+            destination = f"{remote}:{self._listener.name}"
 
-        cmd = [
-            pkg_info["pkgs"][3],
-            "lsjson",
-            "--fast-list",
-            "--no-mimetype",
-            "--no-modtime",
-            "--config",
-            config_path,
-            epath,
-        ]
-        (
-            res,
-            err,
-            code
-        ) = await cmd_exec(cmd)
-
-        if code == 0:
-            result = loads(res)
+        try:
+            result = await rclone_list(
+                config_path,
+                remote,
+                epath
+            )
             fid = next(
                 (
                     r["ID"]
@@ -299,11 +524,9 @@ class RcloneTransferHelper:
                 if mime_type == "Folder"
                 else f"https://drive.google.com/uc?id={fid}&export=download"
             )
-        elif code != -9:
-            if not err:
-                err = "Use <code>/shell cat rlog.txt</code> to see more information"
+        except RcloneRcError as err:
             LOGGER.error(
-                f"while getting drive link. Path: {destination}. Stderr: {err}"
+                f"while getting drive link. Path: {destination}. Error: {err}"
             )
             link = ""
         return (
@@ -311,16 +534,26 @@ class RcloneTransferHelper:
             destination
         )
 
-    async def _start_upload(self, cmd, remote_type):
-        self._proc = await create_subprocess_exec(
-            *cmd,
-            stdout=PIPE,
-            stderr=PIPE
-        )
-        _, return_code = await gather(
-            self._progress(),
-            self._proc.wait()
+    async def _get_link(self, config_path, destination):
+        (
+            remote,
+            path
+        ) = destination.split(
+            ":",
+            1
         )
+        try:
+            return await rclone_link(
+                config_path,
+                remote,
+                path
+            )
+        except RcloneRcError as err:
+            LOGGER.error(f"while getting link. Path: {destination} | Error: {err}")
+            return ""
+
+    async def _start_upload(self, cmd, remote_type):
+        return_code = await self._execute(cmd)
 
         if self._listener.is_cancelled:
             return False
@@ -328,10 +561,7 @@ class RcloneTransferHelper:
         if return_code == -9:
             return False
         elif return_code != 0:
-            error = (
-                (await self._proc.stderr.read()).decode().strip() # type: ignore
-                or "Use <code>/shell cat rlog.txt</code> to see more information"
-            )
+            error = self._get_error()
             if (
                 not error
                 and remote_type == "drive"
@@ -348,11 +578,11 @@ class RcloneTransferHelper:
                 and self._use_service_accounts
             ):
                 if self._sa_count < self._sa_number:
-                    remote = self._switch_service_account()
-                    cmd[7] = f"{remote}:{cmd[7].split(
-                        ':',
-                        1
-                    )[1]}"
+                    self._set_remote(
+                        cmd,
+                        "dst",
+                        self._switch_service_account()
+                    )
                     return (
                         False
                         if self._listener.is_cancelled
@@ -448,24 +678,45 @@ class RcloneTransferHelper:
             or self._listener.new_dir
             else "copy"
         )
-        cmd = self._get_updated_command(
-            fconfig_path,
-            path,
-            f"{fremote}:{rc_path}",
-            method,
-            unwanted_files
-        )
-        if (
-            remote_type == "drive"
-            and not config_dict["RCLONE_FLAGS"]
-            and not self._listener.rc_flags
-        ):
-            cmd.extend((
-                "--drive-chunk-size",
-                "128M",
-                "--drive-upload-cutoff",
-                "128M"
-            ))
+        if await self._can_use_rcd():
+            cmd = self._get_rc_job(
+                fconfig_path,
+                (
+                    None,
+                    path
+                ),
+                (
+                    fremote,
+                    rc_path
+                ),
+                method,
+                unwanted_files,
+                mime_type != "Folder"
+            )
+            if remote_type == "drive":
+                cmd["dst_opts"].update({
+                    "chunk_size": "128M",
+                    "upload_cutoff": "128M"
+                })
+        else:
+            cmd = self._get_updated_command(
+                fconfig_path,
+                path,
+                f"{fremote}:{rc_path}",
+                method,
+                unwanted_files
+            )
+            if (
+                remote_type == "drive"
+                and not config_dict["RCLONE_FLAGS"]
+                and not self._listener.rc_flags
+            ):
+                cmd.extend((
+                    "--drive-chunk-size",
+                    "128M",
+                    "--drive-upload-cutoff",
+                    "128M"
+                ))
 
         result = await self._start_upload(
             cmd,
@@ -473,6 +724,11 @@ class RcloneTransferHelper:
         )
         if not result:
             return
+        invalidate_listings(
+            "rclone",
+            oconfig_path,
+            f"{oremote}:"
+        )
 
         if remote_type == "drive":
             (
@@ -491,27 +747,10 @@ class RcloneTransferHelper:
                 destination = f"{oremote}:{rc_path}/{self._listener.name}"
             else:
                 destination = f"{oremote}:{self._listener.name}"
-
-            cmd = [
-                pkg_info["pkgs"][3],
-                "link",
-                "--config",
+            link = await self._get_link(
                 oconfig_path,
                 destination
-            ]
-            (
-                res,
-                err,
-                code
-            ) = await cmd_exec(cmd)
-
-            if code == 0:
-                link = res
-            elif code != -9:
-                if not err:
-                    err = "Use <code>/shell cat rlog.txt</code> to see more information"
-                LOGGER.error(f"while getting link. Path: {destination} | Stderr: {err}")
-                link = ""
+            )
         if self._listener.is_cancelled:
             return
         LOGGER.info(f"Upload Done. Path: {destination}")
@@ -570,41 +809,55 @@ class RcloneTransferHelper:
             dst_remote_opt["type"],
         )
 
-        cmd = self._get_updated_command(
-            config_path,
-            f"{src_remote}:{src_path}",
-            destination,
-            method
-        )
-        if (
-            not self._listener.rc_flags
-            and not config_dict["RCLONE_FLAGS"]
-        ):
+        if await self._can_use_rcd():
+            cmd = self._get_rc_job(
+                config_path,
+                (
+                    src_remote,
+                    src_path
+                ),
+                (
+                    dst_remote,
+                    dst_path
+                ),
+                method,
+                is_file=mime_type != "Folder"
+            )
             if (
                 src_remote_type == "drive" and
                 dst_remote_type != "drive"
             ):
-                cmd.append("--drive-acknowledge-abuse")
+                cmd["src_opts"]["acknowledge_abuse"] = "true"
             elif src_remote_type == "drive":
-                cmd.extend((
-                    "--tpslimit",
-                    "3",
-                    "--transfers",
-                    "3"
-                ))
+                cmd["config"].update({
+                    "TPSLimit": 3,
+                    "Transfers": 3
+                })
+        else:
+            cmd = self._get_updated_command(
+                config_path,
+                f"{src_remote}:{src_path}",
+                destination,
+                method
+            )
+            if (
+                not self._listener.rc_flags
+                and not config_dict["RCLONE_FLAGS"]
+            ):
+                if (
+                    src_remote_type == "drive" and
+                    dst_remote_type != "drive"
+                ):
+                    cmd.append("--drive-acknowledge-abuse")
+                elif src_remote_type == "drive":
+                    cmd.extend((
+                        "--tpslimit",
+                        "3",
+                        "--transfers",
+                        "3"
+                    ))
 
-        self._proc = await create_subprocess_exec(
-            *cmd,
-            stdout=PIPE,
-            stderr=PIPE
-        )
-        (
-            _,
-            return_code
-        ) = await gather(
-            self._progress(),
-            self._proc.wait()
-        )
+        return_code = await self._execute(cmd)
 
         if self._listener.is_cancelled:
             return (
@@ -619,7 +872,7 @@ class RcloneTransferHelper:
             )
         elif return_code != 0:
             error = (
-                (await self._proc.stderr.read()).decode().strip() # type: ignore
+                self._get_error()
                 or "Use <code>/shell cat rlog.txt</code> to see more information"
             )
             LOGGER.error(error)
@@ -629,6 +882,11 @@ class RcloneTransferHelper:
                 None
             )
         else:
+            invalidate_listings(
+                "rclone",
+                config_path,
+                f"{dst_remote}:"
+            )
             if dst_remote_type == "drive":
                 link, destination = await self._get_gdrive_link(
                     config_path,
@@ -655,37 +913,78 @@ class RcloneTransferHelper:
                         else self._listener.name
                     )
 
-                cmd = [
-                    pkg_info["pkgs"][3],
-                    "link",
-                    "--config",
+                link = await self._get_link(
                     config_path,
                     destination
-                ]
-                (
-                    res,
-                    err,
-                    code
-                ) = await cmd_exec(cmd)
+                )
 
                 if self._listener.is_cancelled:
                     return (
                         None,
                         None
                     )
+                return (
+                    link or None,
+                    destination
+                )
 
-                if code == 0:
-                    return res, destination
-                elif code != -9:
-                    if not err:
-                        err = "Use <code>/shell cat rlog.txt</code> to see more information"
-                    LOGGER.error(
-                        f"while getting link. Path: {destination} | Stderr: {err}"
-                    )
-                    return (
-                        None,
-                        destination
-                    )
+    async def _can_use_rcd(self):
+        if (
+            self._listener.rc_flags
+            or config_dict["RCLONE_FLAGS"]
+        ):
+            return False
+        return await rcd_available()
+
+    def _get_rc_job(
+        self,
+        config_path,
+        source,
+        destination,
+        method,
+        unwanted_files=None,
+        is_file=None
+    ):
+        job = {
+            "method": method,
+            "config_path": config_path,
+            "src": source,
+            "dst": destination,
+            "src_opts": {},
+            "dst_opts": {},
+            "is_file": is_file,
+            "filter": {
+                "IgnoreCase": True,
+                "ExcludeRule": [],
+            },
+            "config": {
+                "LowLevelRetries": 1,
+                "Metadata": True,
+                "UseListR": True,
+            },
+        }
+        if source[1].startswith("rclone_select"):
+            job["src"] = (
+                source[0],
+                ""
+            )
+            job["is_file"] = False
+            job["filter"]["FilesFrom"] = [self._listener.link]
+            self.rclone_select = True
+        else:
+            job["filter"]["ExcludeRule"].append(
+                "*.{" + ",".join(self._listener.extension_filter) + "}"
+            )
+        if unwanted_files:
+            job["filter"]["ExcludeRule"].extend(
+                f.rsplit(
+                    "/",
+                    1
+                )[1]
+                for f
+                in unwanted_files
+            )
+        return job
 
     def _get_updated_command(
         self,
@@ -708,20 +1007,25 @@ class RcloneTransferHelper:
             "--fast-list",
             "--config",
             config_path,
-            "-P",
+            "--use-json-log",
             source,
             destination,
+            "--stats",
+            RCLONE_STATS_INTERVAL,
+            "--stats-log-level",
+            "NOTICE",
             "--retries-sleep",
             "3s",
             "--ignore-case",
             "--low-level-retries",
             "1",
             "-M",
-            "--log-file",
-            "rlog.txt",
-            "--log-level",
-            "DEBUG",
         ]
+        if config_dict["RCLONE_DEBUG_LOG"]:
+            cmd.extend((
+                "--log-level",
+                "DEBUG"
+            ))
         if self.rclone_select:
             cmd.extend((
                 "--files-from",
@@ -781,6 +1085,16 @@ class RcloneTransferHelper:
             in options
         }
 
+    async def _stop_job(self):
+        if self._job_id is not None:
+            try:
+                await rc_call(
+                    "job/stop",
+                    {"jobid": self._job_id}
+                )
+            except RcloneRcError:
+                pass
+
     async def cancel_task(self):
         self._listener.is_cancelled = True
         if self._proc is not None:
@@ -788,6 +1102,7 @@ class RcloneTransferHelper:
                 self._proc.kill()
             except:
                 pass
+        await self._stop_job()
         if self._is_download:
             LOGGER.info(f"Cancelling Download: {self._listener.name}")
             await self._listener.on_download_error("Download stopped by user!")
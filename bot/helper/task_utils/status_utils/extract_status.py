@@ -1,7 +1,8 @@
 from time import time
 
-from bot import LOGGER, subprocess_lock
+from bot import LOGGER
 from ...ext_utils.files_utils import get_path_size
+from ...ext_utils.process_manager import kill_processes
 from ...ext_utils.status_utils import (
     get_readable_file_size,
     MirrorStatus,
@@ -73,21 +74,36 @@ class ExtractStatus:
         return get_readable_file_size(self._proccessed_bytes)
 
     async def processed_raw(self):
-        if self.listener.new_dir:
+        if jobs := self.listener.extract_jobs:
+            self._size = sum(
+                job["size"]
+                for job
+                in jobs
+            )
+            self._proccessed_bytes = sum(
+                job["done"]
+                for job
+                in jobs
+            )
+        elif self.listener.new_dir:
             self._proccessed_bytes = await get_path_size(self.listener.new_dir)
         else:
             self._proccessed_bytes = await get_path_size(self.listener.dir) - self._size
 
+    def disk_space(self):
+        if not (space := self.listener.extract_space):
+            return None
+        (
+            needed,
+            free
+        ) = space
+        return f"{get_readable_file_size(needed)} needed, {get_readable_file_size(free)} free"
+
     def task(self):
         return self
 
     async def cancel_task(self):
         LOGGER.info(f"Cancelling Extract: {self.listener.name}")
         self.listener.is_cancelled = True
-        async with subprocess_lock:
-            if (
-                self.listener.suproc is not None
-                and self.listener.suproc.returncode is None
-            ):
-                self.listener.suproc.kill()
+        await kill_processes(self.listener)
         await self.listener.on_upload_error("extracting stopped by user!")
@@ -1,9 +1,9 @@
 from time import time
 from bot import (
     LOGGER,
-    pkg_info,
-    subprocess_lock
+    pkg_info
 )
+from ...ext_utils.process_manager import kill_processes
 from ...ext_utils.status_utils import (
     get_readable_file_size,
     get_readable_time,
@@ -87,7 +87,5 @@ class MediaConvertStatus:
     async def cancel_task(self):
         LOGGER.info(f"Cancelling Converting: {self.listener.name}")
         self.listener.is_cancelled = True
-        async with subprocess_lock:
-            if self.listener.suproc is not None and self.listener.suproc.returncode is None:
-                self.listener.suproc.kill()
+        await kill_processes(self.listener)
         await self.listener.on_upload_error("Converting stopped by user!")
@@ -1,5 +1,9 @@
 from bot import pkg_info
-from ...ext_utils.status_utils import MirrorStatus
+from ...ext_utils.status_utils import (
+    MirrorStatus,
+    get_readable_file_size,
+    get_readable_time,
+)
 from subprocess import run as rrun
 
 
@@ -32,19 +36,21 @@ class RcloneStatus:
         return self._gid
 
     def progress(self):
-        return self._obj.percentage
+        return f"{round(self._obj.percentage, 2)}%"
 
     def speed(self):
-        return self._obj.speed
+        return f"{get_readable_file_size(self._obj.speed)}/s"
 
     def name(self):
         return self.listener.name
 
     def size(self):
-        return self._obj.size
+        return get_readable_file_size(self._obj.size)
 
     def eta(self):
-        return self._obj.eta
+        if not self._obj.eta:
+            return "-"
+        return get_readable_time(self._obj.eta)
 
     def status(self):
         if self._status == "dl":
@@ -55,7 +61,7 @@ class RcloneStatus:
             return MirrorStatus.STATUS_CLONING
 
     def processed_bytes(self):
-        return self._obj.transferred_size
+        return get_readable_file_size(self._obj.transferred_size)
 
     def task(self):
         return self._obj
@@ -1,8 +1,8 @@
 from bot import (
     LOGGER,
-    pkg_info,
-    subprocess_lock
+    pkg_info
 )
+from ...ext_utils.process_manager import kill_processes
 from ...ext_utils.status_utils import (
     get_readable_file_size,
     MirrorStatus,
@@ -95,10 +95,5 @@ class SampleVideoStatus:
     async def cancel_task(self):
         LOGGER.info(f"Cancelling Sample Video: {self.listener.name}")
         self.listener.is_cancelled = True
-        async with subprocess_lock:
-            if (
-                self.listener.suproc is not None
-                and self.listener.suproc.returncode is None
-            ):
-                self.listener.suproc.kill()
+        await kill_processes(self.listener)
         await self.listener.on_upload_error("Creating sample video stopped by user!")
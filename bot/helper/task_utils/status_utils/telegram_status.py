@@ -4,6 +4,7 @@ from ...ext_utils.status_utils import (
     get_readable_time,
 )
 from pkg_resources import get_distribution
+from time import time
 
 
 class TelegramStatus:
@@ -15,13 +16,42 @@ class TelegramStatus:
         self._status = status
         self.engine = f"Py-Fork v2.3.56"
 
+    def _split_job(self):
+        # the uploader is starved and waiting on the split producer
+        if (
+            self._status == "up"
+            and (job := self._obj.split_job)
+            and job["waiting"]
+        ):
+            return job
+        return None
+
+    def _counters(self):
+        if job := self._split_job():
+            try:
+                speed = job["done"] / (time() - job["start"])
+            except:
+                speed = 0
+            return (
+                job["done"],
+                job["size"],
+                speed
+            )
+        return (
+            self._obj.processed_bytes,
+            self._size,
+            self._obj.speed
+        )
+
     def processed_bytes(self):
-        return get_readable_file_size(self._obj.processed_bytes)
+        return get_readable_file_size(self._counters()[0])
 
     def size(self):
-        return get_readable_file_size(self._size)
+        return get_readable_file_size(self._counters()[1])
 
     def status(self):
+        if self._split_job():
+            return MirrorStatus.STATUS_SPLITTING
         if self._status == "up":
             return MirrorStatus.STATUS_UPLOADING
         return MirrorStatus.STATUS_DOWNLOADING
@@ -30,18 +60,28 @@ class TelegramStatus:
         return self.listener.name
 
     def progress(self):
+        (
+            processed,
+            size,
+            _
+        ) = self._counters()
         try:
-            progress_raw = self._obj.processed_bytes / self._size * 100
+            progress_raw = processed / size * 100
         except:
             progress_raw = 0
         return f"{round(progress_raw, 2)}%"
 
     def speed(self):
-        return f"{get_readable_file_size(self._obj.speed)}/s"
+        return f"{get_readable_file_size(self._counters()[2])}/s"
 
     def eta(self):
+        (
+            processed,
+            size,
+            speed
+        ) = self._counters()
         try:
-            seconds = (self._size - self._obj.processed_bytes) / self._obj.speed
+            seconds = (size - processed) / speed
             return get_readable_time(seconds)
         except:
             return "-"
@@ -1,10 +1,8 @@
 from time import time
 
-from bot import (
-    LOGGER,
-    subprocess_lock
-)
+from bot import LOGGER
 from ...ext_utils.files_utils import get_path_size
+from ...ext_utils.process_manager import kill_processes
 from ...ext_utils.status_utils import (
     get_readable_file_size,
     MirrorStatus,
@@ -73,7 +71,10 @@ class ZipStatus:
         return MirrorStatus.STATUS_ARCHIVING
 
     async def processed_raw(self):
-        if self.listener.new_dir:
+        if job := self.listener.compress_job:
+            self._size = job["size"]
+            self._proccessed_bytes = job["done"]
+        elif self.listener.new_dir:
             self._proccessed_bytes = await get_path_size(self.listener.new_dir)
         else:
             self._proccessed_bytes = await get_path_size(self.listener.dir) - self._size
@@ -87,10 +88,5 @@ class ZipStatus:
     async def cancel_task(self):
         LOGGER.info(f"Cancelling Archive: {self.listener.name}")
         self.listener.is_cancelled = True
-        async with subprocess_lock:
-            if (
-                self.listener.suproc is not None
-                and self.listener.suproc.returncode is None
-            ):
-                self.listener.suproc.kill()
+        await kill_processes(self.listener)
         await self.listener.on_upload_error("archiving stopped by user!")
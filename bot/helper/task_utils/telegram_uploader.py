@@ -8,7 +8,12 @@ from aioshutil import (
     copy,
     rmtree
 )
-from asyncio import sleep
+from asyncio import (
+    Queue,
+    create_task,
+    gather,
+    sleep
+)
 from html import escape
 from logging import getLogger
 from natsort import natsorted
@@ -57,12 +62,56 @@ from ..ext_utils.media_utils import (
     get_document_type,
     get_video_thumbnail,
     get_audio_thumbnail,
-    get_multiple_frames_thumbnail
+    get_multiple_frames_thumbnail,
+    split_file
 )
+from ..ext_utils.process_manager import kill_processes
 from ..telegram_helper.message_utils import delete_message
 
 LOGGER = getLogger(__name__)
 
+SPLIT_QUEUE_SIZE = 2
+CHAT_SEND_INTERVAL = 1
+
+chat_slots = {}
+
+
+def _prune_chat_slots(now):
+    for chat_id in [
+        chat_id
+        for (
+            chat_id,
+            slot
+        ) in chat_slots.items()
+        if slot <= now
+    ]:
+        del chat_slots[chat_id]
+
+
+async def wait_chat_slot(chat_id):
+    now = time()
+    _prune_chat_slots(now)
+    slot = max(
+        now,
+        chat_slots.get(
+            chat_id,
+            0
+        )
+    )
+    chat_slots[chat_id] = slot + CHAT_SEND_INTERVAL
+    if slot > now:
+        await sleep(slot - now)
+
+
+def set_flood_wait(chat_id, seconds):
+    chat_slots[chat_id] = max(
+        chat_slots.get(
+            chat_id,
+            0
+        ),
+        time() + seconds * 1.3
+    )
+
 
 class TelegramUploader:
     def __init__(self, listener, path):
@@ -87,6 +136,14 @@ class TelegramUploader:
         self._sent_msg = None
         self._sent_DMmsg = None
         self._user_session = self._listener.user_transmission
+        self._prefer_user = False
+        self._defer_groups = False
+        self._job_index = 0
+        self._msg_index = {}
+        self._last_job = 0
+        self._jobs = None
+        self._lanes = []
+        self.split_job = None
 
     async def _upload_progress(self, current, _):
         if self._listener.is_cancelled:
@@ -440,21 +497,416 @@ class TelegramUploader:
                 )
                 self._sent_DMmsg = None
 
+    async def _upload_one(self, dirpath, file_, delete_file):
+        self._up_path = f_path = ospath.join(
+            dirpath,
+            file_
+        )
+        try:
+            f_size = await aiopath.getsize(self._up_path)
+            self._total_files += 1
+            if f_size == 0:
+                LOGGER.error(
+                    f"{self._up_path} size is zero, telegram don't upload zero size files"
+                )
+                self._corrupted += 1
+                return True
+            if self._listener.is_cancelled:
+                return False
+            cap_mono = await self._prepare_file(
+                file_,
+                dirpath,
+                delete_file
+            )
+            cap_mono = await self._prepare_caption_font(cap_mono)
+            if self._last_msg_in_group:
+                group_lists = [
+                    x for v in self._media_dict.values() for x in v.keys()
+                ]
+                match = re_match(
+                    r".+(?=\.0*\d+$)|.+(?=\.part\d+\..+$)",
+                    f_path
+                )
+                if (
+                    not match
+                    or match
+                    and match.group(0)
+                    not in group_lists
+                ):
+                    for (
+                        key,
+                        value
+                    ) in list(self._media_dict.items()):
+                        for (
+                            subkey,
+                            msgs
+                        ) in list(value.items()):
+                            if len(msgs) > 1:
+                                await self._send_media_group(
+                                    subkey,
+                                    key,
+                                    msgs
+                                )
+            if self._listener.mixed_leech:
+                self._user_session = (
+                    f_size > 2097152000
+                    or self._prefer_user
+                )
+                if self._user_session:
+                    self._sent_msg = await user.get_messages( # type: ignore
+                        chat_id=self._sent_msg.chat.id, # type: ignore
+                        message_ids=self._sent_msg.id, # type: ignore
+                    )
+                else:
+                    self._sent_msg = await self._listener.client.get_messages(
+                        chat_id=self._sent_msg.chat.id, # type: ignore
+                        message_ids=self._sent_msg.id, # type: ignore
+                    )
+            self._last_msg_in_group = False
+            self._last_uploaded = 0
+            await self._upload_file(
+                cap_mono,
+                file_,
+                f_path
+            )
+            if self._listener.is_cancelled:
+                return False
+            if not self._is_corrupted:
+                self._last_job = self._job_index
+            if (
+                not self._is_corrupted
+                and (self._listener.is_super_chat or self._listener.up_dest)
+                and not self._is_private
+            ):
+                self._msgs_dict[self._sent_msg.link] = file_ # type: ignore
+                self._msg_index[self._sent_msg.link] = self._job_index # type: ignore
+        except Exception as err:
+            if isinstance(
+                err,
+                RetryError
+            ):
+                LOGGER.info(
+                    f"Total Attempts: {err.last_attempt.attempt_number}" # type: ignore
+                )
+                err = err.last_attempt.exception() # type: ignore
+            LOGGER.error(f"{err}. Path: {self._up_path}")
+            self._corrupted += 1
+            if self._listener.is_cancelled:
+                return False
+        if (
+            not self._listener.is_cancelled
+            and await aiopath.exists(self._up_path)
+            and (
+                not self._listener.seed
+                or self._listener.new_dir
+                or dirpath.endswith("/splited_files_zee")
+                or "/copied_zee/" in self._up_path
+                or delete_file
+            )
+        ):
+            await remove(self._up_path)
+        return True
+
+    async def _dispatch(self, dirpath, file_, delete_file):
+        self._job_index += 1
+        if self._jobs is None:
+            return await self._upload_one(
+                dirpath,
+                file_,
+                delete_file
+            )
+        await self._jobs.put((
+            self._job_index,
+            dirpath,
+            file_,
+            delete_file
+        ))
+        return not self._listener.is_cancelled
+
+    def _new_lane(self, index):
+        lane = TelegramUploader(
+            self._listener,
+            self._path
+        )
+        lane._start_time = self._start_time
+        lane._thumb = self._thumb
+        lane._media_group = self._media_group
+        lane._lprefix = self._lprefix
+        lane._lsuffix = self._lsuffix
+        lane._lcapfont = self._lcapfont
+        lane._sent_msg = self._sent_msg
+        lane._sent_DMmsg = self._sent_DMmsg
+        lane._media_dict = self._media_dict
+        lane._defer_groups = True
+        lane._prefer_user = bool(
+            self._listener.mixed_leech
+            and index % 2
+        )
+        return lane
+
+    async def _run_lane(self, lane):
+        while (job := await self._jobs.get()) is not None: # type: ignore
+            if self._listener.is_cancelled:
+                continue
+            (
+                lane._job_index,
+                dirpath,
+                file_,
+                delete_file
+            ) = job
+            try:
+                await lane._upload_one(
+                    dirpath,
+                    file_,
+                    delete_file
+                )
+            except Exception as e:
+                LOGGER.error(f"{e}. Path: {dirpath}/{file_}")
+
+    def _merge_lanes(self):
+        # replies after the upload go under the last file any lane sent
+        last = max(
+            self._lanes,
+            key=lambda lane: lane._last_job,
+            default=None
+        )
+        if (
+            last is not None
+            and last._last_job
+        ):
+            self._sent_msg = last._sent_msg
+            self._sent_DMmsg = last._sent_DMmsg
+        uploaded = []
+        for lane in self._lanes:
+            self._total_files += lane._total_files
+            self._corrupted += lane._corrupted
+            uploaded.extend(
+                (
+                    lane._msg_index[link],
+                    link,
+                    name
+                )
+                for (
+                    link,
+                    name
+                ) in lane._msgs_dict.items()
+            )
+        for (
+            _,
+            link,
+            name
+        ) in sorted(uploaded):
+            self._msgs_dict[link] = name
+
+    async def _split_producer(self, f_path, f_size, dirpath, file_, queue):
+        try:
+            res = await split_file(
+                f_path,
+                f_size,
+                dirpath,
+                file_,
+                self._listener.split_size,
+                self._listener,
+                part_queue=queue,
+                progress=self._split_progress
+            )
+        except Exception as e:
+            LOGGER.error(f"{e}. Split Path: {f_path}")
+            res = False
+        finally:
+            await queue.put(None)
+        return res
+
+    def _split_progress(self, size):
+        self.split_job["done"] += size # type: ignore
+
+    async def _next_part(self, queue):
+        self.split_job["waiting"] = True # type: ignore
+        try:
+            return await queue.get()
+        finally:
+            self.split_job["waiting"] = False # type: ignore
+
+    async def _split_upload(self, f_path, dirpath, file_, delete_file):
+        f_size = await aiopath.getsize(f_path)
+        LOGGER.info(f"Splitting: {f_path}")
+        self.split_job = {
+            "size": f_size,
+            "done": 0,
+            "start": time(),
+            "waiting": False,
+        }
+        queue = Queue(maxsize=SPLIT_QUEUE_SIZE)
+        producer = create_task(
+            self._split_producer(
+                f_path,
+                f_size,
+                dirpath,
+                file_,
+                queue
+            )
+        )
+        try:
+            while (part := await self._next_part(queue)) is not None:
+                (
+                    part_dir,
+                    part_name
+                ) = part.rsplit(
+                    "/",
+                    1
+                )
+                if not await self._dispatch(
+                    part_dir,
+                    part_name,
+                    False
+                ):
+                    await kill_processes(self._listener)
+                    producer.cancel()
+                    return True
+            res = await producer
+        finally:
+            self.split_job = None
+        if self._listener.is_cancelled:
+            return True
+        if (
+            not res
+            and f_size < self._listener.max_split_size
+        ):
+            return False
+        if (
+            not self._listener.seed
+            or self._listener.new_dir
+            or delete_file
+        ):
+            try:
+                await remove(f_path)
+            except:
+                pass
+        return True
+
+    async def _compress_producer(self, queue):
+        stream = self._listener.stream_compress
+        up_path = stream["up_path"]
+        await makedirs(
+            up_path.rsplit(
+                "/",
+                1
+            )[0],
+            exist_ok=True
+        )
+        self._listener.compress_job = {
+            "size": stream["size"],
+            "done": 0,
+        }
+        task = create_task(self._listener.run_7z(
+            stream["cmd"],
+            self._listener.compress_job,
+            cpu=stream["cpu"],
+            mem=1
+        ))
+        index = 2
+        try:
+            while True:
+                if self._listener.is_cancelled:
+                    await kill_processes(self._listener)
+                done = task.done()
+                part = f"{up_path}.{index:03}"
+                if (
+                    await aiopath.exists(f"{up_path}.{index + 1:03}")
+                    or done
+                    and task.result()[0] == 0
+                    and await aiopath.exists(part)
+                ):
+                    await queue.put(part)
+                    index += 1
+                    continue
+                if done:
+                    break
+                await sleep(1)
+            # 7z seeks back into the first volume to write the start header on exit
+            if (
+                task.result()[0] == 0
+                and await aiopath.exists(f"{up_path}.001")
+            ):
+                await queue.put(f"{up_path}.001")
+            return await task
+        finally:
+            await queue.put(None)
+
+    async def _compress_upload(self, ft_delete):
+        stream = self._listener.stream_compress
+        self._listener.name = stream["up_path"].rsplit(
+            "/",
+            1
+        )[1]
+        LOGGER.info(f"Zipping and uploading: {stream['source']}")
+        queue = Queue()
+        producer = create_task(self._compress_producer(queue))
+        while (part := await queue.get()) is not None:
+            (
+                part_dir,
+                part_name
+            ) = part.rsplit(
+                "/",
+                1
+            )
+            if not await self._dispatch(
+                part_dir,
+                part_name,
+                False
+            ):
+                await kill_processes(self._listener)
+                producer.cancel()
+                return
+        (
+            code,
+            stderr
+        ) = await producer
+        if self._listener.is_cancelled:
+            return
+        if code != 0:
+            LOGGER.error(f"{stderr}. Unable to zip this path: {stream['source']}")
+            self._listener.is_cancelled = True
+            await self._listener.on_upload_error(f"Unable to zip: {stderr}")
+            return
+        await self._listener.finish_compress(
+            stream["source"],
+            stream["delete"],
+            ft_delete
+        )
+
     async def upload(self, o_files, ft_delete):
         await self._user_settings()
         res = await self._msg_to_reply()
         if not res:
             return
+        if (workers := config_dict["LEECH_UPLOAD_WORKERS"]) > 1:
+            self._jobs = Queue(maxsize=workers)
+            self._lanes = [
+                self._new_lane(index)
+                for index
+                in range(workers)
+            ]
+            lane_tasks = [
+                create_task(self._run_lane(lane))
+                for lane
+                in self._lanes
+            ]
+        if self._listener.stream_compress:
+            await self._compress_upload(ft_delete)
+            tree = []
+        else:
+            tree = natsorted(
+                await sync_to_async(
+                    walk,
+                    self._path
+                )
+            )
         for (
             dirpath,
             _,
             files
-        ) in natsorted(
-            await sync_to_async(
-                walk,
-                self._path
-            )
-        ):
+        ) in tree:
             if dirpath.endswith("/yt-dlp-thumb"):
                 continue
             if dirpath.endswith("_zeess"):
@@ -469,13 +921,13 @@ class TelegramUploader:
                 continue
             for file_ in natsorted(files):
                 delete_file = False
-                self._up_path = f_path = ospath.join(
+                f_path = ospath.join(
                     dirpath,
                     file_
                 )
-                if self._up_path in ft_delete:
+                if f_path in ft_delete:
                     delete_file = True
-                if self._up_path in o_files:
+                if f_path in o_files:
                     continue
                 if file_.lower().endswith(
                     tuple(self._listener.extension_filter)
@@ -484,117 +936,57 @@ class TelegramUploader:
                         not self._listener.seed
                         or self._listener.new_dir
                     ):
-                        await remove(self._up_path)
+                        await remove(f_path)
                     continue
-                try:
-                    f_size = await aiopath.getsize(self._up_path)
-                    self._total_files += 1
-                    if f_size == 0:
-                        LOGGER.error(
-                            f"{self._up_path} size is zero, telegram don't upload zero size files"
-                        )
-                        self._corrupted += 1
-                        continue
-                    if self._listener.is_cancelled:
-                        return
-                    cap_mono = await self._prepare_file(
-                        file_,
+                if (
+                    not self._listener.compress
+                    and await aiopath.getsize(f_path) > self._listener.split_size
+                ):
+                    res = await self._split_upload(
+                        f_path,
                         dirpath,
-                        delete_file
-                    )
-                    cap_mono = await self._prepare_caption_font(cap_mono)
-                    if self._last_msg_in_group:
-                        group_lists = [
-                            x for v in self._media_dict.values() for x in v.keys()
-                        ]
-                        match = re_match(
-                            r".+(?=\.0*\d+$)|.+(?=\.part\d+\..+$)",
-                            f_path
-                        )
-                        if (
-                            not match
-                            or match
-                            and match.group(0)
-                            not in group_lists
-                        ):
-                            for (
-                                key,
-                                value
-                            ) in list(self._media_dict.items()):
-                                for (
-                                    subkey,
-                                    msgs
-                                ) in list(value.items()):
-                                    if len(msgs) > 1:
-                                        await self._send_media_group(
-                                            subkey,
-                                            key,
-                                            msgs
-                                        )
-                    if self._listener.mixed_leech:
-                        self._user_session = f_size > 2097152000
-                        if self._user_session:
-                            self._sent_msg = await user.get_messages( # type: ignore
-                                chat_id=self._sent_msg.chat.id, # type: ignore
-                                message_ids=self._sent_msg.id, # type: ignore
-                            )
-                        else:
-                            self._sent_msg = await self._listener.client.get_messages(
-                                chat_id=self._sent_msg.chat.id, # type: ignore
-                                message_ids=self._sent_msg.id, # type: ignore
-                            )
-                    self._last_msg_in_group = False
-                    self._last_uploaded = 0
-                    await self._upload_file(
-                        cap_mono,
                         file_,
-                        f_path
+                        delete_file
                     )
                     if self._listener.is_cancelled:
-                        return
-                    if (
-                        not self._is_corrupted
-                        and (self._listener.is_super_chat or self._listener.up_dest)
-                        and not self._is_private
-                    ):
-                        self._msgs_dict[self._sent_msg.link] = file_ # type: ignore
-                    await sleep(1)
-                except Exception as err:
-                    if isinstance(
-                        err,
-                        RetryError
-                    ):
-                        LOGGER.info(
-                            f"Total Attempts: {err.last_attempt.attempt_number}" # type: ignore
-                        )
-                        err = err.last_attempt.exception() # type: ignore
-                    LOGGER.error(f"{err}. Path: {self._up_path}")
-                    self._corrupted += 1
-                    if self._listener.is_cancelled:
-                        return
-                if (
-                    not self._listener.is_cancelled
-                    and await aiopath.exists(self._up_path)
-                    and (
-                        not self._listener.seed
-                        or self._listener.new_dir
-                        or dirpath.endswith("/splited_files_zee")
-                        or "/copied_zee/" in self._up_path
-                        or delete_file
-                    )
+                        break
+                    if res:
+                        continue
+                if not await self._dispatch(
+                    dirpath,
+                    file_,
+                    delete_file
                 ):
-                    await remove(self._up_path)
+                    break
+            if self._listener.is_cancelled:
+                break
+        if self._jobs is not None:
+            for _ in self._lanes:
+                await self._jobs.put(None)
+            await gather(*lane_tasks)
+            self._merge_lanes()
+        if self._listener.is_cancelled:
+            return
         for (
             key,
             value
         ) in list(self._media_dict.items()):
             for subkey, msgs in list(value.items()):
-                if len(msgs) > 1:
+                msgs.sort(key=lambda x: x[2])
+                for i in range(
+                    0,
+                    len(msgs),
+                    10
+                ):
+                    batch = msgs[i : i + 10]
+                    if len(batch) < 2:
+                        continue
+                    self._media_dict[key][subkey] = batch
                     try:
                         await self._send_media_group(
                             subkey,
                             key,
-                            msgs
+                            batch
                         )
                     except Exception as e:
                         LOGGER.info(
@@ -686,6 +1078,7 @@ class TelegramUploader:
         thumb = self._thumb
         self._is_corrupted = False
         try:
+            await wait_chat_slot(self._sent_msg.chat.id) # type: ignore
             (
                 is_video,
                 is_audio,
@@ -814,18 +1207,22 @@ class TelegramUploader:
                         self._media_dict[key][pname].append(
                             [
                                 self._sent_msg.chat.id,
-                                self._sent_msg.id
+                                self._sent_msg.id,
+                                self._job_index
                             ]
                         )
                     else:
                         self._media_dict[key][pname] = [
                             [
                                 self._sent_msg.chat.id,
-                                self._sent_msg.id
+                                self._sent_msg.id,
+                                self._job_index
                             ]
                         ]
                     msgs = self._media_dict[key][pname]
-                    if len(msgs) == 10:
+                    if self._defer_groups:
+                        pass
+                    elif len(msgs) == 10:
                         await self._send_media_group(
                             pname,
                             key,
@@ -852,7 +1249,10 @@ class TelegramUploader:
                 await remove(thumb)
         except FloodWait as f:
             LOGGER.warning(str(f))
-            await sleep(f.value * 1.3) # type: ignore
+            set_flood_wait(
+                self._sent_msg.chat.id, # type: ignore
+                f.value # type: ignore
+            )
             if (
                 self._thumb is None
                 and thumb is not None
@@ -896,13 +1296,17 @@ class TelegramUploader:
     @property
     def speed(self):
         try:
-            return self._processed_bytes / (time() - self._start_time)
+            return self.processed_bytes / (time() - self._start_time)
         except:
             return 0
 
     @property
     def processed_bytes(self):
-        return self._processed_bytes
+        return self._processed_bytes + sum(
+            lane._processed_bytes
+            for lane
+            in self._lanes
+        )
 
     async def cancel_task(self):
         self._listener.is_cancelled = True
@@ -30,7 +30,10 @@ from bot import (
 )
 from ..ext_utils.bot_utils import SetInterval
 from ..ext_utils.exceptions import TgLinkException
-from ..ext_utils.status_utils import get_readable_message
+from ..ext_utils.status_utils import (
+    get_readable_message,
+    get_status_snapshot
+)
 from ..telegram_helper.button_build import ButtonMaker
 
 
@@ -257,56 +260,145 @@ async def get_tg_link_message(link):
         raise TgLinkException("Private: Please report!")
 
 
+def start_status_ticker():
+    if not intervals["status_ticker"]:
+        intervals["status_ticker"] = SetInterval(
+            config_dict["STATUS_UPDATE_INTERVAL"],
+            update_status_messages
+        )
+
+
+def stop_status_ticker():
+    if ticker := intervals["status_ticker"]:
+        ticker.cancel()
+        intervals["status_ticker"] = ""
+
+
+def set_status_interval(interval):
+    if ticker := intervals["status_ticker"]:
+        ticker.interval = interval
+
+
+def _remove_status(sid):
+    if sid in status_dict:
+        del status_dict[sid]
+    intervals["status"].discard(sid)
+    if not intervals["status"]:
+        stop_status_ticker()
+
+
+async def _render_status(sid, snapshot=None):
+    return await get_readable_message(
+        sid,
+        status_dict[sid]["is_user"],
+        status_dict[sid]["page_no"],
+        status_dict[sid]["status"],
+        status_dict[sid]["page_step"],
+        snapshot
+    )
+
+
+async def _edit_status(sid, text, buttons):
+    if not (data := status_dict.get(sid)):
+        return
+    message = await edit_message(
+        data["message"],
+        text,
+        buttons,
+        block=False
+    ) # type: ignore
+    if isinstance(message, str):
+        if message.startswith("Telegram says: [400"):
+            async with task_dict_lock:
+                _remove_status(sid)
+        else:
+            LOGGER.error(f"Status with id: {sid} haven't been updated. Error: {message}")
+        return
+    data["message"].text = text
+    data["time"] = time()
+
+
 async def update_status_message(sid, force=False):
     if intervals["stopAll"]:
         return
     async with task_dict_lock:
         if not status_dict.get(sid):
-            if obj := intervals["status"].get(sid):
-                obj.cancel()
-                del intervals["status"][sid]
+            intervals["status"].discard(sid)
             return
         if not force and time() - status_dict[sid]["time"] < 3:
             return
         status_dict[sid]["time"] = time()
-        page_no = status_dict[sid]["page_no"]
-        status = status_dict[sid]["status"]
-        is_user = status_dict[sid]["is_user"]
-        page_step = status_dict[sid]["page_step"]
         (
             text,
             buttons
-        ) = await get_readable_message(
+        ) = await _render_status(
             sid,
-            is_user,
-            page_no,
-            status,
-            page_step
+            await get_status_snapshot(force=True)
+            if force
+            else None
         )
         if text is None:
-            del status_dict[sid]
-            if obj := intervals["status"].get(sid):
-                obj.cancel()
-                del intervals["status"][sid]
+            _remove_status(sid)
+            return
+        if text == status_dict[sid]["message"].text:
+            return
+    await _edit_status(
+        sid,
+        text,
+        buttons
+    )
+
+
+async def update_status_messages():
+    if intervals["stopAll"]:
+        return
+    pending = []
+    async with task_dict_lock:
+        if not intervals["status"]:
             return
-        if text != status_dict[sid]["message"].text:
-            message = await edit_message(
-                status_dict[sid]["message"],
+        snapshot = await get_status_snapshot(force=True)
+        for sid in list(intervals["status"]):
+            if not status_dict.get(sid):
+                intervals["status"].discard(sid)
+                continue
+            if time() - status_dict[sid]["time"] < 3:
+                continue
+            (
                 text,
-                buttons,
-                block=False
-            ) # type: ignore
-            if isinstance(message, str):
-                if message.startswith("Telegram says: [400"):
-                    del status_dict[sid]
-                    if obj := intervals["status"].get(sid):
-                        obj.cancel()
-                        del intervals["status"][sid]
-                else:
-                    LOGGER.error(f"Status with id: {sid} haven't been updated. Error: {message}")
-                return
-            status_dict[sid]["message"].text = text
-            status_dict[sid]["time"] = time()
+                buttons
+            ) = await _render_status(
+                sid,
+                snapshot
+            )
+            if text is None:
+                _remove_status(sid)
+                continue
+            if text != status_dict[sid]["message"].text:
+                pending.append((
+                    sid,
+                    text,
+                    buttons
+                ))
+    if not pending:
+        return
+    spacing = min(
+        1,
+        config_dict["STATUS_UPDATE_INTERVAL"] / len(pending)
+    )
+    for index, (
+        sid,
+        text,
+        buttons
+    ) in enumerate(pending):
+        if intervals["stopAll"]:
+            return
+        if index:
+            await sleep(spacing)
+        await _edit_status(
+            sid,
+            text,
+            buttons
+        )
 
 
 async def send_status_message(msg, user_id=0):
@@ -315,25 +407,18 @@ async def send_status_message(msg, user_id=0):
     async with task_dict_lock:
         sid = user_id or msg.chat.id
         is_user = bool(user_id)
+        # the task that asked for this message may be newer than the cached snapshot
+        snapshot = await get_status_snapshot(force=True)
         if sid in list(status_dict.keys()):
-            page_no = status_dict[sid]["page_no"]
-            status = status_dict[sid]["status"]
-            page_step = status_dict[sid]["page_step"]
             (
                 text,
                 buttons
-            ) = await get_readable_message(
+            ) = await _render_status(
                 sid,
-                is_user,
-                page_no,
-                status,
-                page_step
+                snapshot
             )
             if text is None:
-                del status_dict[sid]
-                if obj := intervals["status"].get(sid):
-                    obj.cancel()
-                    del intervals["status"][sid]
+                _remove_status(sid)
                 return
             message = status_dict[sid]["message"]
             await delete_message(message)
@@ -357,7 +442,8 @@ async def send_status_message(msg, user_id=0):
                 buttons
             ) = await get_readable_message(
                 sid,
-                is_user
+                is_user,
+                snapshot=snapshot
             )
             if text is None:
                 return
@@ -381,15 +467,9 @@ async def send_status_message(msg, user_id=0):
                 "status": "All",
                 "is_user": is_user,
             }
-    if (
-        not intervals["status"].get(sid)
-        and not is_user
-    ):
-        intervals["status"][sid] = SetInterval(
-            config_dict["STATUS_UPDATE_INTERVAL"],
-            update_status_message,
-            sid
-        )
+        if not is_user:
+            intervals["status"].add(sid)
+            start_status_ticker()
 
 async def user_info(client, user_id):
     return await client.get_users(user_id)
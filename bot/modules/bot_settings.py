@@ -43,15 +43,12 @@ from bot import (
     get_qb_options,
     global_extension_filter,
     index_urls,
-    intervals,
     qbit_options,
     qbittorrent_client,
     shorteneres_list,
-    task_dict,
     user_data
 )
 from ..helper.ext_utils.bot_utils import (
-    SetInterval,
     new_task,
     set_commands,
     sync_to_async
@@ -68,7 +65,7 @@ from ..helper.telegram_helper.message_utils import (
     edit_message,
     send_file,
     send_message,
-    update_status_message,
+    set_status_interval,
 )
 from ..modules.rss import add_job
 from ..modules.torrent_search import initiate_search_tools
@@ -78,6 +75,11 @@ state = "view"
 DEFAULT_VALUES = {
     "DOWNLOAD_DIR": "/usr/src/app/downloads/",
     "LEECH_SPLIT_SIZE": MAX_SPLIT_SIZE,
+    "LEECH_UPLOAD_WORKERS": 1,
+    "GDRIVE_WORKERS": 4,
+    "GDRIVE_INDEX_INTERVAL": 60,
+    "ZIP_LEVEL": 0,
+    "ZIP_THREADS": 0,
     "RSS_DELAY": 600,
     "STATUS_UPDATE_INTERVAL": 15,
     "SEARCH_LIMIT": 0,
@@ -373,20 +375,7 @@ async def edit_variable(message, pre_message, key):
             value = int(value)
     elif key == "STATUS_UPDATE_INTERVAL":
         value = int(value)
-        if (
-            len(task_dict) != 0
-            and (st := intervals["status"])
-        ):
-            for (
-                cid,
-                intvl
-            ) in list(st.items()):
-                intvl.cancel()
-                intervals["status"][cid] = SetInterval(
-                    value,
-                    update_status_message,
-                    cid
-                )
+        set_status_interval(value)
     elif key == "TORRENT_TIMEOUT":
         value = int(value)
         downloads = await sync_to_async(aria2.get_downloads)
@@ -477,7 +466,8 @@ async def edit_variable(message, pre_message, key):
     elif key in [
         "QUEUE_ALL",
         "QUEUE_DOWNLOAD",
-        "QUEUE_UPLOAD"
+        "QUEUE_UPLOAD",
+        "QUEUE_ENGINE_LIMITS"
     ]:
         await start_from_queued()
     elif key in [
@@ -810,18 +800,8 @@ async def edit_bot_settings(client, query):
         value = ""
         if data[2] in DEFAULT_VALUES:
             value = DEFAULT_VALUES[data[2]]
-            if (
-                data[2] == "STATUS_UPDATE_INTERVAL"
-                and len(task_dict) != 0
-                and (st := intervals["status"])
-            ):
-                for key, intvl in list(st.items()):
-                    intvl.cancel()
-                    intervals["status"][key] = SetInterval(
-                        value,
-                        update_status_message,
-                        key
-                    )
+            if data[2] == "STATUS_UPDATE_INTERVAL":
+                set_status_interval(value)
         elif data[2] == "EXTENSION_FILTER":
             global_extension_filter.clear()
             global_extension_filter.extend(
@@ -883,7 +863,8 @@ async def edit_bot_settings(client, query):
         elif data[2] in [
             "QUEUE_ALL",
             "QUEUE_DOWNLOAD",
-            "QUEUE_UPLOAD"
+            "QUEUE_UPLOAD",
+            "QUEUE_ENGINE_LIMITS"
         ]:
             await start_from_queued()
         elif data[2] in [
@@ -1305,6 +1286,12 @@ async def load_config():
     if len(RCLONE_FLAGS) == 0:
         RCLONE_FLAGS = ""
 
+    RCLONE_DEBUG_LOG = environ.get(
+        "RCLONE_DEBUG_LOG",
+        ""
+    )
+    RCLONE_DEBUG_LOG = RCLONE_DEBUG_LOG.lower() == "true"
+
     AUTHORIZED_CHATS = environ.get(
         "AUTHORIZED_CHATS",
         ""
@@ -1388,6 +1375,16 @@ async def load_config():
     if len(LEECH_CAPTION_FONT) == 0:
         LEECH_CAPTION_FONT = ""
 
+    LEECH_UPLOAD_WORKERS = environ.get(
+        "LEECH_UPLOAD_WORKERS",
+        ""
+    )
+    LEECH_UPLOAD_WORKERS = (
+        1
+        if len(LEECH_UPLOAD_WORKERS) == 0
+        else int(LEECH_UPLOAD_WORKERS)
+    )
+
     METADATA_TXT = environ.get(
         "METADATA_TXT",
         ""
@@ -1441,20 +1438,7 @@ async def load_config():
         STATUS_UPDATE_INTERVAL = 15
     else:
         STATUS_UPDATE_INTERVAL = int(STATUS_UPDATE_INTERVAL)
-    if (
-        len(task_dict) != 0
-        and (st := intervals["status"])
-    ):
-        for (
-            key,
-            intvl
-        ) in list(st.items()):
-            intvl.cancel()
-            intervals["status"][key] = SetInterval(
-                STATUS_UPDATE_INTERVAL,
-                update_status_message,
-                key
-            )
+    set_status_interval(STATUS_UPDATE_INTERVAL)
 
     YT_DLP_OPTIONS = environ.get(
         "YT_DLP_OPTIONS",
@@ -1605,6 +1589,13 @@ async def load_config():
         else int(QUEUE_UPLOAD)
     )
 
+    QUEUE_ENGINE_LIMITS = environ.get(
+        "QUEUE_ENGINE_LIMITS",
+        ""
+    )
+    if len(QUEUE_ENGINE_LIMITS) == 0:
+        QUEUE_ENGINE_LIMITS = ""
+
     INCOMPLETE_TASK_NOTIFIER = environ.get(
         "INCOMPLETE_TASK_NOTIFIER",
         ""
@@ -1948,6 +1939,46 @@ async def load_config():
         else float(GDRIVE_LIMIT)
     )
 
+    GDRIVE_WORKERS = environ.get(
+        "GDRIVE_WORKERS",
+        ""
+    )
+    GDRIVE_WORKERS = (
+        4
+        if len(GDRIVE_WORKERS) == 0
+        else int(GDRIVE_WORKERS)
+    )
+
+    GDRIVE_INDEX_INTERVAL = environ.get(
+        "GDRIVE_INDEX_INTERVAL",
+        ""
+    )
+    GDRIVE_INDEX_INTERVAL = (
+        60
+        if len(GDRIVE_INDEX_INTERVAL) == 0
+        else int(GDRIVE_INDEX_INTERVAL)
+    )
+
+    ZIP_LEVEL = environ.get(
+        "ZIP_LEVEL",
+        ""
+    )
+    ZIP_LEVEL = (
+        0
+        if len(ZIP_LEVEL) == 0
+        else int(ZIP_LEVEL)
+    )
+
+    ZIP_THREADS = environ.get(
+        "ZIP_THREADS",
+        ""
+    )
+    ZIP_THREADS = (
+        0
+        if len(ZIP_THREADS) == 0
+        else int(ZIP_THREADS)
+    )
+
     CLONE_LIMIT = environ.get(
         "CLONE_LIMIT",
         ""
@@ -2119,6 +2150,8 @@ async def load_config():
             "YTDLP_LIMIT": YTDLP_LIMIT,
             "PLAYLIST_LIMIT": PLAYLIST_LIMIT,
             "GDRIVE_LIMIT": GDRIVE_LIMIT,
+            "GDRIVE_WORKERS": GDRIVE_WORKERS,
+            "GDRIVE_INDEX_INTERVAL": GDRIVE_INDEX_INTERVAL,
             "CLONE_LIMIT": CLONE_LIMIT,
             "RCLONE_LIMIT": RCLONE_LIMIT,
             "MEGA_LIMIT": MEGA_LIMIT,
@@ -2146,6 +2179,7 @@ async def load_config():
             "LEECH_FILENAME_PREFIX": LEECH_FILENAME_PREFIX,
             "LEECH_FILENAME_SUFFIX": LEECH_FILENAME_SUFFIX,
             "LEECH_CAPTION_FONT": LEECH_CAPTION_FONT,
+            "LEECH_UPLOAD_WORKERS": LEECH_UPLOAD_WORKERS,
             "LEECH_SPLIT_SIZE": LEECH_SPLIT_SIZE,
             "MEDIA_GROUP": MEDIA_GROUP,
             "MIXED_LEECH": MIXED_LEECH,
@@ -2156,7 +2190,9 @@ async def load_config():
             "QUEUE_ALL": QUEUE_ALL,
             "QUEUE_DOWNLOAD": QUEUE_DOWNLOAD,
             "QUEUE_UPLOAD": QUEUE_UPLOAD,
+            "QUEUE_ENGINE_LIMITS": QUEUE_ENGINE_LIMITS,
             "RCLONE_FLAGS": RCLONE_FLAGS,
+            "RCLONE_DEBUG_LOG": RCLONE_DEBUG_LOG,
             "RCLONE_PATH": RCLONE_PATH,
             "RCLONE_SERVE_URL": RCLONE_SERVE_URL,
             "RCLONE_SERVE_USER": RCLONE_SERVE_USER,
@@ -2184,6 +2220,8 @@ async def load_config():
             "HIDE_TASK": HIDE_TASK,
             "WEB_PINCODE": WEB_PINCODE,
             "YT_DLP_OPTIONS": YT_DLP_OPTIONS,
+            "ZIP_LEVEL": ZIP_LEVEL,
+            "ZIP_THREADS": ZIP_THREADS,
         }
     )
 
@@ -38,6 +38,19 @@ from ..helper.telegram_helper.message_utils import (
 )
 
 
+async def cancel_queued_multi(multi_tag):
+    async with task_dict_lock:
+        tasks = [
+            task
+            for task
+            in task_dict.values()
+            if task.listener.multi_tag == multi_tag
+            and task.status() == MirrorStatus.STATUS_QUEUEDL
+        ]
+    for task in tasks:
+        await task.cancel_task()
+
+
 @new_task
 async def cancel_task(_, message):
     if not message.from_user:
@@ -54,6 +67,7 @@ async def cancel_task(_, message):
     if gid is not None:
         if len(gid) == 4:
             multi_tags.discard(gid)
+            await cancel_queued_multi(gid)
             return
         else:
             task = await get_task_by_gid(gid)
@@ -26,6 +26,7 @@ from ..helper.ext_utils.links_utils import (
     is_rclone_path,
     is_gdrive_id
 )
+from ..helper.ext_utils.list_cache import invalidate_listings
 from ..helper.ext_utils.task_manager import (
     limit_checker,
     stop_duplicate_check
@@ -294,6 +295,13 @@ class Clone(TaskListener):
                 folders,
                 dir_id
             ) = await sync_to_async(drive.clone)
+            invalidate_listings(
+                "gdrive",
+                self.up_dest.rsplit(
+                    ":",
+                    1
+                )[-1]
+            )
             if msg:
                 await delete_message(msg)
             if not flink:
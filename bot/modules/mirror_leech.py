@@ -122,6 +122,7 @@ class Mirror(TaskListener):
             "-h": "", "-headers": "",
             "-t": "", "-thumb": "",
             "-tl": "", "-thumblayout": "",
+            "-zl": "", "-ziplevel": "",
             "-ca": "", "-convertaudio": "",
             "-cv": "", "-convertvideo": "",
             "-ns": "", "-namesub": "",
@@ -145,6 +146,7 @@ class Mirror(TaskListener):
         self.join = args["-j"] or args["-join"]
         self.thumb = args["-t"] or args["-thumb"]
         self.split_size = args["-sp"] or args["-splitsize"]
+        self.zip_level = args["-zl"] or args["-ziplevel"]
         self.sample_video = args["-sv"] or args["-samplevideo"]
         self.screen_shots = args["-ss"] or args["-screenshot"]
         self.force_run = args["-f"] or args["-forcerun"]
@@ -229,7 +231,7 @@ class Mirror(TaskListener):
                                 if fd_name != self.folder_name:
                                     self.same_dir[fd_name]["total"] -= 1
                         else:
-                            self.same_dir = {self.folder_name: {"total": self.multi, "tasks": {self.mid}}}
+                            self.same_dir[self.folder_name] = {"total": self.multi, "tasks": {self.mid}}
                 elif self.same_dir:
                     async with task_dict_lock:
                         for fd_name in self.same_dir:
@@ -293,33 +295,12 @@ class Mirror(TaskListener):
 
         if isinstance(reply_to, list):
             self.bulk = reply_to
-            b_msg = input_list[:1]
             self.options = " ".join(input_list[1:])
-            b_msg.append(f"{self.bulk[0]} -m {len(self.bulk)} {self.options}")
-            nextmsg = await send_message(
-                self.message,
-                " ".join(b_msg)
-            )
-            nextmsg = await self.client.get_messages(
-                chat_id=self.message.chat.id,
-                message_ids=nextmsg.id # type: ignore
+            await delete_message(self.pmsg)
+            await self.start_bulk(
+                input_list[0],
+                Mirror
             )
-
-            if self.message.from_user:
-                nextmsg.from_user = self.user
-            else:
-                nextmsg.sender_chat = self.user
-
-            await Mirror(
-                self.client,
-                nextmsg,
-                self.is_qbit,
-                self.is_leech,
-                self.same_dir,
-                self.bulk,
-                self.multi_tag,
-                self.options,
-            ).new_event()
             return
 
         if reply_to:
@@ -1,5 +1,7 @@
 from asyncio import (
     Lock,
+    Queue,
+    Semaphore,
     sleep,
     gather
 )
@@ -9,8 +11,13 @@ from datetime import (
     timedelta
 )
 from feedparser import parse as feed_parse
-from httpx import AsyncClient
+from httpx import (
+    AsyncClient,
+    Limits
+)
 from io import BytesIO
+from time import time
+from urllib.parse import urlparse
 
 from nekozee.filters import (
     command,
@@ -28,17 +35,24 @@ from nekozee.errors import (
 from bot import (
     LOGGER,
     bot,
+    bot_loop,
     config_dict,
     rss_dict,
     scheduler
 )
 from ..helper.ext_utils.bot_utils import (
     arg_parser,
-    new_task
+    new_task,
+    sync_to_async
 )
 from ..helper.ext_utils.db_handler import database
 from ..helper.ext_utils.exceptions import RssShutdownException
 from ..helper.ext_utils.help_messages import RSS_HELP_MESSAGE
+from ..helper.ext_utils.rss_filters import (
+    filter_titles,
+    get_rss_filter,
+    rss_filters
+)
 from ..helper.telegram_helper.bot_commands import BotCommands
 from ..helper.telegram_helper.button_build import ButtonMaker
 from ..helper.telegram_helper.filters import CustomFilters
@@ -52,6 +66,19 @@ from ..helper.telegram_helper.message_utils import (
 
 rss_dict_lock = Lock()
 
+RSS_MAX_CONNECTIONS = 32
+RSS_HOST_LIMIT = 4
+RSS_SEND_INTERVAL = 3
+RSS_MAX_BACKOFF = 21600
+
+rss_state = {
+    "client": None,
+    "queue": None,
+    "sender": None,
+}
+rss_feeds = {}
+rss_hosts = {}
+
 headers = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.0.0 Safari/537.36",
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
@@ -240,12 +267,12 @@ async def rss_sub(message):
             cmd = None
             stv = False
         try:
-            async with AsyncClient(
-                headers=headers, follow_redirects=True, timeout=60, verify=False
-            ) as client:
-                res = await client.get(feed_link)
+            res = await _get_client().get(feed_link)
             html = res.text
-            rss_d = feed_parse(html)
+            rss_d = await sync_to_async(
+                feed_parse,
+                html
+            )
             last_title = rss_d.entries[0]["title"]
             msg += "<b>Subscribed!</b>"
             msg += f"\n<b>Title: </b><code>{title}</code>\n<b>Feed Url: </b>{feed_link}"
@@ -293,6 +320,11 @@ async def rss_sub(message):
                             "tag": tag,
                         }
                     }
+                get_rss_filter(
+                    user_id,
+                    title,
+                    rss_dict[user_id][title]
+                )
             LOGGER.info(
                 f"Rss Feed Added: id: {user_id} - title: {title} - link: {feed_link} - c: {cmd} - inf: {inf} - exf: {exf} - stv {stv}"
             )
@@ -507,12 +539,12 @@ async def rss_get(message):
                 msg = await send_message(
                     message, f"Getting the last <b>{count}</b> item(s) from {title}"
                 )
-                async with AsyncClient(
-                    headers=headers, follow_redirects=True, timeout=60, verify=False
-                ) as client:
-                    res = await client.get(data["link"])
+                res = await _get_client().get(data["link"])
                 html = res.text
-                rss_d = feed_parse(html)
+                rss_d = await sync_to_async(
+                    feed_parse,
+                    html
+                )
                 item_info = ""
                 for item_num in range(count):
                     try:
@@ -622,6 +654,11 @@ async def rss_edit(message):
                         y = x.split(" or ")
                         exf_lists.append(y)
                 rss_dict[user_id][title]["exf"] = exf_lists
+            get_rss_filter(
+                user_id,
+                title,
+                rss_dict[user_id][title]
+            )
     if config_dict["DATABASE_URL"] and updated:
         await database.rss_update(user_id)
 
@@ -992,6 +1029,258 @@ Timeout: 60 sec. Argument -c for command and arguments
             )
 
 
+def _get_client():
+    if rss_state["client"] is None:
+        rss_state["client"] = AsyncClient(
+            headers=headers,
+            follow_redirects=True,
+            timeout=60,
+            verify=False,
+            limits=Limits(max_connections=RSS_MAX_CONNECTIONS),
+        )
+    return rss_state["client"]
+
+
+async def _save_marker(job):
+    (
+        user,
+        title
+    ) = job["key"]
+    async with rss_dict_lock:
+        if (
+            user not in rss_dict
+            or not rss_dict[user].get(
+                title,
+                False
+            )
+        ):
+            return
+        rss_dict[user][title].update(
+            {
+                "last_feed": job["link"],
+                "last_title": job["title"]
+            }
+        )
+    await database.rss_update(user)
+
+
+async def _rss_sender():
+    while True:
+        job = await rss_state["queue"].get()
+        state = job["state"]
+        state["queued"] -= 1
+        if state["failed"]:
+            state["failed"] = state["queued"] > 0
+            continue
+        try:
+            if job["msg"] is not None:
+                await send_rss(job["msg"])
+        except Exception as e:
+            LOGGER.error(f"Rss Sender: {e}")
+            state.update({
+                "failed": state["queued"] > 0,
+                "etag": None,
+                "modified": None
+            })
+        else:
+            await _save_marker(job)
+        if job["msg"] is not None:
+            await sleep(RSS_SEND_INTERVAL)
+
+
+def _queue_rss(job):
+    if rss_state["queue"] is None:
+        rss_state["queue"] = Queue()
+    if (
+        rss_state["sender"] is None
+        or rss_state["sender"].done()
+    ):
+        rss_state["sender"] = bot_loop.create_task(_rss_sender())
+    job["state"]["queued"] += 1
+    rss_state["queue"].put_nowait(job)
+
+
+async def _fetch_feed(key, link):
+    state = rss_feeds.setdefault(
+        key,
+        {
+            "link": link,
+            "etag": None,
+            "modified": None,
+            "failures": 0,
+            "retry_at": 0,
+            "queued": 0,
+            "failed": False,
+        }
+    )
+    if state["link"] != link:
+        state.update({
+            "link": link,
+            "etag": None,
+            "modified": None
+        })
+    req_headers = {}
+    if state["etag"]:
+        req_headers["If-None-Match"] = state["etag"]
+    if state["modified"]:
+        req_headers["If-Modified-Since"] = state["modified"]
+    host = urlparse(link).netloc
+    if (host_limit := rss_hosts.get(host)) is None:
+        host_limit = rss_hosts[host] = Semaphore(RSS_HOST_LIMIT)
+    tries = 0
+    async with host_limit:
+        while True:
+            try:
+                res = await _get_client().get(
+                    link,
+                    headers=req_headers
+                )
+                break
+            except:
+                tries += 1
+                if tries > 3:
+                    raise
+                continue
+    if res.status_code == 304:
+        return None
+    res.raise_for_status()
+    return (
+        res.text,
+        res.headers.get("etag"),
+        res.headers.get("last-modified")
+    )
+
+
+async def _check_feed(user, title, data):
+    key = (
+        user,
+        title
+    )
+    if (
+        (state := rss_feeds.get(key))
+        and (
+            state["retry_at"] > time()
+            or state["queued"]
+        )
+    ):
+        return
+    try:
+        res = await _fetch_feed(
+            key,
+            data["link"]
+        )
+    except Exception:
+        state = rss_feeds[key]
+        state["failures"] += 1
+        state["retry_at"] = time() + min(
+            config_dict["RSS_DELAY"] * 2 ** state["failures"],
+            RSS_MAX_BACKOFF
+        )
+        raise
+    state = rss_feeds[key]
+    state["failures"] = 0
+    if res is None:
+        return
+    (
+        html,
+        etag,
+        modified
+    ) = res
+    rss_d = await sync_to_async(
+        feed_parse,
+        html
+    )
+    try:
+        last_link = rss_d.entries[0]["links"][1]["href"]
+    except IndexError:
+        last_link = rss_d.entries[0]["link"]
+    last_title = rss_d.entries[0]["title"]
+    if data["last_feed"] == last_link or data["last_title"] == last_title:
+        state["etag"] = etag
+        state["modified"] = modified
+        return
+    entries = []
+    for entry in rss_d.entries:
+        item_title = entry["title"]
+        try:
+            url = entry["links"][1]["href"]
+        except IndexError:
+            url = entry["link"]
+        if data["last_feed"] == url or data["last_title"] == item_title:
+            break
+        entries.append((
+            item_title,
+            url
+        ))
+    else:
+        LOGGER.warning(
+            f"Reached Max index no. {len(entries)} for this feed: {title}. Maybe you need to use less RSS_DELAY to not miss some torrents"
+        )
+    matches = filter_titles(
+        get_rss_filter(
+            user,
+            title,
+            data
+        ),
+        [
+            item_title
+            for (
+                item_title,
+                _
+            ) in entries
+        ]
+    )
+    if not scheduler.running:
+        raise RssShutdownException("Rss Monitor Stopped!")
+    jobs = []
+    for (
+        (
+            item_title,
+            url
+        ),
+        matched
+    ) in zip(
+        entries,
+        matches
+    ):
+        if not matched:
+            continue
+        if command := data["command"]:
+            cmd = command.split(maxsplit=1)
+            cmd.insert(1, url)
+            feed_msg = " ".join(cmd)
+            if not feed_msg.startswith("/"):
+                feed_msg = f"/{feed_msg}"
+        else:
+            feed_msg = f"<b>Name: </b><code>{item_title.replace('>', '').replace('<', '')}</code>\n\n"
+            feed_msg += f"<b>Link: </b><code>{url}</code>"
+        feed_msg += (
+            f"\n<b>Tag: </b><code>{data['tag']}</code> <code>{user}</code>"
+        )
+        jobs.append({
+            "key": key,
+            "state": state,
+            "msg": feed_msg,
+            "link": url,
+            "title": item_title,
+        })
+    # Oldest first, so each sent item can safely become the new marker
+    jobs.reverse()
+    jobs.append({
+        "key": key,
+        "state": state,
+        "msg": None,
+        "link": last_link,
+        "title": last_title,
+    })
+    for job in jobs:
+        _queue_rss(job)
+    state["etag"] = etag
+    state["modified"] = modified
+    LOGGER.info(f"Feed Name: {title}")
+    LOGGER.info(f"Last item: {last_link}")
+
+
 async def rss_monitor():
     if not config_dict["RSS_CHAT"]:
         scheduler.shutdown(wait=False)
@@ -999,137 +1288,79 @@ async def rss_monitor():
     if len(rss_dict) == 0:
         scheduler.pause()
         return
-    all_paused = True
-    for user, items in list(rss_dict.items()):
-        for title, data in items.items():
-            try:
-                if data["paused"]:
-                    continue
-                tries = 0
-                while True:
-                    try:
-                        async with AsyncClient(
-                            headers=headers,
-                            follow_redirects=True,
-                            timeout=60,
-                            verify=False,
-                        ) as client:
-                            res = await client.get(data["link"])
-                        html = res.text
-                        break
-                    except:
-                        tries += 1
-                        if tries > 3:
-                            raise
-                        continue
-                rss_d = feed_parse(html)
-                try:
-                    last_link = rss_d.entries[0]["links"][1]["href"]
-                except IndexError:
-                    last_link = rss_d.entries[0]["link"]
-                finally:
-                    all_paused = False
-                last_title = rss_d.entries[0]["title"]
-                if data["last_feed"] == last_link or data["last_title"] == last_title:
-                    continue
-                feed_count = 0
-                while True:
-                    try:
-                        await sleep(10)
-                    except:
-                        raise RssShutdownException("Rss Monitor Stopped!")
-                    try:
-                        item_title = rss_d.entries[feed_count]["title"]
-                        try:
-                            url = rss_d.entries[feed_count]["links"][1]["href"]
-                        except IndexError:
-                            url = rss_d.entries[feed_count]["link"]
-                        if data["last_feed"] == url or data["last_title"] == item_title:
-                            break
-                    except IndexError:
-                        LOGGER.warning(
-                            f"Reached Max index no. {feed_count} for this feed: {title}. Maybe you need to use less RSS_DELAY to not miss some torrents"
-                        )
-                        break
-                    parse = True
-                    for flist in data["inf"]:
-                        if (
-                            data.get(
-                                "sensitive",
-                                False
-                            )
-                            and all(x.lower() not in item_title.lower() for x in flist)
-                        ) or (
-                            not data.get("sensitive", False)
-                            and all(
-                                x not in item_title
-                                for x in flist
-                            )
-                        ):
-                            parse = False
-                            feed_count += 1
-                            break
-                    if not parse:
-                        continue
-                    for flist in data["exf"]:
-                        if (
-                            data.get("sensitive", False)
-                            and any(
-                                x.lower() in item_title.lower()
-                                for x in flist
-                            )
-                        ) or (
-                            not data.get("sensitive", False)
-                            and any(
-                                x in item_title
-                                for x in flist
-                            )
-                        ):
-                            parse = False
-                            feed_count += 1
-                            break
-                    if not parse:
-                        continue
-                    if command := data["command"]:
-                        cmd = command.split(maxsplit=1)
-                        cmd.insert(1, url)
-                        feed_msg = " ".join(cmd)
-                        if not feed_msg.startswith("/"):
-                            feed_msg = f"/{feed_msg}"
-                    else:
-                        feed_msg = f"<b>Name: </b><code>{item_title.replace('>', '').replace('<', '')}</code>\n\n"
-                        feed_msg += f"<b>Link: </b><code>{url}</code>"
-                    feed_msg += (
-                        f"\n<b>Tag: </b><code>{data['tag']}</code> <code>{user}</code>"
-                    )
-                    await send_rss(feed_msg)
-                    feed_count += 1
-                async with rss_dict_lock:
-                    if (
-                        user not in rss_dict
-                        or not rss_dict[user].get(
-                            title,
-                            False
-                        )
-                    ):
-                        continue
-                    rss_dict[user][title].update(
-                        {
-                            "last_feed": last_link,
-                            "last_title": last_title
-                        }
-                    )
-                await database.rss_update(user)
-                LOGGER.info(f"Feed Name: {title}")
-                LOGGER.info(f"Last item: {last_link}")
-            except RssShutdownException as ex:
-                LOGGER.info(ex)
-                break
-            except Exception as e:
-                LOGGER.error(f"{e} - Feed Name: {title} - Feed Link: {data['link']}")
-                continue
-    if all_paused:
+    feeds = [
+        (
+            user,
+            title,
+            data
+        )
+        for (
+            user,
+            items
+        ) in list(rss_dict.items())
+        for (
+            title,
+            data
+        ) in list(items.items())
+        if not data["paused"]
+    ]
+    if not feeds:
         scheduler.pause()
+        return
+    keys = {
+        (
+            user,
+            title
+        )
+        for (
+            user,
+            title,
+            _
+        ) in feeds
+    }
+    for key in list(rss_feeds):
+        if key not in keys:
+            del rss_feeds[key]
+    for key in list(rss_filters):
+        if key not in keys:
+            del rss_filters[key]
+    results = await gather(
+        *(
+            _check_feed(
+                user,
+                title,
+                data
+            )
+            for (
+                user,
+                title,
+                data
+            ) in feeds
+        ),
+        return_exceptions=True
+    )
+    for (
+        (
+            _,
+            title,
+            data
+        ),
+        result
+    ) in zip(
+        feeds,
+        results
+    ):
+        if isinstance(
+            result,
+            RssShutdownException
+        ):
+            LOGGER.info(result)
+            break
+        if isinstance(
+            result,
+            Exception
+        ):
+            LOGGER.error(f"{result} - Feed Name: {title} - Feed Link: {data['link']}")
 
 
 def add_job():
@@ -93,9 +93,7 @@ async def mirror_status(_, message):
         else:
             user_id = 0
             sid = message.chat.id
-            if obj := intervals["status"].get(sid):
-                obj.cancel()
-                del intervals["status"][sid]
+            intervals["status"].discard(sid)
         await send_status_message(
             message,
             user_id
@@ -90,6 +90,7 @@ class YtDlp(TaskListener):
             "-rcf": "",
             "-t": "", "-thumb": "",
             "-tl": "", "-thumblayout": "",
+            "-zl": "", "-ziplevel": "",
             "-ca": "", "-convertaudio": "",
             "-cv": "", "-convertvideo": "",
             "-ns": "", "-namesub": ""
@@ -114,6 +115,7 @@ class YtDlp(TaskListener):
         self.thumb = args["-t"] or args["-thumb"]
         self.thumbnail_layout = args["-tl"] or args["-thumblayout"]
         self.split_size = args["-sp"] or args["-splitsize"]
+        self.zip_level = args["-zl"] or args["-ziplevel"]
         self.sample_video = args["-sv"] or args["-samplevideo"]
         self.screen_shots = args["-ss"] or args["-screenshot"]
         self.force_run = args["-f"] or args["-forcerun"]
@@ -168,11 +170,9 @@ class YtDlp(TaskListener):
                                 if fd_name != self.folder_name:
                                     self.same_dir[fd_name]["total"] -= 1
                         else:
-                            self.same_dir = {
-                                self.folder_name: {
-                                    "total": self.multi,
-                                    "tasks": {self.mid},
-                                }
+                            self.same_dir[self.folder_name] = {
+                                "total": self.multi,
+                                "tasks": {self.mid},
                             }
                 elif self.same_dir:
                     async with task_dict_lock: